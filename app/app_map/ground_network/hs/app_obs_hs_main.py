@@ -19,7 +19,6 @@ Version:
 # -------------------------------------------------------------------------------------
 # Libraries
 import logging
-import matplotlib.pylab as plt
 
 from argparse import ArgumentParser
 from time import time, strftime, gmtime
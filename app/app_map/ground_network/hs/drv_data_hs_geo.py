@@ -12,17 +12,14 @@ Version:       '1.0.0'
 import logging
 import os
 import json
-import xarray as xr
 import numpy as np
 
 from lib_hs_geo import read_file_raster
-from lib_hs_io_generic import write_obj, read_obj, convert_values2da
-from lib_hs_generic import make_folder
+from lib_hs_io_generic import convert_values2da, \
+    write_dset_workspace, read_dset_workspace, remove_dset_workspace
 
-from lib_hs_ancillary_snow import compute_predictor, command_line_predictor
+from lib_hs_ancillary_snow import compute_predictor, terrain_predictor
 
-# Debug
-import matplotlib.pylab as plt
 #######################################################################################
 
 
@@ -43,6 +40,7 @@ class DriverGeo:
                  tag_dst_data_hillshade='hillshade_data',
                  tag_dst_data_roughness='roughness',
                  tag_predictor_to_use='predictor_to_use',
+                 tag_file_format='format',
                  flag_updating_ancillary=True):
 
         self.src_dict = src_dict
@@ -65,6 +63,7 @@ class DriverGeo:
         self.tag_dst_data_roughness = tag_dst_data_roughness
 
         self.tag_predictor_to_use = tag_predictor_to_use
+        self.tag_file_format = tag_file_format
 
         self.flag_updating_ancillary = flag_updating_ancillary
 
@@ -95,6 +94,12 @@ class DriverGeo:
 
         self.predictor_to_use = self.info_dict[self.tag_predictor_to_use]
 
+        # Static datasets are stored by default as memory-mappable npy layers (shared by concurrent processes)
+        if self.tag_file_format in list(ancillary_dict.keys()):
+            self.file_format_ancillary = ancillary_dict[self.tag_file_format]
+        else:
+            self.file_format_ancillary = 'npy'
+
         self.tag_dim_geo_x = 'longitude'
         self.tag_dim_geo_y = 'latitude'
         self.tag_coord_geo_x = 'west_east'
@@ -103,19 +108,16 @@ class DriverGeo:
     # -------------------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------------------
-    # Method to write dataset in dictionary format
-    @staticmethod
-    def write_dset_obj(file_name, file_dset):
-        file_dict = file_dset.to_dict()
-        write_obj(file_name, file_dict)
+    # Method to write dataset in workspace format (npy, netcdf or pickle)
+    def write_dset_obj(self, file_name, file_dset):
+        write_dset_workspace(file_name, file_dset, file_format=self.file_format_ancillary)
     # -------------------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------------------
-    # Method to load dataset saved in dictionary format
+    # Method to load dataset saved in workspace format (only the selected variable(s), if defined)
     @staticmethod
-    def read_dset_obj(file_name):
-        file_dict = read_obj(file_name)
-        file_dset = xr.Dataset.from_dict(file_dict)
+    def read_dset_obj(file_name, var_list=None):
+        file_dset = read_dset_workspace(file_name, var_list=var_list)
         return file_dset
     # -------------------------------------------------------------------------------------
 
@@ -131,11 +133,16 @@ class DriverGeo:
         values_geo_x = dset_land[self.tag_coord_geo_x].values
         values_geo_y = dset_land[self.tag_coord_geo_y].values
 
+        # Get land values and resolution (resolution y is negative for north-up grids)
+        values_land = dset_land[self.tag_src_data].values
+        no_data_land = dset_land.attrs.get('no_data', -9999.0)
+        res_geo_x = float(np.mean(np.diff(values_geo_x)))
+        res_geo_y = float(np.mean(np.diff(values_geo_y)))
+
         predictor_to_use = self.predictor_to_use
 
         if self.flag_updating_ancillary:
-            if os.path.exists(file_path_ancillary):
-                os.remove(file_path_ancillary)
+            remove_dset_workspace(file_path_ancillary)
 
         dset_predictor = None
         if os.path.exists(file_path_land):
@@ -147,17 +154,12 @@ class DriverGeo:
 
                     if var_name in self.predictor_to_use:
 
-                        if var_name in list(command_line_predictor.keys()):
-
-                            cmd_step = command_line_predictor[var_name]['command_line']
-
-                            folder_name_step = var_fields[self.tag_folder_name]
-                            file_name_step = var_fields[self.tag_file_name]
-                            file_path_step = os.path.join(folder_name_step, file_name_step)
+                        if var_name in list(terrain_predictor.keys()):
 
-                            make_folder(folder_name_step)
+                            settings_step = terrain_predictor[var_name]
 
-                            values_predictor = compute_predictor(file_path_land, file_path_step, cmd_step)
+                            values_predictor = compute_predictor(
+                                values_land, res_geo_x, res_geo_y, no_data_in=no_data_land, **settings_step)
 
                             #set to nan where land is nan
                             values_predictor[np.isnan(dset_land.land_data)] = np.nan
@@ -187,7 +189,7 @@ class DriverGeo:
                     logging.warning(' ===> Predictors are not available ')
             else:
 
-                dset_predictor = self.read_dset_obj(file_path_ancillary)
+                dset_predictor = self.read_dset_obj(file_path_ancillary, var_list=self.predictor_to_use)
                 logging.info(' ----> Get predictors information ... DONE. Loaded using saved ancillary file')
 
         else:
@@ -206,8 +208,7 @@ class DriverGeo:
         logging.info(' ----> Get ' + var_name + ' information ... ')
 
         if self.flag_updating_ancillary:
-            if os.path.exists(ancillary_name):
-                os.remove(ancillary_name)
+            remove_dset_workspace(ancillary_name)
 
         if os.path.exists(file_name):
             if not os.path.exists(ancillary_name):
@@ -230,7 +231,7 @@ class DriverGeo:
                 logging.info(' ----> Get ' + var_name + ' information ... DONE')
 
             else:
-                dset = self.read_dset_obj(ancillary_name)
+                dset = self.read_dset_obj(ancillary_name, var_list=[var_name])
                 logging.info(' ----> Get ' + var_name + ' information ... DONE. Loaded using saved ancillary file')
         else:
             logging.info(' ----> Get ' + var_name + ' information ... FAILED')
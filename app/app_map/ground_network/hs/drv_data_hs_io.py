@@ -17,7 +17,6 @@ import time
 
 import xarray as xr
 import pandas as pd
-import matplotlib.pylab as plt
 
 from lib_hs_conventions import conventions_vars
 
@@ -54,6 +53,7 @@ class DriverData:
 
         self.tag_folder_name = 'folder_name'
         self.tag_file_name = 'file_name'
+        self.tag_folder_name_cache = 'folder_name_cache'
         self.tag_file_fields = 'file_fields'
         self.tag_file_compression = 'file_compression'
 
@@ -83,6 +83,11 @@ class DriverData:
 
         self.folder_name_anc_dset_root = get_root_path(self.folder_name_anc_dset_raw)
 
+        if self.tag_folder_name_cache in list(self.ancillary_dict.keys()):
+            self.folder_name_cache_src = self.ancillary_dict[self.tag_folder_name_cache]
+        else:
+            self.folder_name_cache_src = os.path.join(self.folder_name_anc_dset_root, 'cache')
+
         self.folder_name_dst_dset_raw = self.dst_dict[self.tag_folder_name]
         self.file_name_dst_dset_raw = self.dst_dict[self.tag_file_name]
         self.file_path_dst_dset_collections = self.collect_file_list(
@@ -315,6 +320,7 @@ class DriverData:
 
         file_fields_collections = self.file_fields_collections
         file_path_src_collections = self.file_path_src_dset_collections
+        folder_name_cache_src = self.folder_name_cache_src
         file_path_anc_collections = self.file_path_anc_dset_collections
 
         var_src_dict = self.variable_src_dict
@@ -357,7 +363,8 @@ class DriverData:
                             var_file_data_src = read_file_csv(var_file_path_src,
                                                               file_time=time_step, file_header=var_file_list,
                                                               file_renamecols={'time_end': 'time'},
-                                                              file_skipcols=['time_start'])
+                                                              file_skipcols=['time_start'],
+                                                              file_cache_folder=folder_name_cache_src)
                             logging.info(' -------> Get data  ... DONE')
                         else:
                             logging.info(' -------> Get data  ... FAILED')
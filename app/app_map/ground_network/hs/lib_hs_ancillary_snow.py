@@ -10,104 +10,107 @@ Version:       '1.0.0'
 #######################################################################################
 # Library
 import logging
-import os
-import tempfile
-import rasterio
 
 import numpy as np
 
-from time import sleep
-
-from lib_hs_generic import random_string, delete_folder, make_folder
-from lib_hs_process import exec_process
-
-# Debug
-import matplotlib.pylab as plt
 #######################################################################################
 
 
 # -------------------------------------------------------------------------------------
-# Command line to compute predictor(s) data
-command_line_predictor = dict(
+# Settings to compute predictor(s) data (same options of the former gdaldem command lines)
+terrain_predictor = dict(
     slope_data={
-        'command_line': 'gdaldem slope {file_name_in} {file_name_out} -s 111120'
+        'method': 'slope', 'scale': 111120
     },
     aspect_data={
-        'command_line': 'gdaldem aspect {file_name_in} {file_name_out} -zero_for_flat'
+        'method': 'aspect', 'zero_for_flat': True
     },
     roughness_data={
-        'command_line': 'gdaldem roughness {file_name_in} {file_name_out}'
+        'method': 'roughness'
     },
     hillshade_data={
-        'command_line': 'gdaldem hillshade {file_name_in} {file_name_out} -s 111120'
-    }
-)
-# Command line to compute geographical data
-command_line_utils = dict(
-    translate_data={
-        'command_line': 'gdal_translate -of AAIGrid {file_name_in} {file_name_out}'
+        'method': 'hillshade', 'scale': 111120, 'azimuth': 315.0, 'altitude': 45.0, 'z_factor': 1.0
     }
 )
 # -------------------------------------------------------------------------------------
 
 
 # -------------------------------------------------------------------------------------
-# Method to compute snow predictor(s)
-def compute_predictor(file_path_in, file_path_out, command_line_data, command_line_geo=None):
-
-    if command_line_geo is None:
-        command_line_geo = command_line_utils['translate_data']['command_line']
-
-    file_name_tmp = random_string() + '.tiff'
-    folder_name_tmp = tempfile.mkdtemp()
-    file_path_tmp = os.path.join(folder_name_tmp, file_name_tmp)
-
-    make_folder(folder_name_tmp)
-
-    # Execute command-line for computing data
-    command_line_tmp = command_line_data.format(**{'file_name_in': file_path_in, 'file_name_out': file_path_tmp})
-    [std_out_data, std_err_data, std_exit_data] = exec_process(command_line_tmp)
-    sleep(5)
-
-    # Read temporary data in tiff format
-    with rasterio.open(file_path_tmp, mode='r+') as dset_tmp:
-        data_tmp = dset_tmp.read()
-        values_tmp = data_tmp[0, :, :]
-    # Read input data in ascii format
-    with rasterio.open(file_path_in, mode='r+') as dset_in:
-        data_in = dset_in.read()
-        values_in = data_in[0, :, :]
-
-    # Execute command-line for translating data
-    command_line_tmp = command_line_geo.format(**{'file_name_in': file_path_tmp, 'file_name_out': file_path_out})
-    [std_out_geo, std_err_geo, std_exit_geo] = exec_process(command_line_tmp)
-
-    # Read output data in ascii format
-    with rasterio.open(file_path_out, mode='r+') as dset_out:
-        data_out = dset_out.read()
-        values_out = data_out[0, :, :]
-
-    # Remove temporary folder and its content
-    delete_folder(folder_name_tmp)
-
-    # Debug
-    # plt.figure(1)
-    # plt.imshow(values_in)
-    # plt.figure(2)
-    # plt.imshow(values_tmp)
-    # plt.figure(3)
-    # plt.imshow(values_out)
-    # plt.show()
+# Method to compute snow predictor(s) in memory (gdaldem algorithms using the Horn 3x3 kernel)
+def compute_predictor(values_in, geo_res_x, geo_res_y, method='slope', no_data_in=-9999.0, no_data_out=-9999.0,
+                      scale=1.0, zero_for_flat=False, azimuth=315.0, altitude=45.0, z_factor=1.0):
+
+    values_in = np.asarray(values_in, dtype=np.float64)
+
+    # Define no data mask (a window with at least one no data value returns no data as in gdaldem)
+    mask_in = np.isnan(values_in)
+    if no_data_in is not None:
+        mask_in = mask_in | (values_in == no_data_in)
+
+    # Define 3x3 window values [a b c; d e f; g h i] over the internal cells
+    win_a, win_b, win_c = values_in[:-2, :-2], values_in[:-2, 1:-1], values_in[:-2, 2:]
+    win_d, win_e, win_f = values_in[1:-1, :-2], values_in[1:-1, 1:-1], values_in[1:-1, 2:]
+    win_g, win_h, win_i = values_in[2:, :-2], values_in[2:, 1:-1], values_in[2:, 2:]
+
+    mask_win = np.zeros(shape=win_e.shape, dtype=bool)
+    for win_y in range(0, 3):
+        for win_x in range(0, 3):
+            mask_win |= mask_in[win_y:win_y + mask_in.shape[0] - 2, win_x:win_x + mask_in.shape[1] - 2]
+
+    # Horn differences (west-east and north-south)
+    diff_x = (win_a + 2 * win_d + win_g) - (win_c + 2 * win_f + win_i)
+    diff_y = (win_g + 2 * win_h + win_i) - (win_a + 2 * win_b + win_c)
+
+    if method == 'slope':
+        slope_x = diff_x / (8.0 * geo_res_x * scale)
+        slope_y = diff_y / (8.0 * geo_res_y * scale)
+        values_win = np.arctan(np.sqrt(slope_x * slope_x + slope_y * slope_y)) * 180.0 / np.pi
+
+    elif method == 'aspect':
+        # aspect as azimuth (0 degree at north, clockwise)
+        values_win = np.arctan2(diff_y, diff_x) * 180.0 / np.pi
+        values_win = np.where(values_win > 90.0, 450.0 - values_win, 90.0 - values_win)
+        values_win[values_win == 360.0] = 0.0
+        values_flat = (diff_x == 0) & (diff_y == 0)
+        if zero_for_flat:
+            values_win[values_flat] = 0.0
+        else:
+            values_win[values_flat] = no_data_out
+
+    elif method == 'roughness':
+        values_stack = np.stack([win_a, win_b, win_c, win_d, win_e, win_f, win_g, win_h, win_i], axis=0)
+        values_win = np.max(values_stack, axis=0) - np.min(values_stack, axis=0)
+
+    elif method == 'hillshade':
+        # hillshade is a byte grid in gdaldem (no data equal to 0)
+        no_data_out = 0
+        shade_x = z_factor * diff_x / (8.0 * geo_res_x * scale)
+        shade_y = z_factor * diff_y / (8.0 * geo_res_y * scale)
+        shade_slope = np.pi / 2.0 - np.arctan(np.sqrt(shade_x * shade_x + shade_y * shade_y))
+        shade_aspect = np.arctan2(shade_y, shade_x)
+        shade_az, shade_alt = azimuth * np.pi / 180.0, altitude * np.pi / 180.0
+        shade_cang = (np.sin(shade_alt) * np.sin(shade_slope) +
+                      np.cos(shade_alt) * np.cos(shade_slope) * np.cos(shade_az - np.pi / 2.0 - shade_aspect))
+        values_win = np.where(shade_cang <= 0.0, 1.0, 1.0 + 254.0 * shade_cang)
+        values_win = np.floor(values_win + 0.5)
+
+    else:
+        logging.error(' ===> Predictor method "' + str(method) + '" is not supported')
+        raise NotImplementedError('Case not implemented yet')
+
+    # Organize values out (edges and no data windows are set to no data as in gdaldem)
+    values_win[mask_win] = no_data_out
+    values_out = np.zeros(shape=values_in.shape, dtype=np.float32)
+    values_out[:, :] = no_data_out
+    values_out[1:-1, 1:-1] = values_win
 
     return values_out
-
 # -------------------------------------------------------------------------------------
 
 
 # -------------------------------------------------------------------------------------
-# Method to compute snow kernel
-def compute_kernel(ref_geo_data, ref_geo_x, ref_geo_y, geo_cellsize_x, geo_cellsize_y,
-                   var_index_x, var_index_y, radius_influence):
+# Method to compute snow kernel pixel distance
+def compute_kernel_distance(ref_geo_y, geo_cellsize_x, geo_cellsize_y, radius_influence):
 
     # -------------------------------------------------------------------------------------
     # Dynamic values (NEW)
@@ -130,26 +133,55 @@ def compute_kernel(ref_geo_data, ref_geo_x, ref_geo_y, geo_cellsize_x, geo_cells
     # Pixel(s) interpolation
     pixel_distance = np.int32(radius_influence / geo_mm)
 
-    # Compute gridded indexes
+    return pixel_distance
+    # --------------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------------
+
+
+# --------------------------------------------------------------------------------
+# Method to compute snow kernel (over the full grid or over the grid window [row_start, row_end, col_start, col_end])
+def compute_kernel(ref_geo_data, ref_geo_x, ref_geo_y, geo_cellsize_x, geo_cellsize_y,
+                   var_index_x, var_index_y, radius_influence, pixel_distance=None, grid_window=None):
+
+    # Pixel(s) interpolation
+    if pixel_distance is None:
+        pixel_distance = compute_kernel_distance(ref_geo_y, geo_cellsize_x, geo_cellsize_y, radius_influence)
+
+    # Compute gridded indexes (1d coordinates of the grid columns and rows)
     ref_index_x = np.linspace(0, ref_geo_data.shape[1], ref_geo_data.shape[1])
     ref_index_y = np.linspace(0, ref_geo_data.shape[0], ref_geo_data.shape[0])
-    grid_index_x, grid_index_y = np.meshgrid(ref_index_x, ref_index_y)
 
-    # Cycle(s) on snow sensor(s)
-    grid_weights = np.zeros([ref_geo_data.shape[0], ref_geo_data.shape[1]])
+    # Select grid window
+    if grid_window is None:
+        grid_window = [0, ref_geo_data.shape[0], 0, ref_geo_data.shape[1]]
+    grid_y_start, grid_y_end, grid_x_start, grid_x_end = grid_window
+
+    # Cycle(s) on snow sensor(s) (only the window of cells within the pixel distance is updated)
+    grid_weights = np.zeros([grid_y_end - grid_y_start, grid_x_end - grid_x_start])
     for index_x, index_y in zip(var_index_x, var_index_y):
 
-        # Compute distance index matrix
-        grid_index_distance = np.zeros([ref_geo_data.shape[0], ref_geo_data.shape[1]])
-        grid_index_distance = np.sqrt((grid_index_y - index_y) ** 2 + (grid_index_x - index_x) ** 2)
+        # Select window indexes (the grid indexes are sorted; the window is bounded by the grid window)
+        window_x_start = max(np.searchsorted(ref_index_x, index_x - pixel_distance, side='right'), grid_x_start)
+        window_x_end = min(np.searchsorted(ref_index_x, index_x + pixel_distance, side='left'), grid_x_end)
+        window_y_start = max(np.searchsorted(ref_index_y, index_y - pixel_distance, side='right'), grid_y_start)
+        window_y_end = min(np.searchsorted(ref_index_y, index_y + pixel_distance, side='left'), grid_y_end)
+        if window_x_start >= window_x_end or window_y_start >= window_y_end:
+            continue
+
+        # Compute distance index matrix over the window
+        window_index_distance = np.sqrt(
+            (ref_index_y[window_y_start:window_y_end, np.newaxis] - index_y) ** 2 +
+            (ref_index_x[np.newaxis, window_x_start:window_x_end] - index_x) ** 2)
 
         # Weight(s) matrix
-        grid_index_pixels = np.zeros([ref_geo_data.shape[0], ref_geo_data.shape[1]])
-        grid_index_pixels = np.where(grid_index_distance < pixel_distance)
+        window_weights = grid_weights[window_y_start - grid_y_start:window_y_end - grid_y_start,
+                                      window_x_start - grid_x_start:window_x_end - grid_x_start]
+        window_index_pixels = np.where(window_index_distance < pixel_distance)
 
-        grid_weights[grid_index_pixels] = grid_weights[grid_index_pixels] + \
-            (pixel_distance ** 2 - grid_index_distance[grid_index_pixels] ** 2) /\
-            (pixel_distance ** 2 + grid_index_distance[grid_index_pixels] ** 2) / len(var_index_x)
+        window_weights[window_index_pixels] = window_weights[window_index_pixels] + \
+            (pixel_distance ** 2 - window_index_distance[window_index_pixels] ** 2) / \
+            (pixel_distance ** 2 + window_index_distance[window_index_pixels] ** 2) / len(var_index_x)
 
     return grid_weights
     # --------------------------------------------------------------------------------
@@ -2,10 +2,7 @@
 # Library
 import logging
 import numpy as np
-import rasterio
-import rasterio.crs
 import os
-import matplotlib.pylab as plt
 
 from lib_hs_io_generic import create_darray_2d
 
@@ -57,6 +54,10 @@ def read_file_raster(file_name, file_proj='epsg:4326', var_name='land',
                      coord_name_x='west_east', coord_name_y='south_north',
                      dim_name_x='west_east', dim_name_y='south_north', no_data_default=-9999.0):
 
+    # Import optional backend at first use
+    import rasterio
+    import rasterio.crs
+
     if os.path.exists(file_name):
         if (file_name.endswith('.txt') or file_name.endswith('.asc')) or file_name.endswith('.tif'):
 
@@ -94,6 +95,7 @@ def read_file_raster(file_name, file_proj='epsg:4326', var_name='land',
                 lats = np.flipud(lats)
 
             # # Debug
+            # import matplotlib.pylab as plt
             # plt.figure()
             # plt.imshow(lats)
             # plt.colorbar()
@@ -11,17 +11,15 @@ Version:       '1.0.1'
 # Library
 import logging
 import numpy as np
-from copy import deepcopy
 
 from lib_hs_geo import find_geo_index, deg_2_km
 
 from lib_hs_analysis_interpolation_point import interp_point2grid
 from lib_hs_analysis_regression_stepwisefit import stepwisefit
 
-from lib_hs_ancillary_snow import compute_kernel
+from lib_hs_ancillary_snow import compute_kernel, compute_kernel_distance
 
 # Debug
-import matplotlib.pylab as plt
 logging.getLogger('matplotlib').setLevel(logging.WARNING)
 #######################################################################################
 
@@ -105,8 +103,18 @@ def compute_snow_height(var_data, var_geo_x, var_geo_y, var_geo_z,
 
     #derive homogeneous-regions information
     ref_point_homog_ID = ref_geo_homogeneous_region[index_geo_y, index_geo_x]
-    homogeneous_regions_IDs = np.unique(ref_geo_homogeneous_region.flatten())
-    homogeneous_regions_IDs = homogeneous_regions_IDs[~np.isnan(homogeneous_regions_IDs)]
+
+    # group grid cells by homogeneous region (each region is computed over the window of its cells)
+    grid_region_flat = np.asarray(ref_geo_homogeneous_region).ravel()
+    grid_region_cells = np.flatnonzero(~np.isnan(grid_region_flat))
+    homogeneous_regions_IDs, grid_region_inverse = np.unique(grid_region_flat[grid_region_cells], return_inverse=True)
+    grid_region_cells = grid_region_cells[np.argsort(grid_region_inverse.ravel(), kind='stable')]
+    grid_region_bounds = np.concatenate(([0], np.cumsum(np.bincount(grid_region_inverse.ravel(),
+                                                                    minlength=homogeneous_regions_IDs.shape[0]))))
+
+    # kernel pixel distance (defined by the grid)
+    fx_kernel_distance = compute_kernel_distance(ref_geo_y, ref_cell_size, ref_cell_size,
+                                                 fx_regression_radius_influence)
 
     # Initialize snow-depth map
     grid_map_all_regions = np.zeros(shape=[grid_geo_x.shape[0], grid_geo_y.shape[1]])
@@ -116,6 +124,20 @@ def compute_snow_height(var_data, var_geo_x, var_geo_y, var_geo_z,
 
     for i_homog_reg, homog_region_this_round in enumerate(homogeneous_regions_IDs):
 
+        # define window of this region (bounding box of the region cells) and region mask over the window
+        grid_cells_this_region = grid_region_cells[grid_region_bounds[i_homog_reg]:grid_region_bounds[i_homog_reg + 1]]
+        grid_rows_this_region, grid_cols_this_region = np.unravel_index(grid_cells_this_region,
+                                                                        ref_geo_homogeneous_region.shape)
+        row_start, row_end = int(np.min(grid_rows_this_region)), int(np.max(grid_rows_this_region)) + 1
+        col_start, col_end = int(np.min(grid_cols_this_region)), int(np.max(grid_cols_this_region)) + 1
+        grid_window_this_region = [row_start, row_end, col_start, col_end]
+
+        grid_mask_this_region = np.zeros(shape=[row_end - row_start, col_end - col_start], dtype=bool)
+        grid_mask_this_region[grid_rows_this_region - row_start, grid_cols_this_region - col_start] = True
+
+        grid_map_window = grid_map_all_regions[row_start:row_end, col_start:col_end]
+        grid_kernel_window = grid_kernel_all_regions[row_start:row_end, col_start:col_end]
+
         # take data and predictors for this region
         ref_point_predictors_container_this_region = \
             ref_point_predictors_container[ref_point_homog_ID == homog_region_this_round, :]
@@ -126,6 +148,10 @@ def compute_snow_height(var_data, var_geo_x, var_geo_y, var_geo_z,
         var_point_x_select_this_region = var_point_x_select[ref_point_homog_ID == homog_region_this_round]
         var_point_y_select_this_region = var_point_y_select[ref_point_homog_ID == homog_region_this_round]
 
+        # data indexes over the window of this region
+        index_window_x_this_region = index_geo_x_this_region - col_start
+        index_window_y_this_region = index_geo_y_this_region - row_start
+
         logging.info('[ Homogeneous region: ' + str(homog_region_this_round) + ']')
         logging.info('[ Available data for this homogeneous region: ' + str(var_data_n_this_region_n) + ']')
 
@@ -154,32 +180,30 @@ def compute_snow_height(var_data, var_geo_x, var_geo_y, var_geo_z,
             swf_inmodel_false = [idx for idx, vx in enumerate(swf_inmodel) if not vx]
             ref_point_predictors_container_this_region = \
                     np.delete(ref_point_predictors_container_this_region, swf_inmodel_false, axis=1)
-            ref_grid_predictors_container_this_region = \
-                    np.delete(ref_grid_predictors_container, swf_inmodel_false, axis=2)
 
             # Multivariate linear regression
             var_a = np.concatenate((ref_point_predictors_container_this_region,
                                     np.ones([ref_point_predictors_container_this_region.__len__(), 1])), axis=1)
             var_coeff = np.linalg.lstsq(var_a, var_data_select_this_region, rcond=None)[0]
 
-            # Basemap
-            grid_basemap_this_region = np.ones(shape=[grid_geo_x.shape[0], grid_geo_y.shape[1]])
+            # Basemap (over the window of this region)
+            grid_basemap_this_region = np.ones(shape=[row_end - row_start, col_end - col_start])
             grid_basemap_this_region[:, :] = var_coeff[-1]
             var_coeff_reduced = var_coeff[:-1]
             for id, var_coeff_step in enumerate(var_coeff_reduced):
                 grid_basemap_this_region = grid_basemap_this_region + \
-                                           ref_grid_predictors_container[:, :, id] * var_coeff_step
+                                           ref_grid_predictors_container[row_start:row_end, col_start:col_end, id] * var_coeff_step
 
             # Filter data to avoid nan(s) and negative value(s), as well as to restrict to this homogeneous region
             grid_basemap_this_region[grid_basemap_this_region < 0] = 0
-            grid_basemap_this_region[ref_geo_homogeneous_region != homog_region_this_round] = np.nan
+            grid_basemap_this_region[~grid_mask_this_region] = np.nan
 
             # Compute residuals
-            var_point_map = grid_basemap_this_region[index_geo_y_this_region, index_geo_x_this_region]
+            var_point_map = grid_basemap_this_region[index_window_y_this_region, index_window_x_this_region]
             var_point_res = var_point_map - var_data_select_this_region
             var_point_res_select = np.delete(var_point_res, np.isnan(var_point_res), axis=0)
 
-            # Distribute residuals
+            # Distribute residuals (over the window of this region)
             grid_data_res_this_region = interp_point2grid(var_point_res_select, var_point_x_select_this_region,
                                                           var_point_y_select_this_region,
                                               grid_geo_x, grid_geo_y,
@@ -187,34 +211,33 @@ def compute_snow_height(var_data, var_geo_x, var_geo_y, var_geo_z,
                                               interp_no_data=fx_nodata, interp_method=fx_interp_name,
                                               interp_radius_x=fx_interp_radius_x,
                                               interp_radius_y=fx_interp_radius_y,
-                                              n_cpu=fx_n_cpu)
-            var_point_res_after = grid_data_res_this_region[index_geo_y_this_region, index_geo_x_this_region]
-            grid_data_res_this_region[ref_geo_homogeneous_region != homog_region_this_round] = np.nan
+                                              n_cpu=fx_n_cpu, interp_window=grid_window_this_region)
+            var_point_res_after = grid_data_res_this_region[index_window_y_this_region, index_window_x_this_region]
+            grid_data_res_this_region[~grid_mask_this_region] = np.nan
             grid_data_res_this_region[grid_data_res_this_region == fx_nodata] = np.nan
             #note: we set grid_data_res_this_region to nan also where it shows missing value, because this is not the final
             #map. We will add it to basemap.
 
             #final map
             grid_data_this_region = grid_basemap_this_region - grid_data_res_this_region
-            var_data_select_this_region_after = grid_data_this_region[index_geo_y_this_region, index_geo_x_this_region]
+            var_data_select_this_region_after = grid_data_this_region[index_window_y_this_region, index_window_x_this_region]
             grid_data_this_region[grid_data_this_region < 0] = 0
-            grid_map_all_regions[ref_geo_homogeneous_region == homog_region_this_round] = deepcopy(\
-                grid_data_this_region[ref_geo_homogeneous_region == homog_region_this_round])
+            grid_map_window[grid_mask_this_region] = grid_data_this_region[grid_mask_this_region]
 
-            # Kernel
+            # Kernel (over the window of this region)
             grid_kernel_this_region = compute_kernel(ref_geo_z, ref_geo_x, ref_geo_y,
                                          ref_cell_size, ref_cell_size,
-                                         index_geo_x_this_region, index_geo_y_this_region, fx_regression_radius_influence)
+                                         index_geo_x_this_region, index_geo_y_this_region, fx_regression_radius_influence,
+                                         pixel_distance=fx_kernel_distance, grid_window=grid_window_this_region)
             grid_kernel_this_region[grid_kernel_this_region < 0] = 0
             grid_kernel_this_region[grid_kernel_this_region > 1] = 1
             grid_kernel_this_region[np.isnan(grid_kernel_this_region)] = var_missing_value
-            grid_kernel_all_regions[ref_geo_homogeneous_region == homog_region_this_round] = \
-                deepcopy(grid_kernel_this_region[ref_geo_homogeneous_region == homog_region_this_round])
+            grid_kernel_window[grid_mask_this_region] = grid_kernel_this_region[grid_mask_this_region]
 
         else:
             logging.warning(' ===> Snow-depth map NOT PRODUCED for this region! ')
-            grid_map_all_regions[ref_geo_homogeneous_region == homog_region_this_round] = var_missing_value
-            grid_kernel_all_regions[ref_geo_homogeneous_region == homog_region_this_round] = var_missing_value
+            grid_map_window[grid_mask_this_region] = var_missing_value
+            grid_kernel_window[grid_mask_this_region] = var_missing_value
 
 
     # Final housekeeping
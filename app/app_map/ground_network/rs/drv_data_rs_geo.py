@@ -13,12 +13,10 @@ import logging
 import os
 import json
 import numpy as np
-import pandas as pd
-import xarray as xr
 
 from lib_rs_geo import read_shapefile_points
-from lib_rs_io_generic import write_obj, read_obj, convert_values2da
-from lib_rs_generic import make_folder
+from lib_rs_io_generic import convert_values2da, \
+    write_dframe_workspace, read_dframe_workspace, remove_dframe_workspace
 
 # Debug
 # import matplotlib.pylab as plt
@@ -35,6 +33,7 @@ class DriverGeo:
                  tag_file_fields_tags='file_fields_tags',
                  tag_src_data='sections',
                  tag_ancillary_data='points',
+                 tag_file_format='format',
                  flag_updating_ancillary=True):
 
         self.src_dict = src_dict
@@ -49,6 +48,7 @@ class DriverGeo:
 
         self.tag_src_data = tag_src_data
         self.tag_ancillary_data = tag_ancillary_data
+        self.tag_file_format = tag_file_format
 
         self.flag_updating_ancillary = flag_updating_ancillary
 
@@ -60,6 +60,12 @@ class DriverGeo:
         self.file_name_ancillary = ancillary_dict[self.tag_ancillary_data][self.tag_file_name]
         self.file_path_ancillary = os.path.join(self.folder_name_ancillary, self.file_name_ancillary)
 
+        # Static datasets are stored by default as memory-mappable npy columns
+        if self.tag_file_format in list(ancillary_dict.keys()):
+            self.file_format_ancillary = ancillary_dict[self.tag_file_format]
+        else:
+            self.file_format_ancillary = 'npy'
+
         self.tag_dim_geo_x = 'longitude'
         self.tag_dim_geo_y = 'latitude'
 
@@ -108,19 +114,16 @@ class DriverGeo:
     # -------------------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------------------
-    # Method to write dataset in dictionary format
-    @staticmethod
-    def write_dset_obj(file_name, file_df):
-        file_dict = file_df.to_dict()
-        write_obj(file_name, file_dict)
+    # Method to write dataset in workspace format (npy or pickle)
+    def write_dset_obj(self, file_name, file_df):
+        write_dframe_workspace(file_name, file_df, file_format=self.file_format_ancillary)
     # -------------------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------------------
-    # Method to load dataset saved in dictionary format
+    # Method to load dataset saved in workspace format (only the selected column(s), if defined)
     @staticmethod
-    def read_dset_obj(file_name):
-        file_dict = read_obj(file_name)
-        file_df = pd.DataFrame.from_dict(file_dict)
+    def read_dset_obj(file_name, columns=None):
+        file_df = read_dframe_workspace(file_name, columns=columns)
         return file_df
     # -------------------------------------------------------------------------------------
 
@@ -134,8 +137,7 @@ class DriverGeo:
         file_path_ancillary = self.file_path_ancillary
 
         if self.flag_updating_ancillary:
-            if os.path.exists(file_path_ancillary):
-                os.remove(file_path_ancillary)
+            remove_dframe_workspace(file_path_ancillary)
 
         if os.path.exists(file_path_data):
             if not os.path.exists(file_path_ancillary):
@@ -150,7 +152,7 @@ class DriverGeo:
                 logging.info(' ----> Get sections information ... DONE')
 
             else:
-                df_points = self.read_dset_obj(file_path_ancillary)
+                df_points = self.read_dset_obj(file_path_ancillary, columns=self.columns_name_tag)
                 logging.info(' ----> Get sections information ... DONE. Loaded using saved ancillary file')
         else:
             logging.info(' ----> Get sections information ... FAILED')
@@ -50,6 +50,7 @@ class DriverData:
 
         self.tag_folder_name = 'folder_name'
         self.tag_file_name = 'file_name'
+        self.tag_folder_name_cache = 'folder_name_cache'
         self.tag_file_fields_columns = 'file_fields_columns'
         self.tag_file_fields_types = 'file_fields_types'
         self.tag_file_fields_format = 'file_fields_format'
@@ -79,6 +80,11 @@ class DriverData:
 
         self.folder_name_anc_dset_root = get_root_path(self.folder_name_anc_dset_raw)
 
+        if self.tag_folder_name_cache in list(self.ancillary_dict.keys()):
+            self.folder_name_cache_src = self.ancillary_dict[self.tag_folder_name_cache]
+        else:
+            self.folder_name_cache_src = os.path.join(self.folder_name_anc_dset_root, 'cache')
+
         self.folder_name_dst_dset_raw = self.dst_dict[self.tag_folder_name]
         self.file_name_dst_dset_raw = self.dst_dict[self.tag_file_name]
         self.file_path_dst_dset_collections = self.collect_file_list(
@@ -276,15 +282,11 @@ class DriverData:
 
                         if var_mode_dst:
 
-                            var_value_list = []
-                            for var_da_step in var_da_anc:
-                                var_row_list = []
-                                for var_file in self.file_fields_columns:
-                                    var_value_tmp = var_da_step[var_file].values[0]
-                                    var_row_list.append(var_value_tmp)
-                                var_value_list.append(var_row_list)
+                            # Ancillary data saved as a list of single row dataframes (previous format)
+                            if isinstance(var_da_anc, list):
+                                var_da_anc = pd.concat(var_da_anc, axis=0)
 
-                            var_data_dict[var_name_dst] = var_value_list
+                            var_data_dict[var_name_dst] = var_da_anc[self.file_fields_columns]
                             var_attrs_dict[var_name_dst] = var_attrs_dst
                             logging.info(' -------> Variable ' + var_key_anc + ' ... DONE')
                         else:
@@ -336,6 +338,7 @@ class DriverData:
 
         file_fields_collections = self.file_fields_collections
         file_path_src_collections = self.file_path_src_dset_collections
+        folder_name_cache_src = self.folder_name_cache_src
         file_path_anc_collections = self.file_path_anc_dset_collections
 
         var_src_dict = self.variable_src_dict
@@ -375,7 +378,8 @@ class DriverData:
                                                               tag_file_data='discharge',
                                                               file_time=time_step, file_header=var_file_list,
                                                               file_renamecols=None,
-                                                              file_skipcols=None)
+                                                              file_skipcols=None,
+                                                              file_cache_folder=folder_name_cache_src)
                             logging.info(' -------> Get data  ... DONE')
                         else:
                             logging.info(' -------> Get data  ... FAILED')
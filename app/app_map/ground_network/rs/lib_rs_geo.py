@@ -2,10 +2,7 @@
 # Library
 import logging
 import numpy as np
-import rasterio
-import rasterio.crs
 import os
-import geopandas as gpd
 import pandas as pd
 
 from lib_rs_io_generic import create_darray_2d
@@ -19,6 +16,9 @@ logging.getLogger('fiona').setLevel(logging.WARNING)
 # Method to read shapefile section(s)
 def read_shapefile_points(file_name, columns_name_expected=None, columns_name_type=None, columns_name_tag=None):
 
+    # Import optional backend at first use
+    import geopandas as gpd
+
     if columns_name_expected is None:
         columns_name_expected = ['HMC_X', 'HMC_Y', 'BASIN', 'SEC_NAME', 'SEC_RS', 'AREA', 'Q_THR1', 'Q_THR2']
     if columns_name_type is None:
@@ -74,6 +74,10 @@ def read_file_raster(file_name, file_proj='epsg:4326', var_name='land',
                      coord_name_x='west_east', coord_name_y='south_north',
                      dim_name_x='west_east', dim_name_y='south_north'):
 
+    # Import optional backend at first use
+    import rasterio
+    import rasterio.crs
+
     if os.path.exists(file_name):
         if file_name.endswith('.txt') or file_name.endswith('.asc'):
 
@@ -12,6 +12,7 @@ import logging
 import tempfile
 import os
 import json
+import hashlib
 import pickle
 
 import pandas as pd
@@ -81,41 +82,59 @@ def write_file_ascii(file_name, file_data, file_fields=None,
         logging.error(' ===> Columns "write engine" length is not equal to fields length')
         raise IOError('Bad "file write engine" definition')
 
-    file_dict_generic = {}
-    file_type = []
-    for id_data_rows, file_data_cols in enumerate(file_data):
-        for col_id, (col_format, col_write_engine, col_value) in enumerate(zip(file_format, file_write_engine, file_data_cols)):
-            col_var = 'var' + str(col_id)
-            if col_var not in list(file_dict_generic.keys()):
-                file_dict_generic[col_var] = [col_value]
-                file_type.append(tuple([col_var, col_write_engine]))
-            else:
-                col_data_tmp = file_dict_generic[col_var]
-                col_data_tmp.append(col_value)
-                file_dict_generic[col_var] = col_data_tmp
+    # Organize data by columns (dataframe or list of rows)
+    if isinstance(file_data, pd.DataFrame):
+        file_data_cols = [file_data[file_col].values for file_col in file_data.columns]
+    else:
+        file_data_cols = [np.array(file_col) for file_col in zip(*file_data)]
+
+    if file_data_cols.__len__() != file_fields.__len__():
+        logging.error(' ===> Data columns length is not equal to fields length')
+        raise IOError('Bad "file data" definition')
+
+    # Cast columns to the write engine types and format them (same rules of np.savetxt)
+    file_lines = None
+    for col_format, col_write_engine, col_data in zip(file_format, file_write_engine, file_data_cols):
+        col_values = np.asarray(col_data).astype(col_write_engine)
+        col_lines = np.char.mod(col_format, col_values)
+        if file_lines is None:
+            file_lines = col_lines
+        else:
+            file_lines = np.char.add(np.char.add(file_lines, ' '), col_lines)
 
-    file_dict_array = None
-    for file_key, file_data in file_dict_generic.items():
-        if file_dict_array is None:
-            file_dict_array = np.zeros(file_data.__len__(), dtype=file_type)
-        file_dict_array[file_key] = np.array(file_data)
+    with open(file_name, 'w') as file_handle:
+        if file_lines is not None and file_lines.size > 0:
+            file_handle.write(file_new_line.join(file_lines.tolist()) + file_new_line)
 
-    np.savetxt(file_name, file_dict_array, fmt=file_format, newline=file_new_line)
 
 # -------------------------------------------------------------------------------------
 
 
 # -------------------------------------------------------------------------------------
-# Method to read file csv
-def read_file_csv(file_name, file_time=None, file_header=None,
-                  file_sep=',', file_skiprows=1, file_skipcols=None,
-                  file_renamecols=None, file_time_format='%Y-%m-%d %H:%M',
-                  tag_file_index='time',
-                  tag_file_geo_x='longitude', tag_file_geo_y='latitude', tag_file_data='data',
-                  scale_factor_geo_x=1, scale_factor_geo_y=1, scale_factor_data=1):
+# Csv file(s) parsed by read_file_csv (in-process cache; key: file path)
+file_csv_cache = {}
+file_csv_cache_size = 64
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the key of a csv file (path, modification time, size and parser settings)
+def define_file_csv_key(file_name, file_header, file_sep, file_skiprows, file_renamecols,
+                        file_time_format, tag_file_index):
+    file_stat = os.stat(file_name)
+    file_key = json.dumps({
+        'file_name': os.path.abspath(file_name), 'file_mtime': file_stat.st_mtime_ns,
+        'file_size': file_stat.st_size, 'file_header': file_header, 'file_sep': file_sep,
+        'file_skiprows': file_skiprows, 'file_renamecols': file_renamecols,
+        'file_time_format': file_time_format, 'tag_file_index': tag_file_index}, sort_keys=True, default=str)
+    return file_key
+# -------------------------------------------------------------------------------------
 
-    if file_header is None:
-        file_header = ['code', 'name', 'longitude', 'latitude', 'time', 'data']
+
+# -------------------------------------------------------------------------------------
+# Method to parse file csv (rows sorted by time; file_order is the position of each row in the file)
+def parse_file_csv(file_name, file_header, file_sep, file_skiprows, file_renamecols,
+                   file_time_format, tag_file_index):
 
     file_dframe = pd.read_table(file_name, sep=file_sep, names=file_header, skiprows=file_skiprows)
     if file_renamecols is not None:
@@ -125,25 +144,148 @@ def read_file_csv(file_name, file_time=None, file_header=None,
     file_dframe.index.name = tag_file_index
 
     file_dframe.index = pd.to_datetime(file_dframe.index, format=file_time_format)
-    file_dframe[tag_file_geo_x] = file_dframe[tag_file_geo_x] / scale_factor_geo_x
-    file_dframe[tag_file_geo_y] = file_dframe[tag_file_geo_y] / scale_factor_geo_y
-    file_dframe[tag_file_data] = file_dframe[tag_file_data] / scale_factor_data
 
-    if file_skipcols is not None:
-        if not isinstance(file_skipcols, list):
-            file_skipcols = [file_skipcols]
-        file_dframe = file_dframe.drop(columns=file_skipcols)
+    file_order = np.argsort(file_dframe.index.values, kind='stable')
+    file_dframe = file_dframe.iloc[file_order]
+
+    return file_dframe, file_order
+# -------------------------------------------------------------------------------------
+
 
+# -------------------------------------------------------------------------------------
+# Method to write the columnar cache of a csv file (npz format)
+def write_file_csv_cache(file_name_cache, file_key, file_dframe, file_order):
+
+    file_data = {'key': np.array(file_key), 'order': file_order,
+                 'index': file_dframe.index.values, 'index_name': np.array(file_dframe.index.name),
+                 'columns': np.array([str(column) for column in file_dframe.columns]),
+                 'dtypes': np.array([str(dtype) for dtype in file_dframe.dtypes])}
+    for column_id, column_name in enumerate(file_dframe.columns):
+        file_data['column_' + str(column_id)] = file_dframe[column_name].to_numpy()
+
+    folder_name_cache = os.path.dirname(file_name_cache)
+    if folder_name_cache != '':
+        os.makedirs(folder_name_cache, exist_ok=True)
+    file_name_tmp = create_filename_tmp(prefix='tmp_', suffix='.npz', folder=folder_name_cache)
+    with open(file_name_tmp, 'wb') as file_handle:
+        np.savez(file_handle, **file_data)
+    os.replace(file_name_tmp, file_name_cache)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to read the columnar cache of a csv file (None if not available or outdated)
+def read_file_csv_cache(file_name_cache, file_key):
+
+    if not os.path.exists(file_name_cache):
+        return None, None
+
+    try:
+        with np.load(file_name_cache, allow_pickle=True) as file_data:
+            if str(file_data['key']) != file_key:
+                return None, None
+
+            file_index = pd.DatetimeIndex(file_data['index'], name=str(file_data['index_name']))
+            file_dframe = pd.DataFrame(
+                {str(column_name): file_data['column_' + str(column_id)]
+                 for column_id, column_name in enumerate(file_data['columns'])}, index=file_index)
+            for column_name, column_dtype in zip(file_data['columns'], file_data['dtypes']):
+                if str(file_dframe[str(column_name)].dtype) != str(column_dtype):
+                    file_dframe[str(column_name)] = file_dframe[str(column_name)].astype(str(column_dtype))
+            file_order = file_data['order']
+
+    except Exception as exc:
+        logging.warning(' ===> Cache ' + file_name_cache + ' is not readable (' + str(exc) + '). Update it')
+        return None, None
+
+    return file_dframe, file_order
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to get the parsed csv file from the cache(s) (parse and update the cache(s) if the file changed)
+def get_file_csv(file_name, file_header, file_sep, file_skiprows, file_renamecols,
+                 file_time_format, tag_file_index, file_cache_folder=None):
+
+    file_key = define_file_csv_key(file_name, file_header, file_sep, file_skiprows, file_renamecols,
+                                   file_time_format, tag_file_index)
+    file_path = os.path.abspath(file_name)
+
+    if file_path in file_csv_cache:
+        file_key_cache, file_dframe, file_order = file_csv_cache[file_path]
+        if file_key_cache == file_key:
+            return file_dframe, file_order
+
+    file_name_cache = None
+    if file_cache_folder is not None:
+        file_name_cache = os.path.join(
+            file_cache_folder, hashlib.sha1(file_path.encode('utf-8')).hexdigest() + '.npz')
+        file_dframe, file_order = read_file_csv_cache(file_name_cache, file_key)
+    else:
+        file_dframe, file_order = None, None
+
+    if file_dframe is None:
+        file_dframe, file_order = parse_file_csv(file_name, file_header, file_sep, file_skiprows,
+                                                 file_renamecols, file_time_format, tag_file_index)
+        if file_name_cache is not None:
+            write_file_csv_cache(file_name_cache, file_key, file_dframe, file_order)
+
+    file_csv_cache.pop(file_path, None)
+    if len(file_csv_cache) >= file_csv_cache_size:
+        file_csv_cache.pop(next(iter(file_csv_cache)))
+    file_csv_cache[file_path] = (file_key, file_dframe, file_order)
+
+    return file_dframe, file_order
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to read file csv
+def read_file_csv(file_name, file_time=None, file_header=None,
+                  file_sep=',', file_skiprows=1, file_skipcols=None,
+                  file_renamecols=None, file_time_format='%Y-%m-%d %H:%M',
+                  tag_file_index='time',
+                  tag_file_geo_x='longitude', tag_file_geo_y='latitude', tag_file_data='data',
+                  scale_factor_geo_x=1, scale_factor_geo_y=1, scale_factor_data=1,
+                  file_cache_folder=None):
+
+    if file_header is None:
+        file_header = ['code', 'name', 'longitude', 'latitude', 'time', 'data']
+
+    file_dframe, file_order = get_file_csv(file_name, file_header, file_sep, file_skiprows, file_renamecols,
+                                           file_time_format, tag_file_index, file_cache_folder=file_cache_folder)
+
+    # Select the time rows (binary search over the sorted times; rows keep the file order)
     if file_time is not None:
-        if file_time in file_dframe.index:
-            file_dframe_select = file_dframe.loc[file_time]
+        file_time_values = file_dframe.index.values
+        file_time_step = np.datetime64(pd.Timestamp(file_time))
+        idx_start = np.searchsorted(file_time_values, file_time_step, side='left')
+        idx_end = np.searchsorted(file_time_values, file_time_step, side='right')
+        if idx_end > idx_start:
+            file_dframe = file_dframe.iloc[idx_start:idx_end]
         else:
-            file_dframe_select = None
+            file_dframe = None
             logging.warning(' ===> Time ' + str(file_time) + ' is not available in file: ' + file_name)
     else:
-        file_dframe_select = file_dframe
+        file_dframe = file_dframe.iloc[np.argsort(file_order, kind='stable')]
+
+    if file_dframe is not None:
+        file_dframe = file_dframe.copy()
+        file_dframe[tag_file_geo_x] = file_dframe[tag_file_geo_x] / scale_factor_geo_x
+        file_dframe[tag_file_geo_y] = file_dframe[tag_file_geo_y] / scale_factor_geo_y
+        file_dframe[tag_file_data] = file_dframe[tag_file_data] / scale_factor_data
+
+        if file_skipcols is not None:
+            if not isinstance(file_skipcols, list):
+                file_skipcols = [file_skipcols]
+            file_dframe = file_dframe.drop(columns=file_skipcols)
 
-    return file_dframe_select
+    # Single row matching the time returned as series (as the label-based selection)
+    if file_time is not None and file_dframe is not None:
+        if file_dframe.shape[0] == 1:
+            file_dframe = file_dframe.iloc[0]
+
+    return file_dframe
 
 # -------------------------------------------------------------------------------------
 
@@ -495,3 +637,108 @@ def write_obj(filename, data):
     with open(filename, 'wb') as handle:
         pickle.dump(data, handle, protocol=pickle.HIGHEST_PROTOCOL)
 # -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the file(s) of a workspace dataframe saved in npy format
+def define_dframe_workspace_npy(file_name, col_name):
+    return file_name + '.' + str(col_name) + '.npy'
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to detect the format of a workspace dataframe
+def detect_dframe_workspace(file_name):
+    with open(file_name, 'rb') as file_handle:
+        file_header = file_handle.read(8)
+    if file_header.lstrip().startswith(b'{'):
+        file_format = 'npy'
+    else:
+        file_format = 'pickle'
+    return file_format
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to write workspace dataframe (formats: npy or pickle)
+def write_dframe_workspace(file_name, file_df, file_format='npy'):
+
+    remove_dframe_workspace(file_name)
+
+    if file_format == 'npy':
+        # one npy file for each column (index included) and a json sidecar with the columns order and types
+        df_info = {'index': {'name': file_df.index.name, 'dtype': str(file_df.index.dtype)}, 'columns': {}}
+        np.save(define_dframe_workspace_npy(file_name, '__index__'), np.asarray(file_df.index.values),
+                allow_pickle=True)
+        for col_id, col_name in enumerate(file_df.columns):
+            col_values = file_df[col_name].to_numpy()
+            col_pickle = False
+            if col_values.dtype == object:
+                if all(isinstance(col_value, str) for col_value in col_values):
+                    col_values = col_values.astype(str)
+                else:
+                    col_pickle = True
+            np.save(define_dframe_workspace_npy(file_name, col_id), col_values, allow_pickle=col_pickle)
+            df_info['columns'][col_name] = {'id': col_id, 'dtype': str(file_df[col_name].dtype), 'pickle': col_pickle}
+        with open(file_name, 'w') as file_handle:
+            json.dump(df_info, file_handle)
+
+    elif file_format == 'pickle':
+        write_obj(file_name, file_df.to_dict())
+
+    else:
+        logging.error(' ===> Workspace format "' + file_format + '" is not supported')
+        raise NotImplementedError('Case not implemented yet')
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to read workspace dataframe (format is detected by the file content)
+def read_dframe_workspace(file_name, columns=None):
+
+    file_format = detect_dframe_workspace(file_name)
+
+    if file_format == 'npy':
+        # numeric columns are memory-mapped (read-only); only the selected column(s) are loaded
+        with open(file_name, 'r') as file_handle:
+            df_info = json.load(file_handle)
+        df_index = np.load(define_dframe_workspace_npy(file_name, '__index__'), allow_pickle=True)
+        df_data = {}
+        for col_name, col_info in df_info['columns'].items():
+            if (columns is not None) and (col_name not in columns):
+                continue
+            col_file = define_dframe_workspace_npy(file_name, col_info['id'])
+            if col_info['pickle']:
+                col_values = np.load(col_file, allow_pickle=True)
+            else:
+                col_values = np.load(col_file, mmap_mode='r')
+            if col_values.dtype.kind == 'U':
+                col_values = col_values.astype(object)
+            df_data[col_name] = col_values
+        file_df = pd.DataFrame(data=df_data, index=pd.Index(df_index, name=df_info['index']['name']))
+
+    else:
+        # legacy workspace (dictionary saved by pickle)
+        file_df = pd.DataFrame.from_dict(read_obj(file_name))
+        if columns is not None:
+            file_df = file_df[[col_name for col_name in file_df.columns if col_name in columns]]
+
+    return file_df
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to remove workspace dataframe (and the npy file(s), if any)
+def remove_dframe_workspace(file_name):
+    if os.path.exists(file_name):
+        if detect_dframe_workspace(file_name) == 'npy':
+            with open(file_name, 'r') as file_handle:
+                df_info = json.load(file_handle)
+            col_files = [define_dframe_workspace_npy(file_name, '__index__')]
+            col_files += [define_dframe_workspace_npy(file_name, col_info['id'])
+                          for col_info in df_info['columns'].values()]
+            for col_file in col_files:
+                if os.path.exists(col_file):
+                    os.remove(col_file)
+        os.remove(file_name)
+# -------------------------------------------------------------------------------------
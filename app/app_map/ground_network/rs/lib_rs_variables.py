@@ -13,7 +13,6 @@ import numpy as np
 import pandas as pd
 
 # Debug
-import matplotlib.pylab as plt
 logging.getLogger('matplotlib').setLevel(logging.WARNING)
 # -------------------------------------------------------------------------------------
 
@@ -29,10 +28,6 @@ def convert_values2points(data_collections, geo_collections,
     if tag_file_fields is None:
         tag_file_fields = ['code', 'discharge', 'tag']
 
-    idx_sections = geo_collections[tag_idx_section].values.tolist()
-    code_sections = geo_collections[tag_code_section].values.tolist()
-    tag_sections = geo_collections[tag_tag_section].values.tolist()
-
     time_data = list(set(data_collections.index.tolist()))
 
     if tag_code_data not in tag_file_fields:
@@ -48,73 +43,39 @@ def convert_values2points(data_collections, geo_collections,
     else:
         time_data = time_data[0]
 
-    df_collections = []
-    for idx_section, code_section, tag_section in zip(idx_sections, code_sections, tag_sections):
-
-        logging.info(' --------> Get data for point: ' + tag_section + ' ... ')
-
-        row_geo = geo_collections[geo_collections[tag_idx_section].values == idx_section]
-
-        if code_section in data_collections[tag_code_data].values.tolist():
-            row_data = data_collections[data_collections[tag_code_data].values == code_section]
-
-            if row_geo[tag_code_section].values == row_data[tag_code_data].values:
-                df_data = row_data[tag_file_fields]
-
-                if df_data.index.size == 1:
-                    if np.isnan(df_data[tag_name_data].values[0]):
-                        df_data[tag_name_data] = no_data
-
-                logging.info(' --------> Get data for point: ' + tag_section + ' ... DONE')
-            else:
-                logging.warning(' ===> Code of section and data is not equal. Init value with ' + str(missing_data))
-
-                if tag_section in geo_collections[tag_tag_section].values.tolist():
-                    row_geo = geo_collections[geo_collections[tag_tag_section].values == tag_section]
-                    code_data = row_geo[tag_code_data].values[0]
-                else:
-                    code_data = missing_data
-
-                value_dict = {}
-                for tag_field in tag_file_fields:
-                    if tag_field != tag_name_data:
-                        if tag_field in list(row_geo.columns):
-                            value_tmp = row_geo[tag_field].values[0]
-                        else:
-                            if tag_field == tag_name_data:
-                                value_tmp = no_data
-                            elif tag_field == tag_code_data:
-                                value_tmp = code_data
-                    else:
-                        value_tmp = no_data
-                    value_dict[tag_field] = value_tmp
-                df_data = pd.DataFrame(data=value_dict, index=[time_data])
-
-                logging.info(' --------> Get data for point: ' + tag_section + ' ... DONE')
+    # Section registry (one row for each section)
+    df_sections = geo_collections.drop_duplicates(subset=tag_idx_section, keep='first')
+    df_sections = df_sections.set_index(tag_idx_section, drop=False)
+
+    # Data values (first row for each section code) aligned with the section registry
+    df_values = data_collections.drop_duplicates(subset=tag_code_data, keep='first')
+    df_values = df_values.set_index(tag_code_data, drop=False)
+    idx_values = df_values.index.get_indexer(df_sections[tag_code_section].values)
+    idx_found = idx_values >= 0
+
+    logging.info(' --------> Get data for points ... ' + str(int(np.count_nonzero(idx_found))) + '/' +
+                 str(idx_found.size) + ' sections found in data values')
+    if not np.all(idx_found):
+        logging.info(' --------> Sections not in data values: ' +
+                     ', '.join(df_sections[tag_tag_section].values[~idx_found].astype(str).tolist()))
+
+    value_dict = {}
+    for tag_field in tag_file_fields:
+        if tag_field == tag_name_data:
+            value_data = df_values[tag_field].values.astype(float)[idx_values]
+            value_data[~idx_found] = no_data
+            value_data[np.isnan(value_data)] = no_data
         else:
-            logging.info(' --------> Get data for point: ' + tag_section + ' ... SKIPPED. Section is not in data values')
-
-            if tag_section in geo_collections[tag_tag_section].values.tolist():
-                row_geo = geo_collections[geo_collections[tag_tag_section].values == tag_section]
-                code_data = row_geo[tag_code_data].values[0]
+            value_data = df_values[tag_field].values.astype(object)[idx_values]
+            if tag_field in list(df_sections.columns):
+                value_data[~idx_found] = df_sections[tag_field].values[~idx_found]
             else:
-                code_data = missing_data
-
-            value_dict = {}
-            for tag_field in tag_file_fields:
-                if tag_field != tag_name_data:
-                    if tag_field in list(row_geo.columns):
-                        value_tmp = row_geo[tag_field].values[0]
-                        if tag_field == tag_name_data:
-                            value_tmp = no_data
-                        elif tag_field == tag_code_data:
-                            value_tmp = code_data
-                else:
-                    value_tmp = no_data
-                value_dict[tag_field] = value_tmp
-            df_data = pd.DataFrame(data=value_dict, index=[time_data])
+                value_data[~idx_found] = missing_data
+        value_dict[tag_field] = value_data
 
-        df_collections.append(df_data)
+    df_collections = pd.DataFrame(data=value_dict, index=df_sections[tag_tag_section].values, columns=tag_file_fields)
+    df_collections = df_collections.infer_objects()
+    df_collections.attrs = {tag_time_data: time_data}
 
     return df_collections
 
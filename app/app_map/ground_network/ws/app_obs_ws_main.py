@@ -25,7 +25,8 @@ Version:
 # -------------------------------------------------------------------------------------
 # Libraries
 import logging
-import matplotlib.pylab as plt
+import traceback
+import multiprocessing as mp
 
 from argparse import ArgumentParser
 from time import time, strftime, gmtime
@@ -47,6 +48,8 @@ alg_release = '2024-10-15'
 alg_type = 'Package'
 # Algorithm parameter(s)
 time_format = '%Y-%m-%d %H:%M'
+# Algorithm workspace shared (read-only) with the forked worker(s)
+alg_workspace = {}
 # -------------------------------------------------------------------------------------
 
 
@@ -98,33 +101,35 @@ def main():
 
     # -------------------------------------------------------------------------------------
     # Iterate over time steps
-    for time_step in time_range:
-
-        # -------------------------------------------------------------------------------------
-        # Get data dynamic
-        driver_data_dynamic = DriverData(
-            time_step=time_step,
-            geo_collections=geo_collections,
-            src_dict=data_settings['data']['dynamic']['source'],
-            ancillary_dict=data_settings['data']['dynamic']['ancillary'],
-            dst_dict=data_settings['data']['dynamic']['destination'],
-            time_dict=data_settings['data']['dynamic']['time'],
-            variable_src_dict=data_settings['variables']['source'],
-            variable_dst_dict=data_settings['variables']['destination'],
-            info_dict=data_settings['algorithm']['info'],
-            template_dict=data_settings['algorithm']['template'],
-            flag_updating_ancillary=data_settings['algorithm']['flag']['update_dynamic_data_ancillary'],
-            flag_updating_destination=data_settings['algorithm']['flag']['update_dynamic_data_destination'],
-            flag_cleaning_tmp=data_settings['algorithm']['flag']['clean_temporary_data'])
-
-        # Method to organize datasets
-        driver_data_dynamic.organize_data()
-        # Method to dump datasets
-        driver_data_dynamic.dump_data()
-        # Method to delete tmp
-        driver_data_dynamic.clean_tmp()
-        # -------------------------------------------------------------------------------------
+    alg_workers = get_workers(data_settings['algorithm'])
+    if alg_workers > 1 and time_range.__len__() > 1:
+
+        # Set workspace shared by the forked worker(s) (static collections are loaded once)
+        alg_workspace['data_settings'] = data_settings
+        alg_workspace['geo_collections'] = geo_collections
+
+        logging.info(' --> Process time steps in parallel mode [workers: ' + str(alg_workers) + '] ... ')
+        alg_context = mp.get_context('fork')
+        with alg_context.Pool(processes=min(alg_workers, time_range.__len__()),
+                              initializer=init_time_step_worker) as alg_pool:
+            time_failed = []
+            for time_step, time_status, time_records in alg_pool.imap(exec_time_step_worker, list(time_range)):
+                # Replay worker log record(s) in time order
+                for time_record in time_records:
+                    logging.getLogger(time_record.name).handle(time_record)
+                if not time_status:
+                    time_failed.append(str(time_step))
+
+        if time_failed:
+            logging.warning(' ===> Time step(s) failed: ' + ', '.join(time_failed))
+            logging.info(' --> Process time steps in parallel mode [workers: ' + str(alg_workers) +
+                         '] ... FAILED for ' + str(time_failed.__len__()) + ' time step(s)')
+        else:
+            logging.info(' --> Process time steps in parallel mode [workers: ' + str(alg_workers) + '] ... DONE')
 
+    else:
+        for time_step in time_range:
+            exec_time_step(time_step, geo_collections, data_settings)
     # -------------------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------------------
@@ -144,6 +149,107 @@ def main():
 # -------------------------------------------------------------------------------------
 
 
+# -------------------------------------------------------------------------------------
+# Method to process a time step
+def exec_time_step(time_step, geo_collections, data_settings):
+
+    # Get data dynamic
+    driver_data_dynamic = DriverData(
+        time_step=time_step,
+        geo_collections=geo_collections,
+        src_dict=data_settings['data']['dynamic']['source'],
+        ancillary_dict=data_settings['data']['dynamic']['ancillary'],
+        dst_dict=data_settings['data']['dynamic']['destination'],
+        time_dict=data_settings['data']['dynamic']['time'],
+        variable_src_dict=data_settings['variables']['source'],
+        variable_dst_dict=data_settings['variables']['destination'],
+        info_dict=data_settings['algorithm']['info'],
+        template_dict=data_settings['algorithm']['template'],
+        flag_updating_ancillary=data_settings['algorithm']['flag']['update_dynamic_data_ancillary'],
+        flag_updating_destination=data_settings['algorithm']['flag']['update_dynamic_data_destination'],
+        flag_cleaning_tmp=data_settings['algorithm']['flag']['clean_temporary_data'])
+
+    # Method to organize datasets
+    driver_data_dynamic.organize_data()
+    # Method to dump datasets
+    driver_data_dynamic.dump_data()
+    # Method to delete tmp
+    driver_data_dynamic.clean_tmp()
+
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Class to collect log record(s) in the worker process
+class RecordHandler(logging.Handler):
+
+    def __init__(self):
+        super(RecordHandler, self).__init__(level=logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        # Format message and traceback to make the record picklable
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        self.records.append(record)
+
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to initialize the worker process (log records are sent back to the main process)
+def init_time_step_worker():
+
+    logger_root = logging.getLogger('')
+    for logger_handle in list(logger_root.handlers):
+        logger_root.removeHandler(logger_handle)
+    alg_workspace['record_handler'] = RecordHandler()
+    logger_root.addHandler(alg_workspace['record_handler'])
+
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to process a time step in the worker process (failures are isolated by time step)
+def exec_time_step_worker(time_step):
+
+    record_handler = alg_workspace['record_handler']
+    record_handler.records = []
+
+    try:
+        exec_time_step(time_step, alg_workspace['geo_collections'], alg_workspace['data_settings'])
+        time_status = True
+    except Exception as exc:
+        logging.error(' ===> Time step "' + str(time_step) + '" failed: ' + str(exc))
+        logging.error(traceback.format_exc())
+        time_status = False
+
+    return time_step, time_status, record_handler.records
+
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to get the number of worker(s)
+def get_workers(algorithm_settings):
+
+    alg_workers = 1
+    if 'execution' in list(algorithm_settings.keys()):
+        if 'workers' in list(algorithm_settings['execution'].keys()):
+            alg_workers = algorithm_settings['execution']['workers']
+    if alg_workers is None:
+        alg_workers = 1
+    elif alg_workers <= 0:
+        alg_workers = mp.cpu_count()
+
+    return int(alg_workers)
+
+# -------------------------------------------------------------------------------------
+
+
 # -------------------------------------------------------------------------------------
 # Method to get script argument(s)
 def get_args():
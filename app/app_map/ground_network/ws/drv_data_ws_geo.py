@@ -12,13 +12,13 @@ Version:       '1.0.0'
 import logging
 import os
 import json
-import xarray as xr
+import numpy as np
 
 from lib_ws_geo import read_file_raster
-from lib_ws_io_generic import write_obj, read_obj, convert_values2da
-from lib_ws_generic import make_folder
+from lib_ws_io_generic import convert_values2da, \
+    write_dset_workspace, read_dset_workspace, remove_dset_workspace
 
-from lib_ws_ancillary_snow import compute_predictor, command_line_predictor
+from lib_ws_ancillary_snow import compute_predictor, terrain_predictor
 
 # Debug
 # import matplotlib.pylab as plt
@@ -39,6 +39,7 @@ class DriverGeo:
                  tag_dst_data_slope='slope_data',
                  tag_dst_data_hillshade='hillshade_data',
                  tag_dst_data_roughness='roughness',
+                 tag_file_format='format',
                  flag_updating_ancillary=True):
 
         self.src_dict = src_dict
@@ -56,6 +57,7 @@ class DriverGeo:
         self.tag_dst_data_slope = tag_dst_data_slope
         self.tag_dst_data_hillshade = tag_dst_data_hillshade
         self.tag_dst_data_roughness = tag_dst_data_roughness
+        self.tag_file_format = tag_file_format
 
         self.flag_updating_ancillary = flag_updating_ancillary
 
@@ -71,6 +73,12 @@ class DriverGeo:
         self.file_name_ancillary_predictor = ancillary_dict[self.tag_ancillary_data_predictor][self.tag_file_name]
         self.file_path_ancillary_predictor = os.path.join(self.folder_name_ancillary_predictor, self.file_name_ancillary_predictor)
 
+        # Static datasets are stored by default as memory-mappable npy layers (shared by concurrent processes)
+        if self.tag_file_format in list(ancillary_dict.keys()):
+            self.file_format_ancillary = ancillary_dict[self.tag_file_format]
+        else:
+            self.file_format_ancillary = 'npy'
+
         self.tag_dim_geo_x = 'longitude'
         self.tag_dim_geo_y = 'latitude'
         self.tag_coord_geo_x = 'west_east'
@@ -79,19 +87,16 @@ class DriverGeo:
     # -------------------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------------------
-    # Method to write dataset in dictionary format
-    @staticmethod
-    def write_dset_obj(file_name, file_dset):
-        file_dict = file_dset.to_dict()
-        write_obj(file_name, file_dict)
+    # Method to write dataset in workspace format (npy, netcdf or pickle)
+    def write_dset_obj(self, file_name, file_dset):
+        write_dset_workspace(file_name, file_dset, file_format=self.file_format_ancillary)
     # -------------------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------------------
-    # Method to load dataset saved in dictionary format
+    # Method to load dataset saved in workspace format (only the selected variable(s), if defined)
     @staticmethod
-    def read_dset_obj(file_name):
-        file_dict = read_obj(file_name)
-        file_dset = xr.Dataset.from_dict(file_dict)
+    def read_dset_obj(file_name, var_list=None):
+        file_dset = read_dset_workspace(file_name, var_list=var_list)
         return file_dset
     # -------------------------------------------------------------------------------------
 
@@ -107,9 +112,14 @@ class DriverGeo:
         values_geo_x = dset_land[self.tag_coord_geo_x].values
         values_geo_y = dset_land[self.tag_coord_geo_y].values
 
+        # Get land values and resolution (resolution y is negative for north-up grids)
+        values_land = dset_land[self.tag_src_data].values
+        no_data_land = dset_land.attrs.get('no_data', -9999.0)
+        res_geo_x = float(np.mean(np.diff(values_geo_x)))
+        res_geo_y = float(np.mean(np.diff(values_geo_y)))
+
         if self.flag_updating_ancillary:
-            if os.path.exists(file_path_ancillary):
-                os.remove(file_path_ancillary)
+            remove_dset_workspace(file_path_ancillary)
 
         dset_predictor = None
         if os.path.exists(file_path_land):
@@ -119,17 +129,12 @@ class DriverGeo:
 
                     logging.info(' -----> Variable ' + var_name + ' ... ')
 
-                    if var_name in list(command_line_predictor.keys()):
-
-                        cmd_step = command_line_predictor[var_name]['command_line']
-
-                        folder_name_step = var_fields[self.tag_folder_name]
-                        file_name_step = var_fields[self.tag_file_name]
-                        file_path_step = os.path.join(folder_name_step, file_name_step)
+                    if var_name in list(terrain_predictor.keys()):
 
-                        make_folder(folder_name_step)
+                        settings_step = terrain_predictor[var_name]
 
-                        values_predictor = compute_predictor(file_path_land, file_path_step, cmd_step)
+                        values_predictor = compute_predictor(
+                            values_land, res_geo_x, res_geo_y, no_data_in=no_data_land, **settings_step)
                         da_predictor = convert_values2da(values_predictor, values_geo_x, values_geo_y, var_name=var_name,
                                                          coord_name_x=self.tag_coord_geo_x, coord_name_y=self.tag_coord_geo_y,
                                                          dim_name_x=self.tag_dim_geo_x, dim_name_y=self.tag_dim_geo_y)
@@ -151,7 +156,8 @@ class DriverGeo:
                     logging.warning(' ===> Predictors are not available ')
             else:
 
-                dset_predictor = self.read_dset_obj(file_path_ancillary)
+                var_list = [var_name for var_name in self.dst_dict.keys() if var_name in list(terrain_predictor.keys())]
+                dset_predictor = self.read_dset_obj(file_path_ancillary, var_list=var_list)
                 logging.info(' ----> Get predictors information ... DONE. Loaded using saved ancillary file')
 
         else:
@@ -173,8 +179,7 @@ class DriverGeo:
         file_path_ancillary = self.file_path_ancillary_geo
 
         if self.flag_updating_ancillary:
-            if os.path.exists(file_path_ancillary):
-                os.remove(file_path_ancillary)
+            remove_dset_workspace(file_path_ancillary)
 
         if os.path.exists(file_path_land):
             if not os.path.exists(file_path_ancillary):
@@ -197,7 +202,7 @@ class DriverGeo:
                 logging.info(' ----> Get land information ... DONE')
 
             else:
-                dset_land = self.read_dset_obj(file_path_ancillary)
+                dset_land = self.read_dset_obj(file_path_ancillary, var_list=[var_name])
                 logging.info(' ----> Get land information ... DONE. Loaded using saved ancillary file')
         else:
             logging.info(' ----> Get land information ... FAILED')
@@ -15,13 +15,13 @@ import logging
 import os
 import time
 
-import xarray as xr
 import pandas as pd
 
 from lib_ws_conventions import conventions_vars
 from cpl_data_variables_ws import DriverVariable
 
-from lib_ws_io_generic import write_obj, read_obj, convert_values2da, create_dset, write_dset, read_file_csv
+from lib_ws_io_generic import convert_values2da, create_dset, write_dset, read_file_csv, \
+    write_dset_workspace, read_dset_workspace, remove_dset_workspace
 from lib_ws_generic import make_folder, fill_tags2string, list_folder, get_root_path
 
 from lib_ws_io_gzip import zip_filename
@@ -50,8 +50,10 @@ class DriverData:
 
         self.tag_folder_name = 'folder_name'
         self.tag_file_name = 'file_name'
+        self.tag_folder_name_cache = 'folder_name_cache'
         self.tag_file_fields = 'file_fields'
         self.tag_file_compression = 'file_compression'
+        self.tag_file_format = 'format'
 
         self.domain_name = info_dict['domain']
         self.variable_src_list = list(self.variable_src_dict.keys())
@@ -77,6 +79,16 @@ class DriverData:
 
         self.folder_name_anc_dset_root = get_root_path(self.folder_name_anc_dset_raw)
 
+        if self.tag_folder_name_cache in list(self.ancillary_dict.keys()):
+            self.folder_name_cache_src = self.ancillary_dict[self.tag_folder_name_cache]
+        else:
+            self.folder_name_cache_src = os.path.join(self.folder_name_anc_dset_root, 'cache')
+
+        if self.tag_file_format in list(self.ancillary_dict.keys()):
+            self.file_format_anc = self.ancillary_dict[self.tag_file_format]
+        else:
+            self.file_format_anc = 'pickle'
+
         self.folder_name_dst_dset_raw = self.dst_dict[self.tag_folder_name]
         self.file_name_dst_dset_raw = self.dst_dict[self.tag_file_name]
         self.file_path_dst_dset_collections = self.collect_file_list(
@@ -158,19 +170,16 @@ class DriverData:
     # -------------------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------------------
-    # Method to write dataset in dictionary format
-    @staticmethod
-    def write_dset_obj(file_name, file_dset):
-        file_dict = file_dset.to_dict()
-        write_obj(file_name, file_dict)
+    # Method to write dataset in workspace format (netcdf, npy or pickle)
+    def write_dset_obj(self, file_name, file_dset):
+        write_dset_workspace(file_name, file_dset, file_format=self.file_format_anc)
     # -------------------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------------------
-    # Method to load dataset saved in dictionary format
+    # Method to load dataset saved in workspace format (format is detected by the file)
     @staticmethod
     def read_dset_obj(file_name):
-        file_dict = read_obj(file_name)
-        file_dset = xr.Dataset.from_dict(file_dict)
+        file_dset = read_dset_workspace(file_name)
         return file_dset
     # -------------------------------------------------------------------------------------
 
@@ -309,6 +318,7 @@ class DriverData:
 
         file_fields_collections = self.file_fields_collections
         file_path_src_collections = self.file_path_src_dset_collections
+        folder_name_cache_src = self.folder_name_cache_src
         file_path_anc_collections = self.file_path_anc_dset_collections
 
         var_src_dict = self.variable_src_dict
@@ -323,7 +333,7 @@ class DriverData:
 
             if flag_upd_anc:
                 if os.path.exists(var_file_path_anc):
-                    os.remove(var_file_path_anc)
+                    remove_dset_workspace(var_file_path_anc)
 
             if not os.path.exists(var_file_path_anc):
 
@@ -351,7 +361,8 @@ class DriverData:
                             var_file_data_src = read_file_csv(var_file_path_src,
                                                               file_time=time_step, file_header=var_file_list,
                                                               file_renamecols={'time_end': 'time'},
-                                                              file_skipcols=['time_start'])
+                                                              file_skipcols=['time_start'],
+                                                              file_cache_folder=folder_name_cache_src)
                             logging.info(' -------> Get data  ... DONE')
                         else:
                             logging.info(' -------> Get data  ... FAILED')
@@ -424,7 +435,7 @@ class DriverData:
             # Remove tmp file and folder(s)
             for file_path_step in file_path_anc_list:
                 if os.path.exists(file_path_step):
-                    os.remove(file_path_step)
+                    remove_dset_workspace(file_path_step)
                 var_folder_name_step, var_file_name_step = os.path.split(file_path_step)
                 if var_folder_name_step != '':
                     if os.path.exists(var_folder_name_step):
@@ -11,26 +11,423 @@ Version:       '1.0.0'
 # Logging
 import logging
 import tempfile
-import rasterio
 import os
+import hashlib
+
+import numpy as np
 
 from numpy import zeros, min, max, flipud, savetxt
+from scipy.spatial import cKDTree
+from scipy.sparse import csr_matrix
 
 from lib_ws_generic import random_string, delete_folder, make_folder
 from lib_ws_process import exec_process
 
 # Debug
 # import matplotlib.pylab as plt
+
+# Grid tree(s) (built once for each target grid)
+grid_tree_collections = {}
+# Interpolation plan(s) (built once for each point set and target grid; bounded by their size in bytes)
+interp_plan_collections = {}
+interp_plan_oversize = set()
+interp_plan_bytes_max = 256 * 1024 * 1024
+# Point-node pair(s) searched for each block of points
+interp_pairs_block = 2000000
 #######################################################################################
 
 
 # -------------------------------------------------------------------------------------
-# Method to interpolate point data to grid
+# Method to get grid tree (nodes are defined as in gdal_grid using -txe, -tye and -outsize)
+def get_grid_tree(geox_out_2d, geoy_out_2d):
+
+    # Define geographical information
+    geox_out_min, geox_out_max = float(np.min(geox_out_2d)), float(np.max(geox_out_2d))
+    geoy_out_min, geoy_out_max = float(np.min(geoy_out_2d)), float(np.max(geoy_out_2d))
+    geo_out_rows, geo_out_cols = geox_out_2d.shape[0], geox_out_2d.shape[1]
+
+    # Check grid tree availability
+    grid_key = (geox_out_min, geox_out_max, geoy_out_min, geoy_out_max, geo_out_rows, geo_out_cols)
+    if grid_key not in grid_tree_collections:
+
+        # Define nodes (cell centers of the gdal_grid raster; first row at the north boundary)
+        geox_out_res = (geox_out_max - geox_out_min) / geo_out_cols
+        geoy_out_res = (geoy_out_max - geoy_out_min) / geo_out_rows
+        geox_nodes_1d = geox_out_min + (np.arange(geo_out_cols) + 0.5) * geox_out_res
+        geoy_nodes_1d = geoy_out_max - (np.arange(geo_out_rows) + 0.5) * geoy_out_res
+        geox_nodes_2d, geoy_nodes_2d = np.meshgrid(geox_nodes_1d, geoy_nodes_1d)
+
+        # Build tree
+        grid_tree_collections[grid_key] = cKDTree(
+            np.column_stack([geox_nodes_2d.ravel(), geoy_nodes_2d.ravel()]))
+
+    return grid_tree_collections[grid_key]
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to search the grid nodes around the points (pairs within the search ellipse, by blocks of points)
+# (each block holds up to pairs_block point-node pairs, so that memory does not grow with points x nodes)
+def search_interp_pairs(grid_tree, geox_in_1d, geoy_in_1d, radius_x, radius_y, n_cpu=1, pairs_block=None):
+
+    if pairs_block is None:
+        pairs_block = interp_pairs_block
+
+    grid_nodes = grid_tree.data
+    grid_n = grid_nodes.shape[0]
+    point_n = geox_in_1d.shape[0]
+    point_coords = np.column_stack([geox_in_1d, geoy_in_1d])
+    if point_n == 0:
+        return
+
+    # Define search radius (all the points are used if the ellipse is not defined, as in gdal_grid)
+    if (radius_x > 0) and (radius_y > 0):
+        radius_search = np.max([radius_x, radius_y])
+        radius_ellipse = True
+        node_n = grid_tree.query_ball_point(point_coords, r=radius_search, workers=n_cpu, return_length=True)
+    else:
+        radius_search = None
+        radius_ellipse = False
+        node_n = np.full(shape=[point_n], fill_value=grid_n)
+    node_n_cum = np.cumsum(node_n)
+
+    point_start = 0
+    while point_start < point_n:
+
+        # Define the block of points (at least one point for each block)
+        pairs_start = node_n_cum[point_start - 1] if point_start > 0 else 0
+        point_end = int(np.searchsorted(node_n_cum, pairs_start + pairs_block, side='right'))
+        point_end = int(np.clip(point_end, point_start + 1, point_n))
+
+        # Search the grid nodes around each point of the block (nodes sorted by index)
+        if radius_ellipse:
+            node_lists = grid_tree.query_ball_point(
+                point_coords[point_start:point_end], r=radius_search, workers=n_cpu, return_sorted=True)
+            node_idx = np.concatenate([np.asarray(node_list, dtype=int) for node_list in node_lists])
+        else:
+            node_idx = np.tile(np.arange(grid_n), point_end - point_start)
+        point_idx = np.repeat(np.arange(point_start, point_end), node_n[point_start:point_end])
+
+        # Compute distance(s) and apply the search ellipse
+        node_dx = grid_nodes[node_idx, 0] - geox_in_1d[point_idx]
+        node_dy = grid_nodes[node_idx, 1] - geoy_in_1d[point_idx]
+        if radius_ellipse:
+            node_in = (node_dx * node_dx * radius_y * radius_y +
+                       node_dy * node_dy * radius_x * radius_x) <= (radius_x * radius_x * radius_y * radius_y)
+            node_idx, point_idx = node_idx[node_in], point_idx[node_in]
+            node_dx, node_dy = node_dx[node_in], node_dy[node_in]
+        node_r2 = node_dx * node_dx + node_dy * node_dy
+
+        yield node_idx, point_idx, node_r2
+
+        point_start = point_end
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to select the nearest point of each node (ties solved by the point order; blocks follow the point order)
+def select_interp_nearest(interp_pairs, grid_n):
+
+    node_r2_min = np.full(shape=[grid_n], fill_value=np.inf)
+    node_point = np.full(shape=[grid_n], fill_value=-1, dtype=int)
+    for node_idx, point_idx, node_r2 in interp_pairs:
+        node_order = np.lexsort((point_idx, node_r2, node_idx))
+        node_sorted = node_idx[node_order]
+        node_first = np.ones(shape=node_sorted.shape, dtype=bool)
+        node_first[1:] = node_sorted[1:] != node_sorted[:-1]
+        node_select = node_order[node_first]
+
+        node_idx, point_idx, node_r2 = node_idx[node_select], point_idx[node_select], node_r2[node_select]
+        node_update = node_r2 < node_r2_min[node_idx]
+        node_r2_min[node_idx[node_update]] = node_r2[node_update]
+        node_point[node_idx[node_update]] = point_idx[node_update]
+
+    return node_point
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to compute inverse distance weights (points at the node position are used as they are)
+def compute_interp_weights(node_r2, interp_power=2.0, interp_r2_min=0.0000000000001):
+
+    node_coincident = node_r2 < interp_r2_min
+    node_weights = np.zeros(shape=node_r2.shape)
+    node_weights[~node_coincident] = 1.0 / np.power(node_r2[~node_coincident], interp_power / 2.0)
+
+    return node_weights, node_coincident
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to get interpolation plan (neighbour weights of a point set over the target grid; cached by point set)
+# (None if the plan exceeds interp_plan_bytes_max; the points are then interpolated by blocks)
+def get_interp_plan(geox_in_1d, geoy_in_1d, geox_out_2d, geoy_out_2d,
+                    interp_radius_x=None, interp_radius_y=None, interp_method='nearest',
+                    n_cpu=1, interp_power=2.0, interp_r2_min=0.0000000000001):
+
+    # Check interpolation radius x and y
+    if (interp_radius_x is None) or (interp_radius_y is None):
+        logging.error(' ===> Interpolation radius x or y are undefined.')
+        raise ValueError('Radius must be defined')
+    # Check interpolation method
+    if interp_method not in ['nearest', 'idw']:
+        logging.error(' ===> Interpolation method "' + str(interp_method) + '" is not supported.')
+        raise NotImplementedError('Case not implemented yet')
+
+    # Get grid tree and nodes
+    grid_tree = get_grid_tree(geox_out_2d, geoy_out_2d)
+    grid_n = grid_tree.data.shape[0]
+
+    geox_in_1d = np.ascontiguousarray(geox_in_1d, dtype=float).ravel()
+    geoy_in_1d = np.ascontiguousarray(geoy_in_1d, dtype=float).ravel()
+    point_n = geox_in_1d.shape[0]
+
+    # Check plan availability (key: point coordinates, grid tree and interpolation settings)
+    # (grid trees are kept in memory, so their id identifies the target grid)
+    radius_x, radius_y = float(interp_radius_x), float(interp_radius_y)
+    plan_hash = hashlib.sha1(geox_in_1d.tobytes() + geoy_in_1d.tobytes()).hexdigest()
+    plan_key = (plan_hash, point_n, id(grid_tree), interp_method, radius_x, radius_y,
+                float(interp_power), float(interp_r2_min))
+    if plan_key in interp_plan_collections:
+        return interp_plan_collections[plan_key]
+    if plan_key in interp_plan_oversize:
+        return None
+
+    interp_pairs = search_interp_pairs(grid_tree, geox_in_1d, geoy_in_1d, radius_x, radius_y, n_cpu=n_cpu)
+
+    if interp_method == 'nearest':
+
+        node_point = select_interp_nearest(interp_pairs, grid_n)
+        node_idx = np.flatnonzero(node_point >= 0)
+        point_idx = node_point[node_idx]
+        node_weights = np.ones(shape=node_idx.shape)
+        node_den = np.bincount(node_idx, weights=node_weights, minlength=grid_n)
+        node_idx_coincident, point_idx_coincident = node_idx[0:0], point_idx[0:0]
+
+    else:
+
+        # Collect weights (pairs up to the plan size; node, point and weight of each pair)
+        pairs_max, pairs_n = interp_plan_bytes_max // 24, 0
+        node_idx_list, point_idx_list, node_weights_list = [], [], []
+        node_idx_coincident_list, point_idx_coincident_list = [], []
+        node_den = np.zeros(shape=[grid_n])
+        for node_idx, point_idx, node_r2 in interp_pairs:
+            pairs_n += node_idx.shape[0]
+            if pairs_n > pairs_max:
+                interp_plan_oversize.add(plan_key)
+                return None
+
+            node_weights, node_coincident = compute_interp_weights(node_r2, interp_power, interp_r2_min)
+            node_den += np.bincount(node_idx, weights=node_weights, minlength=grid_n)
+
+            node_idx_list.append(node_idx)
+            point_idx_list.append(point_idx)
+            node_weights_list.append(node_weights)
+            node_idx_coincident_list.append(node_idx[node_coincident])
+            point_idx_coincident_list.append(point_idx[node_coincident])
+
+        node_idx = np.concatenate(node_idx_list + [np.zeros(shape=[0], dtype=int)])
+        point_idx = np.concatenate(point_idx_list + [np.zeros(shape=[0], dtype=int)])
+        node_weights = np.concatenate(node_weights_list + [np.zeros(shape=[0])])
+        node_idx_coincident = np.concatenate(node_idx_coincident_list + [np.zeros(shape=[0], dtype=int)])
+        point_idx_coincident = np.concatenate(point_idx_coincident_list + [np.zeros(shape=[0], dtype=int)])
+
+    # Organize plan (sparse weights [node, point]; coincident value(s) set in reverse order, the first point wins)
+    node_valid = np.flatnonzero(node_den > 0)
+    interp_plan = {
+        'weights': csr_matrix((node_weights, (node_idx, point_idx)), shape=(grid_n, point_n)),
+        'node_valid': node_valid, 'node_den': node_den[node_valid],
+        'node_coincident': node_idx_coincident[::-1], 'point_coincident': point_idx_coincident[::-1],
+        'grid_n': grid_n, 'point_n': point_n,
+        'grid_shape': [geox_out_2d.shape[0], geox_out_2d.shape[1]]}
+    interp_plan['bytes'] = int(
+        interp_plan['weights'].data.nbytes + interp_plan['weights'].indices.nbytes +
+        interp_plan['weights'].indptr.nbytes + interp_plan['node_valid'].nbytes + interp_plan['node_den'].nbytes +
+        interp_plan['node_coincident'].nbytes + interp_plan['point_coincident'].nbytes)
+
+    # Store plan (oldest plan(s) removed to keep the plans within interp_plan_bytes_max)
+    if interp_plan['bytes'] > interp_plan_bytes_max:
+        interp_plan_oversize.add(plan_key)
+        return None
+    while interp_plan_collections and (
+            sum([plan_step['bytes'] for plan_step in interp_plan_collections.values()]) +
+            interp_plan['bytes'] > interp_plan_bytes_max):
+        interp_plan_collections.pop(next(iter(interp_plan_collections)))
+    interp_plan_collections[plan_key] = interp_plan
+
+    return interp_plan
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to apply interpolation plan (sparse matrix-vector product of the plan weights and the point values)
+def apply_interp_plan(interp_plan, data_in_1d, interp_no_data=-9999.0):
+
+    data_in_1d = np.asarray(data_in_1d, dtype=float).ravel()
+    if data_in_1d.shape[0] != interp_plan['point_n']:
+        logging.error(' ===> Interpolation plan and data have a different number of points.')
+        raise ValueError('Data must be defined over the points of the plan')
+
+    # Initialize data out
+    data_out_1d = np.zeros(shape=[interp_plan['grid_n']])
+    data_out_1d[:] = interp_no_data
+
+    # Compute weighted values for each node
+    node_valid = interp_plan['node_valid']
+    node_num = interp_plan['weights'].dot(data_in_1d)
+    data_out_1d[node_valid] = node_num[node_valid] / interp_plan['node_den']
+
+    # Set coincident value(s)
+    data_out_1d[interp_plan['node_coincident']] = data_in_1d[interp_plan['point_coincident']]
+
+    # Organize data in 2d, south-north, east-west format (same type of gdal_grid output)
+    data_out_2d = np.reshape(data_out_1d, interp_plan['grid_shape']).astype(np.float32)
+
+    return data_out_2d
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to interpolate point data to grid by blocks of points (without plan; used if the plan is too large)
+def interp_point2grid_blocks(data_in_1d, geox_in_1d, geoy_in_1d, geox_out_2d, geoy_out_2d,
+                             interp_no_data=-9999.0, interp_radius_x=None, interp_radius_y=None,
+                             interp_method='nearest', n_cpu=1, interp_power=2.0, interp_r2_min=0.0000000000001):
+
+    # Get grid tree and nodes
+    grid_tree = get_grid_tree(geox_out_2d, geoy_out_2d)
+    grid_n = grid_tree.data.shape[0]
+
+    # Initialize data out
+    data_out_1d = np.zeros(shape=[grid_n])
+    data_out_1d[:] = interp_no_data
+
+    interp_pairs = search_interp_pairs(grid_tree, geox_in_1d, geoy_in_1d,
+                                       float(interp_radius_x), float(interp_radius_y), n_cpu=n_cpu)
+
+    if interp_method == 'nearest':
+
+        node_point = select_interp_nearest(interp_pairs, grid_n)
+        node_valid = node_point >= 0
+        data_out_1d[node_valid] = data_in_1d[node_point[node_valid]]
+
+    else:
+
+        # Accumulate weighted values and weights for each node
+        node_num, node_den = np.zeros(shape=[grid_n]), np.zeros(shape=[grid_n])
+        node_idx_coincident_list, point_idx_coincident_list = [], []
+        for node_idx, point_idx, node_r2 in interp_pairs:
+            node_weights, node_coincident = compute_interp_weights(node_r2, interp_power, interp_r2_min)
+            node_num += np.bincount(node_idx, weights=node_weights * data_in_1d[point_idx], minlength=grid_n)
+            node_den += np.bincount(node_idx, weights=node_weights, minlength=grid_n)
+            node_idx_coincident_list.append(node_idx[node_coincident])
+            point_idx_coincident_list.append(point_idx[node_coincident])
+
+        node_valid = node_den > 0
+        data_out_1d[node_valid] = node_num[node_valid] / node_den[node_valid]
+
+        # Set coincident value(s) (the first point wins)
+        node_idx_coincident = np.concatenate(node_idx_coincident_list + [np.zeros(shape=[0], dtype=int)])
+        point_idx_coincident = np.concatenate(point_idx_coincident_list + [np.zeros(shape=[0], dtype=int)])
+        data_out_1d[node_idx_coincident[::-1]] = data_in_1d[point_idx_coincident[::-1]]
+
+    # Organize data in 2d, south-north, east-west format (same type of gdal_grid output)
+    data_out_2d = np.reshape(data_out_1d, [geox_out_2d.shape[0], geox_out_2d.shape[1]]).astype(np.float32)
+
+    return data_out_2d
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to map the gdal_grid algorithm option (e.g. "-a nearest:radius1=0.2:radius2=0.2:nodata=-9999.0")
+# to the in-process interpolation settings
+def parse_interp_option(interp_option, interp_method='nearest', interp_radius_x=None, interp_radius_y=None,
+                        interp_no_data=-9999.0, interp_power=2.0):
+
+    option_string = interp_option.strip()
+    if option_string.startswith('-a '):
+        option_string = option_string[3:].strip()
+    option_algorithm, option_fields = option_string.split(':')[0], option_string.split(':')[1:]
+
+    if option_algorithm == 'nearest':
+        interp_method = 'nearest'
+    elif option_algorithm == 'invdist':
+        interp_method = 'idw'
+    else:
+        logging.warning(' ===> Interpolation option algorithm "' + option_algorithm +
+                        '" is not supported. Method "' + interp_method + '" is used')
+
+    for option_field in option_fields:
+        option_key, option_value = option_field.split('=')
+        option_key, option_value = option_key.strip(), float(option_value)
+        if option_key == 'radius1':
+            interp_radius_x = option_value
+        elif option_key == 'radius2':
+            interp_radius_y = option_value
+        elif option_key == 'radius':
+            interp_radius_x, interp_radius_y = option_value, option_value
+        elif option_key == 'nodata':
+            interp_no_data = option_value
+        elif option_key == 'power':
+            interp_power = option_value
+        elif (option_key in ['angle', 'smoothing']) and (option_value == 0.0):
+            pass
+        else:
+            logging.warning(' ===> Interpolation option "' + option_field + '" is not supported. Option is skipped')
+
+    return interp_method, interp_radius_x, interp_radius_y, interp_no_data, interp_power
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to interpolate point data to grid (nearest or inverse distance to a power using a search ellipse)
 def interp_point2grid(data_in_1d, geox_in_1d, geoy_in_1d, geox_out_2d, geoy_out_2d, epsg_code='4326',
                       interp_no_data=-9999.0, interp_radius_x=None, interp_radius_y=None,
                       interp_method='nearest', interp_option=None,
                       folder_tmp=None, var_name_data='values', var_name_geox='x', var_name_geoy='y',
-                      n_cpu=1):
+                      n_cpu=1, interp_power=2.0, interp_r2_min=0.0000000000001):
+
+    # Map the gdal_grid algorithm option, if defined (epsg_code and folder_tmp are used by the gdal_grid method
+    # only: the point and grid coordinates are in the same reference and no file is written)
+    if interp_option is not None:
+        interp_method, interp_radius_x, interp_radius_y, interp_no_data, interp_power = parse_interp_option(
+            interp_option, interp_method=interp_method, interp_radius_x=interp_radius_x,
+            interp_radius_y=interp_radius_y, interp_no_data=interp_no_data, interp_power=interp_power)
+
+    # Select finite point(s)
+    data_in_1d = np.asarray(data_in_1d, dtype=float).ravel()
+    geox_in_1d = np.asarray(geox_in_1d, dtype=float).ravel()
+    geoy_in_1d = np.asarray(geoy_in_1d, dtype=float).ravel()
+    point_finite = np.isfinite(data_in_1d) & np.isfinite(geox_in_1d) & np.isfinite(geoy_in_1d)
+    data_in_1d, geox_in_1d, geoy_in_1d = data_in_1d[point_finite], geox_in_1d[point_finite], geoy_in_1d[point_finite]
+
+    # Get interpolation plan (computed once for each point set) and apply it to the point values
+    interp_plan = get_interp_plan(geox_in_1d, geoy_in_1d, geox_out_2d, geoy_out_2d,
+                                  interp_radius_x=interp_radius_x, interp_radius_y=interp_radius_y,
+                                  interp_method=interp_method, n_cpu=n_cpu,
+                                  interp_power=interp_power, interp_r2_min=interp_r2_min)
+    if interp_plan is not None:
+        data_out_2d = apply_interp_plan(interp_plan, data_in_1d, interp_no_data=interp_no_data)
+    else:
+        data_out_2d = interp_point2grid_blocks(data_in_1d, geox_in_1d, geoy_in_1d, geox_out_2d, geoy_out_2d,
+                                               interp_no_data=interp_no_data,
+                                               interp_radius_x=interp_radius_x, interp_radius_y=interp_radius_y,
+                                               interp_method=interp_method, n_cpu=n_cpu,
+                                               interp_power=interp_power, interp_r2_min=interp_r2_min)
+
+    return data_out_2d
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to interpolate point data to grid (using gdal_grid executable)
+def interp_point2grid_gdal(data_in_1d, geox_in_1d, geoy_in_1d, geox_out_2d, geoy_out_2d, epsg_code='4326',
+                           interp_no_data=-9999.0, interp_radius_x=None, interp_radius_y=None,
+                           interp_method='nearest', interp_option=None,
+                           folder_tmp=None, var_name_data='values', var_name_geox='x', var_name_geoy='y',
+                           n_cpu=1):
+
+    # Import optional backend at first use
+    import rasterio
 
     # Define layer name (using a random string)
     var_name_layer = random_string()
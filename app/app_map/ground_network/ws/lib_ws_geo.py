@@ -2,11 +2,7 @@
 # Library
 import logging
 import numpy as np
-import rasterio
-import rasterio.crs
 import os
-import matplotlib.pylab as plt
-from rasterio.enums import Resampling
 
 from lib_ws_io_generic import create_darray_2d
 
@@ -57,6 +53,11 @@ def read_file_raster(file_name, file_proj='epsg:4326', var_name='land',
                      coord_name_x='west_east', coord_name_y='south_north',
                      dim_name_x='west_east', dim_name_y='south_north', no_data_default=-9999.0, scale_factor=1):
 
+    # Import optional backend at first use
+    import rasterio
+    import rasterio.crs
+    from rasterio.enums import Resampling
+
     if os.path.exists(file_name):
         if (file_name.endswith('.txt') or file_name.endswith('.asc')) or file_name.endswith('.tif'):
 
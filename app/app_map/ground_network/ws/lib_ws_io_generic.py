@@ -12,6 +12,7 @@ import logging
 import tempfile
 import os
 import json
+import hashlib
 import pickle
 
 import pandas as pd
@@ -63,16 +64,30 @@ def create_filename_tmp(prefix='tmp_', suffix='.tiff', folder=None):
 
 
 # -------------------------------------------------------------------------------------
-# Method to read file csv
-def read_file_csv(file_name, file_time=None, file_header=None,
-                  file_sep=',', file_skiprows=1, file_skipcols=None,
-                  file_renamecols=None, file_time_format='%Y-%m-%d %H:%M',
-                  tag_file_index='time',
-                  tag_file_geo_x='longitude', tag_file_geo_y='latitude', tag_file_data='data',
-                  scale_factor_geo_x=1, scale_factor_geo_y=1, scale_factor_data=1):
+# Csv file(s) parsed by read_file_csv (in-process cache; key: file path)
+file_csv_cache = {}
+file_csv_cache_size = 64
+# -------------------------------------------------------------------------------------
 
-    if file_header is None:
-        file_header = ['code', 'name', 'longitude', 'latitude', 'time', 'data']
+
+# -------------------------------------------------------------------------------------
+# Method to define the key of a csv file (path, modification time, size and parser settings)
+def define_file_csv_key(file_name, file_header, file_sep, file_skiprows, file_renamecols,
+                        file_time_format, tag_file_index):
+    file_stat = os.stat(file_name)
+    file_key = json.dumps({
+        'file_name': os.path.abspath(file_name), 'file_mtime': file_stat.st_mtime_ns,
+        'file_size': file_stat.st_size, 'file_header': file_header, 'file_sep': file_sep,
+        'file_skiprows': file_skiprows, 'file_renamecols': file_renamecols,
+        'file_time_format': file_time_format, 'tag_file_index': tag_file_index}, sort_keys=True, default=str)
+    return file_key
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to parse file csv (rows sorted by time; file_order is the position of each row in the file)
+def parse_file_csv(file_name, file_header, file_sep, file_skiprows, file_renamecols,
+                   file_time_format, tag_file_index):
 
     file_dframe = pd.read_table(file_name, sep=file_sep, names=file_header, skiprows=file_skiprows)
     if file_renamecols is not None:
@@ -82,25 +97,148 @@ def read_file_csv(file_name, file_time=None, file_header=None,
     file_dframe.index.name = tag_file_index
 
     file_dframe.index = pd.to_datetime(file_dframe.index, format=file_time_format)
-    file_dframe[tag_file_geo_x] = file_dframe[tag_file_geo_x] / scale_factor_geo_x
-    file_dframe[tag_file_geo_y] = file_dframe[tag_file_geo_y] / scale_factor_geo_y
-    file_dframe[tag_file_data] = file_dframe[tag_file_data] / scale_factor_data
 
-    if file_skipcols is not None:
-        if not isinstance(file_skipcols, list):
-            file_skipcols = [file_skipcols]
-        file_dframe = file_dframe.drop(columns=file_skipcols)
+    file_order = np.argsort(file_dframe.index.values, kind='stable')
+    file_dframe = file_dframe.iloc[file_order]
+
+    return file_dframe, file_order
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to write the columnar cache of a csv file (npz format)
+def write_file_csv_cache(file_name_cache, file_key, file_dframe, file_order):
+
+    file_data = {'key': np.array(file_key), 'order': file_order,
+                 'index': file_dframe.index.values, 'index_name': np.array(file_dframe.index.name),
+                 'columns': np.array([str(column) for column in file_dframe.columns]),
+                 'dtypes': np.array([str(dtype) for dtype in file_dframe.dtypes])}
+    for column_id, column_name in enumerate(file_dframe.columns):
+        file_data['column_' + str(column_id)] = file_dframe[column_name].to_numpy()
+
+    folder_name_cache = os.path.dirname(file_name_cache)
+    if folder_name_cache != '':
+        os.makedirs(folder_name_cache, exist_ok=True)
+    file_name_tmp = create_filename_tmp(prefix='tmp_', suffix='.npz', folder=folder_name_cache)
+    with open(file_name_tmp, 'wb') as file_handle:
+        np.savez(file_handle, **file_data)
+    os.replace(file_name_tmp, file_name_cache)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to read the columnar cache of a csv file (None if not available or outdated)
+def read_file_csv_cache(file_name_cache, file_key):
+
+    if not os.path.exists(file_name_cache):
+        return None, None
+
+    try:
+        with np.load(file_name_cache, allow_pickle=True) as file_data:
+            if str(file_data['key']) != file_key:
+                return None, None
+
+            file_index = pd.DatetimeIndex(file_data['index'], name=str(file_data['index_name']))
+            file_dframe = pd.DataFrame(
+                {str(column_name): file_data['column_' + str(column_id)]
+                 for column_id, column_name in enumerate(file_data['columns'])}, index=file_index)
+            for column_name, column_dtype in zip(file_data['columns'], file_data['dtypes']):
+                if str(file_dframe[str(column_name)].dtype) != str(column_dtype):
+                    file_dframe[str(column_name)] = file_dframe[str(column_name)].astype(str(column_dtype))
+            file_order = file_data['order']
+
+    except Exception as exc:
+        logging.warning(' ===> Cache ' + file_name_cache + ' is not readable (' + str(exc) + '). Update it')
+        return None, None
+
+    return file_dframe, file_order
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to get the parsed csv file from the cache(s) (parse and update the cache(s) if the file changed)
+def get_file_csv(file_name, file_header, file_sep, file_skiprows, file_renamecols,
+                 file_time_format, tag_file_index, file_cache_folder=None):
+
+    file_key = define_file_csv_key(file_name, file_header, file_sep, file_skiprows, file_renamecols,
+                                   file_time_format, tag_file_index)
+    file_path = os.path.abspath(file_name)
+
+    if file_path in file_csv_cache:
+        file_key_cache, file_dframe, file_order = file_csv_cache[file_path]
+        if file_key_cache == file_key:
+            return file_dframe, file_order
+
+    file_name_cache = None
+    if file_cache_folder is not None:
+        file_name_cache = os.path.join(
+            file_cache_folder, hashlib.sha1(file_path.encode('utf-8')).hexdigest() + '.npz')
+        file_dframe, file_order = read_file_csv_cache(file_name_cache, file_key)
+    else:
+        file_dframe, file_order = None, None
+
+    if file_dframe is None:
+        file_dframe, file_order = parse_file_csv(file_name, file_header, file_sep, file_skiprows,
+                                                 file_renamecols, file_time_format, tag_file_index)
+        if file_name_cache is not None:
+            write_file_csv_cache(file_name_cache, file_key, file_dframe, file_order)
+
+    file_csv_cache.pop(file_path, None)
+    if len(file_csv_cache) >= file_csv_cache_size:
+        file_csv_cache.pop(next(iter(file_csv_cache)))
+    file_csv_cache[file_path] = (file_key, file_dframe, file_order)
+
+    return file_dframe, file_order
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to read file csv
+def read_file_csv(file_name, file_time=None, file_header=None,
+                  file_sep=',', file_skiprows=1, file_skipcols=None,
+                  file_renamecols=None, file_time_format='%Y-%m-%d %H:%M',
+                  tag_file_index='time',
+                  tag_file_geo_x='longitude', tag_file_geo_y='latitude', tag_file_data='data',
+                  scale_factor_geo_x=1, scale_factor_geo_y=1, scale_factor_data=1,
+                  file_cache_folder=None):
+
+    if file_header is None:
+        file_header = ['code', 'name', 'longitude', 'latitude', 'time', 'data']
+
+    file_dframe, file_order = get_file_csv(file_name, file_header, file_sep, file_skiprows, file_renamecols,
+                                           file_time_format, tag_file_index, file_cache_folder=file_cache_folder)
 
+    # Select the time rows (binary search over the sorted times; rows keep the file order)
     if file_time is not None:
-        if file_time in file_dframe.index:
-            file_dframe_select = file_dframe.loc[file_time]
+        file_time_values = file_dframe.index.values
+        file_time_step = np.datetime64(pd.Timestamp(file_time))
+        idx_start = np.searchsorted(file_time_values, file_time_step, side='left')
+        idx_end = np.searchsorted(file_time_values, file_time_step, side='right')
+        if idx_end > idx_start:
+            file_dframe = file_dframe.iloc[idx_start:idx_end]
         else:
-            file_dframe_select = None
+            file_dframe = None
             logging.warning(' ===> Time ' + str(file_time) + ' is not available in file: ' + file_name)
     else:
-        file_dframe_select = file_dframe
+        file_dframe = file_dframe.iloc[np.argsort(file_order, kind='stable')]
+
+    if file_dframe is not None:
+        file_dframe = file_dframe.copy()
+        file_dframe[tag_file_geo_x] = file_dframe[tag_file_geo_x] / scale_factor_geo_x
+        file_dframe[tag_file_geo_y] = file_dframe[tag_file_geo_y] / scale_factor_geo_y
+        file_dframe[tag_file_data] = file_dframe[tag_file_data] / scale_factor_data
+
+        if file_skipcols is not None:
+            if not isinstance(file_skipcols, list):
+                file_skipcols = [file_skipcols]
+            file_dframe = file_dframe.drop(columns=file_skipcols)
 
-    return file_dframe_select
+    # Single row matching the time returned as series (as the label-based selection)
+    if file_time is not None and file_dframe is not None:
+        if file_dframe.shape[0] == 1:
+            file_dframe = file_dframe.iloc[0]
+
+    return file_dframe
 
 # -------------------------------------------------------------------------------------
 
@@ -452,3 +590,168 @@ def write_obj(filename, data):
     with open(filename, 'wb') as handle:
         pickle.dump(data, handle, protocol=pickle.HIGHEST_PROTOCOL)
 # -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to convert attributes to plain values (netcdf and json compatible)
+def convert_attrs_workspace(attrs_raw, attrs_sequence=False):
+    attrs_def = {}
+    for attr_key, attr_value in attrs_raw.items():
+        if isinstance(attr_value, np.generic):
+            attr_value = attr_value.item()
+        if attr_value is None:
+            continue
+        if attrs_sequence and isinstance(attr_value, (list, tuple)):
+            attr_value = [value.item() if isinstance(value, np.generic) else value for value in attr_value]
+        elif not isinstance(attr_value, (str, int, float)):
+            attr_value = str(attr_value)
+        attrs_def[attr_key] = attr_value
+    return attrs_def
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the file(s) of a workspace datasets saved in npy format
+def define_dset_workspace_npy(file_name, var_name):
+    return file_name + '.' + str(var_name) + '.npy'
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to detect the format of a workspace datasets
+def detect_dset_workspace(file_name):
+    with open(file_name, 'rb') as file_handle:
+        file_header = file_handle.read(8)
+    if file_header.startswith(b'\x89HDF') or file_header.startswith(b'CDF'):
+        file_format = 'netcdf'
+    elif file_header.lstrip().startswith(b'{'):
+        file_format = 'npy'
+    else:
+        file_format = 'pickle'
+    return file_format
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to write workspace datasets (formats: netcdf, npy or pickle)
+def write_dset_workspace(file_name, dset_data, file_format='netcdf'):
+
+    remove_dset_workspace(file_name)
+
+    if file_format == 'netcdf':
+        # uncompressed netcdf4 (no fill value to keep data values unchanged)
+        # (sequence attributes are kept as array attributes; the names of the sequence and tuple ones are saved
+        # to restore them as list or tuple by the reader)
+        dset_data = dset_data.copy()
+        dset_attrs = convert_attrs_workspace(dset_data.attrs, attrs_sequence=True)
+        attrs_sequence, attrs_tuple = [], []
+        for attr_key, attr_value in dset_attrs.items():
+            if not isinstance(attr_value, list):
+                continue
+            if attr_value and (all(isinstance(value, (int, float)) for value in attr_value) or
+                               all(isinstance(value, str) for value in attr_value)):
+                attrs_sequence.append(attr_key)
+                if isinstance(dset_data.attrs[attr_key], tuple):
+                    attrs_tuple.append(attr_key)
+            else:
+                dset_attrs[attr_key] = str(dset_data.attrs[attr_key])
+        dset_attrs['attrs_sequence'] = json.dumps(attrs_sequence)
+        dset_attrs['attrs_tuple'] = json.dumps(attrs_tuple)
+        dset_data.attrs = dset_attrs
+        dset_encoding = {}
+        for var_name in list(dset_data.variables):
+            dset_data[var_name].attrs = convert_attrs_workspace(dset_data[var_name].attrs)
+            dset_encoding[var_name] = {'_FillValue': None}
+        dset_data.to_netcdf(path=file_name, format='NETCDF4', mode='w', engine='netcdf4', encoding=dset_encoding)
+
+    elif file_format == 'npy':
+        # one npy file for each variable and a json sidecar with dimensions and attributes
+        # (sequence attributes are kept; the tuple ones are restored as tuple by the reader)
+        dset_info = {'attrs': convert_attrs_workspace(dset_data.attrs, attrs_sequence=True),
+                     'attrs_tuple': [attr_key for attr_key, attr_value in dset_data.attrs.items()
+                                     if isinstance(attr_value, tuple)],
+                     'coords': {}, 'data_vars': {}}
+        for var_group, var_list in zip(['coords', 'data_vars'], [dset_data.coords, dset_data.data_vars]):
+            for var_name in list(var_list):
+                var_da = dset_data[var_name]
+                np.save(define_dset_workspace_npy(file_name, var_name), var_da.values, allow_pickle=False)
+                dset_info[var_group][var_name] = {
+                    'dims': list(var_da.dims), 'attrs': convert_attrs_workspace(var_da.attrs)}
+        with open(file_name, 'w') as file_handle:
+            json.dump(dset_info, file_handle)
+
+    elif file_format == 'pickle':
+        write_obj(file_name, dset_data.to_dict())
+
+    else:
+        logging.error(' ===> Workspace format "' + file_format + '" is not supported')
+        raise NotImplementedError('Case not implemented yet')
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to read workspace datasets (format is detected by the file content)
+def read_dset_workspace(file_name, var_list=None):
+
+    if var_list is not None and not isinstance(var_list, list):
+        var_list = [var_list]
+
+    file_format = detect_dset_workspace(file_name)
+
+    if file_format == 'netcdf':
+        dset_data = xr.open_dataset(file_name, engine='netcdf4', mask_and_scale=False)
+        if var_list is not None:
+            dset_data = dset_data[[var_name for var_name in var_list if var_name in dset_data.data_vars]]
+        dset_data = dset_data.load()
+        dset_data.close()
+        # sequence attributes restored as list or tuple (array attributes of one value are read as scalar)
+        dset_attrs = dict(dset_data.attrs)
+        attrs_sequence = json.loads(dset_attrs.pop('attrs_sequence', '[]'))
+        attrs_tuple = json.loads(dset_attrs.pop('attrs_tuple', '[]'))
+        for attr_key in attrs_sequence:
+            if attr_key in list(dset_attrs.keys()):
+                attr_value = np.atleast_1d(dset_attrs[attr_key]).tolist()
+                dset_attrs[attr_key] = tuple(attr_value) if attr_key in attrs_tuple else attr_value
+        dset_data.attrs = dset_attrs
+
+    elif file_format == 'npy':
+        # arrays are memory-mapped (read-only); only the selected variable(s) are mapped
+        with open(file_name, 'r') as file_handle:
+            dset_info = json.load(file_handle)
+        dset_attrs = dset_info['attrs']
+        for attr_key in dset_info.get('attrs_tuple', []):
+            if attr_key in list(dset_attrs.keys()):
+                dset_attrs[attr_key] = tuple(dset_attrs[attr_key])
+        dset_coords, dset_vars = {}, {}
+        for var_group, var_collections in zip(['coords', 'data_vars'], [dset_coords, dset_vars]):
+            for var_name, var_info in dset_info[var_group].items():
+                if (var_group == 'data_vars') and (var_list is not None) and (var_name not in var_list):
+                    continue
+                var_values = np.load(define_dset_workspace_npy(file_name, var_name), mmap_mode='r')
+                var_collections[var_name] = xr.Variable(var_info['dims'], var_values, attrs=var_info['attrs'])
+        dset_data = xr.Dataset(data_vars=dset_vars, coords=dset_coords, attrs=dset_attrs)
+
+    else:
+        # legacy workspace (dictionary saved by pickle)
+        dset_data = xr.Dataset.from_dict(read_obj(file_name))
+        if var_list is not None:
+            dset_data = dset_data[[var_name for var_name in var_list if var_name in dset_data.data_vars]]
+
+    return dset_data
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to remove workspace datasets (and the npy file(s), if any)
+def remove_dset_workspace(file_name):
+    if os.path.exists(file_name):
+        if detect_dset_workspace(file_name) == 'npy':
+            with open(file_name, 'r') as file_handle:
+                dset_info = json.load(file_handle)
+            for var_group in ['coords', 'data_vars']:
+                for var_name in dset_info[var_group].keys():
+                    var_file_name = define_dset_workspace_npy(file_name, var_name)
+                    if os.path.exists(var_file_name):
+                        os.remove(var_file_name)
+        os.remove(file_name)
+# -------------------------------------------------------------------------------------
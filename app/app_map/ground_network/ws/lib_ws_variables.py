@@ -20,7 +20,6 @@ from lib_ws_analysis_regression_stepwisefit import stepwisefit
 from lib_ws_ancillary_snow import compute_kernel
 
 # Debug
-import matplotlib.pylab as plt
 logging.getLogger('matplotlib').setLevel(logging.WARNING)
 #######################################################################################
 
@@ -133,6 +132,7 @@ def compute_air_temperature(var_data, var_geo_x, var_geo_y, var_geo_z,
     grid_data[ref_geo_z == ref_no_data] = np.nan
 
     # Debug
+    # import matplotlib.pylab as plt
     # plt.figure()
     # plt.imshow(grid_data)
     # plt.colorbar()
@@ -184,6 +184,7 @@ def compute_wind_speed(var_data, var_geo_x, var_geo_y,
     grid_data[ref_geo_z == ref_no_data] = np.nan
 
     # Debug
+    # import matplotlib.pylab as plt
     # plt.figure()
     # plt.imshow(grid_data)
     # plt.colorbar()
@@ -235,6 +236,7 @@ def compute_incoming_radiation(var_data, var_geo_x, var_geo_y,
     grid_data[ref_geo_z == ref_no_data] = np.nan
 
     # Debug
+    # import matplotlib.pylab as plt
     # plt.figure()
     # plt.imshow(grid_data)
     # plt.colorbar()
@@ -286,6 +288,7 @@ def compute_relative_humidity(var_data, var_geo_x, var_geo_y,
     grid_data[ref_geo_z == ref_no_data] = np.nan
 
     # Debug
+    # import matplotlib.pylab as plt
     # plt.figure()
     # plt.imshow(grid_data)
     # plt.colorbar()
@@ -337,6 +340,7 @@ def compute_air_pressure(var_data, var_geo_x, var_geo_y,
     grid_data[ref_geo_z == ref_no_data] = np.nan
 
     # Debug
+    # import matplotlib.pylab as plt
     # plt.figure()
     # plt.imshow(grid_data)
     # plt.colorbar()
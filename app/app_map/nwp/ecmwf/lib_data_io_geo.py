@@ -10,7 +10,6 @@ Version:       '1.0.0'
 # Library
 import logging
 import os
-import rasterio
 
 import numpy as np
 import xarray as xr
@@ -50,6 +49,9 @@ def create_grid_data(geo_x_min, geo_x_max, geo_y_min, geo_y_max, geo_x_res, geo_
 # method to read grid data
 def read_grid_data(file_name, geo_x_name='long', geo_y_name='latg'):
 
+    # import optional backend at first use
+    import rasterio
+
     # open file
     if os.path.exists(file_name):
         # get data in netcdf format
@@ -188,6 +188,50 @@ def select_grib_by_time(dset_grib, time_start, time_end, time_var='valid_time'):
     return dset_filtered
 # ----------------------------------------------------------------------------------------------------------------------
 
+# ----------------------------------------------------------------------------------------------------------------------
+# method to open grib file (messages are indexed once and grouped by variable, data type and level type)
+def open_file_grib(file_name, file_variables, file_filter=None, file_index='{path}.{short_hash}.idx'):
+
+    # import optional backend at first use
+    import cfgrib
+
+    # define backend arguments (the index is saved next to the file and reused by the next reading)
+    backend_kwargs = {'indexpath': file_index}
+    if file_filter is not None:
+        backend_kwargs['filter_by_keys'] = file_filter
+
+    # open all the groups of messages in a single scan
+    file_groups = cfgrib.open_datasets(file_name, backend_kwargs=backend_kwargs)
+
+    # iterate over variable(s)
+    file_dset = None
+    for file_var in file_variables:
+
+        # search variable in the groups
+        tmp_dset = None
+        for file_group in file_groups:
+            if file_var in list(file_group.data_vars):
+                tmp_dset = file_group[[file_var]]
+                break
+
+        # check variable availability
+        if tmp_dset is None:
+            alg_logger.warning(' ===> Variable "' + file_var + '" not found in the grib file groups')
+            continue
+
+        if file_dset is None:
+            file_dset = tmp_dset
+        else:
+            file_dset = file_dset.merge(tmp_dset)
+
+    # check dataset availability
+    if file_dset is None:
+        file_dset = xr.Dataset()
+
+    return file_dset
+# ----------------------------------------------------------------------------------------------------------------------
+
+
 # ----------------------------------------------------------------------------------------------------------------------
 # method to read grib file
 def read_file_grib(file_name, file_variables=None, type_variables='fc', freq_variables='1h',
@@ -210,34 +254,15 @@ def read_file_grib(file_name, file_variables=None, type_variables='fc', freq_var
         if not isinstance(filter_vars, list):
             filter_vars = [filter_vars]
 
-        # iterate over filter variables
-        file_dset = None
-        for filter_var in filter_vars:
-
-            # read file according to variable type and variable filter
-            if type_variables is None:
-
-                tmp_dset = xr.open_dataset(
-                    file_name,
-                    engine="cfgrib",
-                    backend_kwargs={"filter_by_keys": {"cfVarName": filter_var}})
-
-            elif type_variables == 'fc':
-
-                tmp_dset = xr.open_dataset(
-                    file_name,
-                    engine="cfgrib",
-                    backend_kwargs={"filter_by_keys": {"dataType": type_variables, "cfVarName": filter_var}})
-
-            else:
-                # exit for unsupported variable type
-                alg_logger.error(' ===> Variable type "' + str(type_variables) + '" not implemented')
-                raise NotImplementedError('Case not implemented yet')
-
-            if file_dset is None:
-                file_dset = tmp_dset
-            else:
-                file_dset = file_dset.merge(tmp_dset)
+        # read file according to variable type (all the variables in one pass)
+        if type_variables is None:
+            file_dset = open_file_grib(file_name, filter_vars)
+        elif type_variables == 'fc':
+            file_dset = open_file_grib(file_name, filter_vars, file_filter={'dataType': type_variables})
+        else:
+            # exit for unsupported variable type
+            alg_logger.error(' ===> Variable type "' + str(type_variables) + '" not implemented')
+            raise NotImplementedError('Case not implemented yet')
 
         # check file empty or not
         if len(file_dset.dims) > 0:
@@ -284,6 +309,7 @@ def read_file_grib(file_name, file_variables=None, type_variables='fc', freq_var
                         data_attrs = {**tmp_attrs, **file_attrs}
 
                         ''' debug
+                        import matplotlib.pylab as plt
                         plt.figure()
                         plt.imshow(data_values)
                         plt.colorbar()
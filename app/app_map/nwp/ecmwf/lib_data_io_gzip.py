@@ -9,40 +9,75 @@ Version:       '3.0.0'
 # ----------------------------------------------------------------------------------------------------------------------
 # Library
 import logging
+import os
+import time
 import gzip
+import shutil
 
 from lib_info_args import logger_name
 
 # Logging
 log_stream = logging.getLogger(logger_name)
+
+# Default chunk size (in bytes) used to stream the file(s)
+file_chunk_default = 16 * 1024 * 1024
 # ----------------------------------------------------------------------------------------------------------------------
 
 
 # ----------------------------------------------------------------------------------------------------------------------
-# Method to unzip file
-def unzip_filename(file_name_zip, file_name_unzip):
+# Method to unzip file (streamed in chunks; an unzipped copy newer than the zip file and not expired is reused)
+def unzip_filename(file_name_zip, file_name_unzip, file_expire=None, file_chunk=file_chunk_default):
 
-    file_handle_zip = gzip.GzipFile(file_name_zip, "rb")
-    file_handle_unzip = open(file_name_unzip, "wb")
+    # check unzipped file availability
+    if os.path.exists(file_name_unzip):
+        file_time_unzip = os.path.getmtime(file_name_unzip)
+        if file_time_unzip >= os.path.getmtime(file_name_zip):
+            if (file_expire is None) or ((time.time() - file_time_unzip) <= file_expire):
+                log_stream.info(' -------> Unzip file "' + file_name_zip + '" ... SKIPPED. Unzipped file "' +
+                                file_name_unzip + '" previously created')
+                return
 
-    file_data_unzip = file_handle_zip.read()
-    file_handle_unzip.write(file_data_unzip)
+    folder_name_unzip = os.path.dirname(file_name_unzip)
+    if folder_name_unzip != '':
+        os.makedirs(folder_name_unzip, exist_ok=True)
 
-    file_handle_zip.close()
-    file_handle_unzip.close()
+    # unzip to a partial file and move it (unzipped file is always complete)
+    file_name_part = file_name_unzip + '.part'
+    with gzip.open(file_name_zip, 'rb') as file_handle_zip, open(file_name_part, 'wb') as file_handle_unzip:
+        shutil.copyfileobj(file_handle_zip, file_handle_unzip, file_chunk)
+    os.replace(file_name_part, file_name_unzip)
 
 # ----------------------------------------------------------------------------------------------------------------------
 
 
 # ----------------------------------------------------------------------------------------------------------------------
-# Method to zip file
-def zip_filename(file_name_unzip, file_name_zip):
+# Method to remove the expired file(s) of the unzip folder (zip file(s) and sub-folder(s) are kept)
+def purge_filename_expired(folder_name_unzip, file_expire=None, file_extension_zip=('.gz', '.gzip')):
+
+    if (file_expire is None) or (not os.path.isdir(folder_name_unzip)):
+        return
 
-    file_handle_unzip = open(file_name_unzip, 'rb')
-    file_handle_zip = gzip.open(file_name_zip, 'wb')
+    time_now = time.time()
+    for file_name in sorted(os.listdir(folder_name_unzip)):
+        file_path = os.path.join(folder_name_unzip, file_name)
+        if (not os.path.isfile(file_path)) or file_name.endswith(file_extension_zip):
+            continue
+        try:
+            if (time_now - os.path.getmtime(file_path)) > file_expire:
+                os.remove(file_path)
+                log_stream.info(' -----> Remove expired unzipped file "' + file_path + '" ... DONE')
+        except FileNotFoundError:
+            # file removed by another run
+            pass
+# ----------------------------------------------------------------------------------------------------------------------
 
-    file_handle_zip.writelines(file_handle_unzip)
 
-    file_handle_zip.close()
-    file_handle_unzip.close()
+# ----------------------------------------------------------------------------------------------------------------------
+# Method to zip file (streamed in chunks)
+def zip_filename(file_name_unzip, file_name_zip, file_chunk=file_chunk_default):
+
+    file_name_part = file_name_zip + '.part'
+    with open(file_name_unzip, 'rb') as file_handle_unzip, gzip.open(file_name_part, 'wb') as file_handle_zip:
+        shutil.copyfileobj(file_handle_unzip, file_handle_zip, file_chunk)
+    os.replace(file_name_part, file_name_zip)
 # ----------------------------------------------------------------------------------------------------------------------
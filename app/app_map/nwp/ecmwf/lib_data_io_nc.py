@@ -17,8 +17,6 @@ import pandas as pd
 import xarray as xr
 
 from datetime import datetime
-from netCDF4 import Dataset
-from netCDF4 import date2num, num2date
 
 from copy import deepcopy
 
@@ -33,9 +31,6 @@ from lib_utils_io import create_darray
 # set logger
 alg_logger = logging.getLogger(logger_name)
 
-# debug
-import matplotlib.pylab as plt
-
 # default netcdf encoded attributes
 attrs_encoded = ["_FillValue", "dtype", "scale_factor", "add_offset", "grid_mapping"]
 # ----------------------------------------------------------------------------------------------------------------------
@@ -146,6 +141,7 @@ def read_file_nc(file_name, file_variables=None, file_time_reference=None,
                     data_values = np.squeeze(tmp_values)
 
                     ''' debug
+                    import matplotlib.pylab as plt
                     plt.figure()
                     plt.imshow(data_values)
                     plt.colorbar()
@@ -251,6 +247,9 @@ def write_file_nc_library(file_name, dset_data, dset_attrs, dset_time,
                           var_dim_time='time', var_dim_x='west_east', var_dim_y='south_north',
                           var_type_time='float64', var_type_geo_x='float64', var_type_geo_y='float64'):
 
+    # import optional backend at first use
+    from netCDF4 import Dataset, date2num
+
     # get dimensions
     # dset_dims = dset_data.dims
     # n_cols, n_rows, n_time = dset_dims['longitude'], dset_dims['latitude'], dset_dims['time']
@@ -442,6 +441,7 @@ def write_file_nc_library(file_name, dset_data, dset_attrs, dset_time,
                 '''
                 import matplotlib
                 matplotlib.use('TkAgg')
+                import matplotlib.pylab as plt
                 plt.figure()
                 plt.imshow(dset_data[variable_name].values[i, :, :])
                 plt.colorbar(); plt.clim(2, 20)
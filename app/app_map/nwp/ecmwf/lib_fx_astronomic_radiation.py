@@ -20,9 +20,6 @@ from lib_info_args import logger_name
 # log stream
 log_stream = logging.getLogger(logger_name)
 
-# debug
-import matplotlib.pylab as plt
-
 # default lookup table for cloud factor against rain values
 lookup_table_cf_default = {
     'CF_L1': {'Rain': [0, 1],       'CloudFactor': [0.95]},
@@ -39,41 +36,48 @@ lookup_table_cf_default = {
 def exec_astronomic_radiation(var_data_cf,
                               geo_z,
                               time_period, time_delta,
-                              geo_lz, geo_lm, geo_phi, param_gsc, param_as, param_bs):
+                              geo_lz, geo_lm, geo_phi, param_gsc, param_as, param_bs,
+                              time_chunk=None):
 
     # time information
     seconds_delta = time_delta.seconds
     time_delta_mid_t = time_delta.seconds / 3600 # in hour
     minutes_input_step = time_delta.seconds / 60 # in minute?
 
-    # iterate on time steps
-    var_model_k_avg = np.zeros([time_period.__len__()])
-    var_model_ar_avg = np.zeros([time_period.__len__()])
-    var_model_k = np.zeros([time_period.__len__(), geo_z.shape[0], geo_z.shape[1]])
-    var_model_ar = np.zeros([time_period.__len__(), geo_z.shape[0], geo_z.shape[1]])
-    for time_id, time_step in enumerate(time_period):
+    # compute time information (at the midpoint of each period)
+    time_delta_mid = time_delta / 2
+    time_mid = pd.DatetimeIndex(time_period) - time_delta_mid
+    hour_mid = np.asarray(time_mid.hour, dtype=float)[:, np.newaxis, np.newaxis]
+    doy_mid = np.asarray(time_mid.dayofyear, dtype=float)[:, np.newaxis, np.newaxis]
+
+    # inverse relative distance Earth-Sun
+    ird = 1.0 + 0.033 * np.cos(2 * np.pi / 365 * doy_mid)
+    b = 2 * np.pi * (doy_mid - 81) / 364.0
 
-        # compute cloud factor
-        var_data_cf_step = var_data_cf[time_id, :, :]
+    # seasonal correction for solar time [h]
+    solar_corr = 0.1645 * np.sin(2 * b) - 0.1255 * np.cos(b) - 0.025 * np.sin(b)
 
-        # compute time information
-        time_delta_mid = time_delta / 2
-        time_mid = pd.Timestamp(time_step - time_delta_mid)
-        hour_mid = time_mid.hour
-        doy_mid = time_mid.dayofyear
+    # solar declination [rad]
+    solar_decl = 0.4093 * np.sin(2 * np.pi / 365 * doy_mid - 1.405)
 
-        # inverse relative distance Earth-Sun
-        ird = 1.0 + 0.033 * np.cos(2 * np.pi / 365 * doy_mid)
-        b = 2 * np.pi * (doy_mid - 81) / 364.0
+    # define time chunk(s) to bound the size of the (time, lat, lon) workspace
+    time_n = time_period.__len__()
+    if (time_chunk is None) or (time_chunk <= 0):
+        time_chunk = max(time_n, 1)
 
-        # seasonal correction for solar time [h]
-        solar_corr = 0.1645 * np.sin(2 * b) - 0.1255 * np.cos(b) - 0.025 * np.sin(b)
+    # iterate on time chunks
+    var_model_k = np.zeros([time_n, geo_z.shape[0], geo_z.shape[1]])
+    var_model_ar = np.zeros([time_n, geo_z.shape[0], geo_z.shape[1]])
+    for time_id_start in range(0, time_n, time_chunk):
+        time_id_end = min(time_id_start + time_chunk, time_n)
+        time_slice = slice(time_id_start, time_id_end)
 
-        # solar declination [rad]
-        solar_decl = 0.4093 * np.sin(2 * np.pi / 365 * doy_mid - 1.405)
+        # get cloud factor
+        var_data_cf_chunk = var_data_cf[time_slice, :, :]
 
         # solar time angle at midpoint of hourly or shorter period [rad]
-        solar_time_angle = np.pi / 12.0 * (hour_mid + 0.06667 * (geo_lz - geo_lm) + solar_corr - 12.0)
+        solar_time_angle = np.pi / 12.0 * (
+            hour_mid[time_slice] + 0.06667 * (geo_lz - geo_lm) + solar_corr[time_slice] - 12.0)
 
         # solar time angle at beginning of period [rad]
         solar_time_angle_start = solar_time_angle - np.pi * time_delta_mid_t / 24.0
@@ -81,23 +85,22 @@ def exec_astronomic_radiation(var_data_cf,
         solar_time_angle_end = solar_time_angle + np.pi * time_delta_mid_t / 24.0
 
         # extraterrestrial Radiation [MJ/m^2/interval] (Duffie & Beckman, 1980)
-        var_model_ar_step = (12 * minutes_input_step / np.pi * param_gsc * ird * (
-            (solar_time_angle_end - solar_time_angle_start) * np.sin(geo_phi) * np.sin(solar_decl) +
-            np.cos(geo_phi) * np.cos(solar_decl) * (np.sin(solar_time_angle_end) - np.sin(solar_time_angle_start))))
+        var_model_ar_chunk = (12 * minutes_input_step / np.pi * param_gsc * ird[time_slice] * (
+            (solar_time_angle_end - solar_time_angle_start) * np.sin(geo_phi) * np.sin(solar_decl[time_slice]) +
+            np.cos(geo_phi) * np.cos(solar_decl[time_slice]) * (
+                np.sin(solar_time_angle_end) - np.sin(solar_time_angle_start))))
 
         # extraterrestrial Radiation [W/m^2] --> Incoming radiation
-        var_model_ar_step = var_model_ar_step * 10 ** 6 / seconds_delta
-        var_model_ar_step[var_model_ar_step <= 0.0] = 0.0
-        var_model_ar_step[np.isnan(var_data_cf_step)] = np.nan
+        var_model_ar_chunk = var_model_ar_chunk * 10 ** 6 / seconds_delta
+        var_model_ar_chunk[var_model_ar_chunk <= 0.0] = 0.0
+        var_model_ar_chunk[np.isnan(var_data_cf_chunk)] = np.nan
 
         # clear-sky shortwave radiation
-        var_model_k_step = var_data_cf_step * (param_as + param_bs * geo_z) * var_model_ar_step
+        var_model_k_chunk = var_data_cf_chunk * (param_as + param_bs * geo_z) * var_model_ar_chunk
 
         # store K and AR results
-        var_model_k_avg[time_id] = np.nanmean(var_model_k_step)
-        var_model_ar_avg[time_id] = np.nanmean(var_model_ar_step)
-        var_model_k[time_id, :, :] = var_model_k_step
-        var_model_ar[time_id, :, :] = var_model_ar_step
+        var_model_k[time_slice, :, :] = var_model_k_chunk
+        var_model_ar[time_slice, :, :] = var_model_ar_chunk
 
     return var_model_ar, var_model_k
 # ----------------------------------------------------------------------------------------------------------------------
@@ -134,32 +137,34 @@ def define_parameters(geo_x, geo_y):
 
 # ----------------------------------------------------------------------------------------------------------------------
 # method to compute cloud attenuation factor using rain data
-def compute_cloud_factor(data_rain, lookup_table_cf=None):
+def compute_cloud_factor(data_rain, lookup_table_cf=None, time_chunk=None):
 
     # define lookup table
     if lookup_table_cf is None:
         lookup_table_cf = lookup_table_cf_default
 
+    # define time chunk(s) along the last dimension
+    time_n = data_rain.shape[2]
+    if (time_chunk is None) or (time_chunk <= 0):
+        time_chunk = max(time_n, 1)
+
     # initialize cloud factor 3D workspace
     data_cf = np.zeros([data_rain.shape[0], data_rain.shape[1], data_rain.shape[2]])
     data_cf[:, :, :] = np.nan
-    for data_id in range(0, data_rain.shape[2]):
-        data_rain_step = data_rain[:, :, data_id]
-        data_cf_step = apply_cloud_factor_lut(data_rain_step, lookup_table_cf, 'Rain', 'CloudFactor')
-        data_cf[:, :, data_id] = data_cf_step
+    for data_id_start in range(0, time_n, time_chunk):
+        data_id_end = min(data_id_start + time_chunk, time_n)
+        data_rain_chunk = data_rain[:, :, data_id_start:data_id_end]
+        data_cf_chunk = apply_cloud_factor_lut(data_rain_chunk, lookup_table_cf, 'Rain', 'CloudFactor')
+        data_cf[:, :, data_id_start:data_id_end] = data_cf_chunk
 
     return data_cf
 # ----------------------------------------------------------------------------------------------------------------------
 
 
 # ----------------------------------------------------------------------------------------------------------------------
-# method to compute look-up table
-def apply_cloud_factor_lut(var_data_in, lookup_table=None, var_in='Rain', var_out='CloudFactor'):
-
-    var_data_in = np.float32(var_data_in)
-    var_idx_in = np.argwhere(np.isnan(var_data_in))
+# method to apply look-up table conditions
+def eval_cloud_factor_lut(var_data_in, var_data_out, lookup_table=None, var_in='Rain', var_out='CloudFactor'):
 
-    var_data_out = np.zeros([var_data_in.shape[0], var_data_in.shape[1]])
     for lu_table_key, lu_table_value in lookup_table.items():
         lu_var_in = lu_table_value[var_in]
         lu_var_out = lu_table_value[var_out]
@@ -186,7 +191,51 @@ def apply_cloud_factor_lut(var_data_in, lookup_table=None, var_in='Rain', var_ou
             log_stream.error(' ===> LookUp variable range not available')
             raise NotImplemented('LookUp variable range not available')
 
-        var_data_out[var_idx_in[:, 0], var_idx_in[:, 1]] = np.nan
+    return var_data_out
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to define look-up table bins
+def define_cloud_factor_lut(lookup_table=None, var_in='Rain', var_out='CloudFactor'):
+
+    # get bin edges
+    lu_edges = []
+    for lu_table_value in lookup_table.values():
+        lu_edges.extend([lu_value for lu_value in lu_table_value[var_in] if lu_value is not None])
+    lu_edges = np.unique(np.asarray(lu_edges, dtype=float))
+
+    # define one value for each bin interior [edge_i, edge_i+1) and one for each edge
+    if lu_edges.shape[0] > 0:
+        lu_bins_in = np.concatenate([
+            [lu_edges[0] - 1.0], (lu_edges[:-1] + lu_edges[1:]) / 2.0, [lu_edges[-1] + 1.0]])
+    else:
+        lu_bins_in = np.array([0.0])
+    lu_bins_out = eval_cloud_factor_lut(
+        lu_bins_in, np.zeros(lu_bins_in.shape[0]), lookup_table, var_in, var_out)
+    lu_edges_out = eval_cloud_factor_lut(
+        lu_edges, np.zeros(lu_edges.shape[0]), lookup_table, var_in, var_out)
+
+    return lu_edges, lu_bins_out, lu_edges_out
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to compute look-up table
+def apply_cloud_factor_lut(var_data_in, lookup_table=None, var_in='Rain', var_out='CloudFactor'):
+
+    var_data_in = np.float32(var_data_in)
+
+    # define bins and apply them in a single pass
+    lu_edges, lu_bins_out, lu_edges_out = define_cloud_factor_lut(lookup_table, var_in, var_out)
+    var_data_out = np.take(lu_bins_out, np.digitize(var_data_in, lu_edges))
+
+    # fix values equal to an edge closing an interval (i.e. "<=" condition)
+    lu_edges_idx = np.argwhere(lu_edges_out != lu_bins_out[1:])[:, 0]
+    for lu_edge_idx in lu_edges_idx:
+        var_data_out[var_data_in == lu_edges[lu_edge_idx]] = lu_edges_out[lu_edge_idx]
+
+    var_data_out[np.isnan(var_data_in)] = np.nan
 
     return var_data_out
 # ----------------------------------------------------------------------------------------------------------------------
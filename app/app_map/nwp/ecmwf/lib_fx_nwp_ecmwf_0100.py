@@ -27,10 +27,6 @@ logging.getLogger('xarray').setLevel(logging.WARNING)
 # set logger
 alg_logger = logging.getLogger(logger_name)
 
-# debugging
-import matplotlib
-matplotlib.use('TkAgg')
-import matplotlib.pylab as plt
 # ----------------------------------------------------------------------------------------------------------------------
 
 
@@ -112,23 +108,16 @@ def compute_rain(var_dframe, var_attrs=None,
         time_range_out = time_range_out[1:]
         time_steps_out = len(time_range_out)
 
-        values_src = var_dframe.values / var_frequency_value
+        # disaggregate each step over the frequency steps (scale factor applied to the source steps)
+        values_src = (var_dframe.values / var_frequency_value).astype(np.float64) / var_scale_factor
         values_dst = np.zeros(shape=(time_steps_out, values_src.shape[geo_y_idx], values_src.shape[geo_x_idx]))
-        for i in range(0, time_steps_in):
-
-            idx_start = i * var_frequency_value
-            idx_end = (i + 1) * var_frequency_value
-
-            values_src_tmp = values_src[i, :, :]
-            values_dst_tmp = np.zeros(shape=(var_frequency_value, values_src_tmp.shape[0], values_src_tmp.shape[1]))
-            for j in range(0, var_frequency_value):
-                values_dst_tmp[j, :, :] = values_src_tmp
-
-            values_dst[idx_start:idx_end, :, :] = values_dst_tmp
+        values_dst_view = values_dst[0:time_steps_in * var_frequency_value, :, :].reshape(
+            time_steps_in, var_frequency_value, values_src.shape[geo_y_idx], values_src.shape[geo_x_idx])
+        values_dst_view[:, :, :, :] = values_src[:, np.newaxis, :, :]
     elif var_frequency == '1H':
 
         time_range_out = time_range_in
-        values_dst = var_dframe.values
+        values_dst = var_dframe.values / var_scale_factor
 
     else:
         alg_logger.error(' ===> Rain frequency must be "1H" or "3H"')
@@ -140,8 +129,6 @@ def compute_rain(var_dframe, var_attrs=None,
         dim_name_x='longitude', dim_name_y='latitude', dim_name_time='time',
         dims_order=['time', 'latitude', 'longitude'])
 
-    # apply scale factor
-    var_dframe.values = values_dst / var_scale_factor
     # apply units definition
     var_attrs['units'] = 'mm'
 
@@ -290,24 +277,17 @@ def compute_wind_component(var_dframe, var_attrs=None,
         time_range_out = time_range_out[1:]
         time_steps_out = len(time_range_out)
 
-        values_src = var_dframe.values / var_frequency_value
+        # disaggregate each step over the frequency steps (scale factor applied to the source steps)
+        values_src = (var_dframe.values / var_frequency_value).astype(np.float64) * var_scale_factor
         values_dst = np.zeros(shape=(time_steps_out, values_src.shape[geo_y_idx], values_src.shape[geo_x_idx]))
-        for i in range(0, time_steps_in):
-
-            idx_start = i * var_frequency_value
-            idx_end = (i + 1) * var_frequency_value
-
-            values_src_tmp = values_src[i, :, :]
-            values_dst_tmp = np.zeros(shape=(var_frequency_value, values_src_tmp.shape[0], values_src_tmp.shape[1]))
-            for j in range(0, var_frequency_value):
-                values_dst_tmp[j, :, :] = values_src_tmp
-
-            values_dst[idx_start:idx_end, :, :] = values_dst_tmp
+        values_dst_view = values_dst[0:time_steps_in * var_frequency_value, :, :].reshape(
+            time_steps_in, var_frequency_value, values_src.shape[geo_y_idx], values_src.shape[geo_x_idx])
+        values_dst_view[:, :, :, :] = values_src[:, np.newaxis, :, :]
 
     elif var_frequency == '1H':
 
         time_range_out = time_range_in
-        values_dst = var_dframe.values
+        values_dst = var_dframe.values * var_scale_factor
 
     else:
         alg_logger.error(' ===> Wind component frequency must be "1H" or "3H"')
@@ -319,9 +299,6 @@ def compute_wind_component(var_dframe, var_attrs=None,
         dim_name_x='longitude', dim_name_y='latitude', dim_name_time='time',
         dims_order=['time', 'latitude', 'longitude'])
 
-    # apply scale factor
-    var_dframe.values = var_dframe.values * var_scale_factor
-
     # apply units definition
     var_attrs['units'] = 'm s-1'
 
@@ -401,7 +378,7 @@ def compute_relative_humidity(var_dframe, var_attrs=None,
 def compute_incoming_radiation(var_dframe, var_attrs=None,
                                var_name_time='time', var_name_geo_x='longitude', var_name_geo_y='latitude',
                                var_period=None, var_frequency='1H',
-                               var_type='average', **kwargs):
+                               var_type='average', var_dtype=None, **kwargs):
 
     # get variable units
     var_units = check_attributes('units', var_attrs)
@@ -453,23 +430,27 @@ def compute_incoming_radiation(var_dframe, var_attrs=None,
         idx_start, idx_end = var_period[0], var_period[1]
         var_dframe = var_dframe[idx_start:idx_end, :, :]
 
-    # compute variable field(s)
-    n = var_dframe.shape[0]
+    # compute variable field(s) (instantaneous values as differences of the cumulated values i * mean_i)
+    # (cumulated values computed in float64 or in the dtype passed by var_dtype; e.g. 'float32')
     values_src = var_dframe.values
-    values_sum = np.zeros(shape=(values_src.shape[geo_y_idx], values_src.shape[geo_x_idx]))
-    for i in range(0, n):
+    values_dtype = np.float64 if var_dtype is None else np.dtype(var_dtype)
+    values_weights = np.arange(values_src.shape[0], dtype=values_dtype)[:, np.newaxis, np.newaxis]
+    values_cum = np.multiply(values_src, values_weights, dtype=values_dtype)
 
-        values_avg = values_src[i, :, :]
+    values_ist = np.empty(shape=values_src.shape, dtype=values_src.dtype)
+    values_ist[0, :, :] = values_cum[0, :, :]
+    np.subtract(values_cum[1:, :, :], values_cum[:-1, :, :], out=values_ist[1:, :, :], casting='same_kind')
+    np.maximum(values_ist, 0.0, out=values_ist)
 
-        values_ist = i * values_avg - values_sum
-        values_sum = values_sum + values_ist
-
-        values_ist[values_ist < 0.0] = 0.0
-
-        var_dframe.values[i, :, :] = values_ist
+    # keep undefined values undefined in the following steps (as the running sum does)
+    cell_nan = np.isnan(values_cum.sum(axis=0))
+    if cell_nan.any():
+        values_nan = np.logical_or.accumulate(np.isnan(values_cum[:, cell_nan]), axis=0)
+        values_ist[:, cell_nan] = np.where(values_nan, np.nan, values_ist[:, cell_nan])
 
     # apply scale factor
-    var_dframe.values = var_dframe.values * var_scale_factor
+    values_ist *= var_scale_factor
+    var_dframe.values = values_ist
 
     # apply units definition
     var_attrs['units'] = 'W m-2'
@@ -56,7 +56,8 @@ def compute_astronomic_radiation(var_data, var_time,
                                  var_name_rain='rain', var_name_k='incoming_radiation',
                                  var_name_time='time', var_name_geo_x='longitude', var_name_geo_y='latitude',
                                  var_period=None, var_frequency='1H',
-                                 var_type_rain='accumulated', var_type_inc_rad='instantaneous', **kwargs):
+                                 var_type_rain='accumulated', var_type_inc_rad='instantaneous',
+                                 var_time_chunk=None, **kwargs):
 
     # get rain data and attributes
     if var_name_rain in list(var_data.keys()):
@@ -114,7 +115,7 @@ def compute_astronomic_radiation(var_data, var_time,
         raise NotImplementedError('Case not implemented yet')
 
     # compute cloud factor
-    var_values_cf = compute_cloud_factor(var_values_rain)
+    var_values_cf = compute_cloud_factor(var_values_rain, time_chunk=var_time_chunk)
     # compute parameters
     geo_lz, geo_lm, geo_phi, arad_param_gsc, arad_param_as, arad_param_bs = define_parameters(var_geo_x, var_geo_y)
 
@@ -122,7 +123,8 @@ def compute_astronomic_radiation(var_data, var_time,
     var_values_ar, var_values_k = exec_astronomic_radiation(
         var_values_cf, var_geo_terrain,
         time_range, time_delta,
-        geo_lz, geo_lm, geo_phi, arad_param_gsc, arad_param_as, arad_param_bs)
+        geo_lz, geo_lm, geo_phi, arad_param_gsc, arad_param_as, arad_param_bs,
+        time_chunk=var_time_chunk)
 
     # var_da = create_darray(
     #    var_model_k, var_geo_x, var_geo_y, geo_1d=False, time=time_range, name=None,
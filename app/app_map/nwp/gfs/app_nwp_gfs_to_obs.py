@@ -19,7 +19,7 @@ Version(s):
 
 # -------------------------------------------------------------------------------------
 import numpy as np
-import logging, json, os, time, struct
+import logging, json, os, time, struct, gzip, shutil
 from argparse import ArgumentParser
 import pandas as pd
 import xarray as xr
@@ -85,79 +85,67 @@ def main():
     varIn = [i for i in data_settings['data']['dynamic']['source'] if data_settings['data']['dynamic']['source'][i]['compute']]
 
     logging.info(' ---> Compute variables : ' + ','.join(varIn))
-    readed_grid = False
 
+    # Search the source file of each time step and variable (the file of the precedent day is used as fallback)
+    logging.info(' ---> Search source files...')
+    files_time_step = {}
     for timeNow in timeRange:
-        logging.info(' ----> Compute time step ' + timeNow.strftime("%Y-%m-%d %H:%M") + '...')
-        inMaps = {}
-        missing_input = False
-
+        files_time_step[timeNow] = {}
         for var in varIn:
-            logging.info(' ---> Extract variable: ' + var)
+            file_time_step = define_file_time_step(data_settings['data']['dynamic']['source'][var],
+                                                   data_settings['algorithm']['template'], timeNow)
+            if file_time_step is None:
+                logging.warning(' --> WARNING! File for time step ' + timeNow.strftime(
+                    "%Y-%m-%d %H") + ' not found... SKIPPED!"')
+                files_time_step[timeNow] = None
+                break
+            files_time_step[timeNow][var] = file_time_step
+
+    # Group the time steps by variable and source file (each daily source file is opened once)
+    files_window = {}
+    for timeNow, files_step in files_time_step.items():
+        if files_step is not None:
+            for var, file_time_step in files_step.items():
+                files_window.setdefault((var, file_time_step), []).append(timeNow)
+
+    # Extract the requested time window of each variable and source file
+    maps_window = {}
+    readed_grid = False
+    for (var, file_time_step), time_window in files_window.items():
+        logging.info(' ---> Extract variable: ' + var + ' from file: ' + file_time_step)
 
-            template_time_step = fill_template_time_step(data_settings['algorithm']['template'], timeNow)
-            file_time_step = os.path.join(data_settings['data']['dynamic']['source'][var]['folder_name'],
-                                              data_settings['data']['dynamic']['source'][var]['file_name']).format(
-                **template_time_step)
-
-            if not os.path.isfile(file_time_step):
-                # If the forecast related to the timeNow time step does not exist I search for timeNow in the precedent time step
-                template_time_step = fill_template_time_step(data_settings['algorithm']['template'], timeNow - pd.Timedelta('1D'))
-                file_time_step = os.path.join(data_settings['data']['dynamic']['source'][var]['folder_name'],
-                                             data_settings['data']['dynamic']['source'][var]['file_name']).format(**template_time_step)
-                if not os.path.isfile(file_time_step):
-                    logging.warning(' --> WARNING! File for time step ' + timeNow.strftime(
-                        "%Y-%m-%d %H") + ' not found... SKIPPED!"')
-                    missing_input = True
-                    break
-                # And then re-generate the timeNow templates for the output templates
-                template_time_step = fill_template_time_step(data_settings['algorithm']['template'], timeNow)
-
-            file_open = xr.open_dataset(file_time_step).sel(time=timeNow, method='backfill')
-            inMaps[var] = np.squeeze(file_open[data_settings['data']['dynamic']['source'][var]['var_name']])
+        with xr.open_dataset(file_time_step) as file_open:
+            var_window = file_open[data_settings['data']['dynamic']['source'][var]['var_name']].sel(
+                time=time_window, method='backfill').load()
 
             if not readed_grid:
                 logging.info(" ---> Read geographic references")
-                nrows = len(file_open.lat)
-                ncols = len(file_open.lon)
-                res = float(abs(file_open.lat[1]-file_open.lat[0]))
-                xll = float(min(file_open.lon)) - res/2
-                yll = float(min(file_open.lat)) - res/2
-
-                attributes_dict = {'ncols': ncols,
-                                   'nrows': nrows,
-                                   'nodata_value': -9999.0,
-                                   'xllcorner': xll,
-                                   'yllcorner': yll,
-                                   'cellsize': res}
-
-                geo_x_values = np.sort(file_open.lon)
-                # Check if lo is in the 0-360 format and shift to -180 180
-                if any(geo_x_values>180):
-                    geo_x_values = geo_x_values-360
-                geo_y_values = np.sort(file_open.lat)
+                attributes_dict, geo_x_values, geo_y_values = read_geo_reference(file_open)
                 geo_data_values = -9999
 
                 readed_grid = True
 
-        if not missing_input:
+        for time_id, timeNow in enumerate(time_window):
+            maps_window[(var, timeNow)] = np.squeeze(var_window.isel(time=time_id))
+
+    for timeNow in timeRange:
+        logging.info(' ----> Compute time step ' + timeNow.strftime("%Y-%m-%d %H:%M") + '...')
+
+        if files_time_step[timeNow] is not None:
+            inMaps = {}
+            for var in varIn:
+                inMaps[var] = maps_window.pop((var, timeNow))
+
             logging.info(' ---> Create variables dataset...')
             dset_data = create_dset(inMaps, geo_data_values, geo_x_values, geo_y_values, timeNow,
                                 global_attrs_dict=attributes_dict)
 
+            template_time_step = fill_template_time_step(data_settings['algorithm']['template'], timeNow)
             file_out_time_step = os.path.join(data_settings['data']['dynamic']['destination']['folder_name'], data_settings['data']['dynamic']['destination']['file_name']).format(**template_time_step)
 
             logging.info(' ---> Write output...')
             os.makedirs(os.path.dirname(file_out_time_step), exist_ok=True)
-            write_dset(file_out_time_step, dset_data, dset_mode='w', dset_engine='h5netcdf', dset_compression_level=0,
-                       dset_format='NETCDF4',
-                       dim_key_time='time', fill_value=-9999.0)
-
-            if data_settings['data']['dynamic']['destination']['file_compression']:
-                os.system('gzip -f ' + file_out_time_step)
-
-
-
+            write_output(file_out_time_step, dset_data, data_settings['data']['dynamic']['destination'])
 
     # -------------------------------------------------------------------------------------
     # Info algorithm
@@ -174,6 +162,74 @@ def main():
 
 # --------------------------------------------------------------------------------
 
+# -------------------------------------------------------------------------------------
+# Method to define the source file of a time step (the file of the precedent day is used as fallback)
+def define_file_time_step(source_settings, template_dict, timeNow):
+
+    for time_file in [timeNow, timeNow - pd.Timedelta('1D')]:
+        template_time_step = fill_template_time_step(template_dict, time_file)
+        file_time_step = os.path.join(source_settings['folder_name'],
+                                      source_settings['file_name']).format(**template_time_step)
+        if os.path.isfile(file_time_step):
+            return file_time_step
+
+    return None
+# -------------------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------------------
+# Method to read the geographic references of a source file
+def read_geo_reference(file_open):
+
+    nrows = len(file_open.lat)
+    ncols = len(file_open.lon)
+    res = float(abs(file_open.lat[1] - file_open.lat[0]))
+    xll = float(min(file_open.lon)) - res / 2
+    yll = float(min(file_open.lat)) - res / 2
+
+    attributes_dict = {'ncols': ncols,
+                       'nrows': nrows,
+                       'nodata_value': -9999.0,
+                       'xllcorner': xll,
+                       'yllcorner': yll,
+                       'cellsize': res}
+
+    geo_x_values = np.sort(file_open.lon)
+    # Check if lo is in the 0-360 format and shift to -180 180
+    if any(geo_x_values > 180):
+        geo_x_values = geo_x_values - 360
+    geo_y_values = np.sort(file_open.lat)
+
+    return attributes_dict, geo_x_values, geo_y_values
+# -------------------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------------------
+# Method to write output (compression mode 'internal': netcdf zlib compression; 'gzip': gzip file of the netcdf)
+# (the 'gzip' mode is the default for the settings without compression mode, as the previous .nc.gz output)
+def write_output(file_name, dset_data, destination_settings):
+
+    file_compression = destination_settings['file_compression']
+    compression_mode = 'gzip'
+    if 'compression_mode' in list(destination_settings.keys()):
+        compression_mode = destination_settings['compression_mode']
+    compression_level = 4
+    if 'compression_level' in list(destination_settings.keys()):
+        compression_level = destination_settings['compression_level']
+
+    if file_compression and compression_mode == 'internal':
+        dset_compression_level = compression_level
+    else:
+        dset_compression_level = 0
+
+    write_dset(file_name, dset_data, dset_mode='w', dset_engine='h5netcdf',
+               dset_compression_level=dset_compression_level, dset_format='NETCDF4',
+               dim_key_time='time', fill_value=-9999.0)
+
+    if file_compression and compression_mode == 'gzip':
+        with open(file_name, 'rb') as file_handle_in, gzip.open(file_name + '.gz', 'wb') as file_handle_out:
+            shutil.copyfileobj(file_handle_in, file_handle_out, 16 * 1024 * 1024)
+        os.remove(file_name)
+# -------------------------------------------------------------------------------------
+
 # -------------------------------------------------------------------------------------
 # Method to create datasets
 def create_dset(var_data_dict, geo_data_values, geo_x_values, geo_y_values, time_data_values,
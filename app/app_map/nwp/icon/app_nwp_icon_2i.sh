@@ -20,10 +20,11 @@ script_file='app_nwp_icon_2i_main.py'
 settings_file='app_nwp_icon_2i.json'
 
 # Get lock information
-file_lock_start='app_nwp_icon_2i_lock_START.txt'
-file_lock_end='app_nwp_icon_2i_lock_END.txt'
+# (dated lock files shared with the file-arrival monitors rules; the locks are kept to skip a processed day)
+file_lock_start_raw='app_nwp_icon_2i_lock_%YYYY%MM%DD_START.txt'
+file_lock_end_raw='app_nwp_icon_2i_lock_%YYYY%MM%DD_END.txt'
 
-file_lock_init=true
+file_lock_init=false
 folder_lock_raw='/lock/nwp/'
 
 # Get data information
@@ -66,6 +67,14 @@ folder_lock_def=${folder_lock_raw/"%YYYY"/$year}
 folder_lock_def=${folder_lock_def/"%MM"/$month}
 folder_lock_def=${folder_lock_def/"%DD"/$day}
 
+file_lock_start=${file_lock_start_raw/"%YYYY"/$year}
+file_lock_start=${file_lock_start/"%MM"/$month}
+file_lock_start=${file_lock_start/"%DD"/$day}
+
+file_lock_end=${file_lock_end_raw/"%YYYY"/$year}
+file_lock_end=${file_lock_end/"%MM"/$month}
+file_lock_end=${file_lock_end/"%DD"/$day}
+
 # Create folder(s)
 if [ ! -d "$folder_data_def" ]; then
 	mkdir -p $folder_data_def
@@ -170,8 +179,12 @@ if $file_check; then
         echo " "
         echo " ================================ " >> $path_file_lock_def_start
 
-        # Run python script (using setting and time)
-        python3 $script_file -settings_file $settings_file -time "$time_now"
+        # Run python script (using setting and time); release the START lock if the script fails
+        if ! python3 $script_file -settings_file $settings_file -time "$time_now"; then
+            rm -f "$path_file_lock_def_start"
+            echo " ===> EXECUTION ... FAILED! SCRIPT ENDED WITH ERRORS! LOCK FILE START REMOVED"
+            exit 1
+        fi
         
         # Lock File END
         time_step=$(date +"%Y-%m-%d %H:%S")
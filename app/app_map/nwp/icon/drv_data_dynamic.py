@@ -27,7 +27,7 @@ from lib_data_io_grib import read_file_grib, organize_file_grib
 from lib_data_io_nc import (organize_file_nc_xarray, organize_file_nc_library,
                             write_file_nc_xarray, write_file_nc_library)
 
-from lib_data_io_gzip import zip_filename, unzip_filename
+from lib_data_io_gzip import zip_filename, unzip_filename, purge_filename_expired
 
 from lib_utils_io import fill_string_with_time, fill_string_with_info
 from lib_utils_zip import remove_zip_extension, add_zip_extension
@@ -39,8 +39,6 @@ from lib_fx_methods import (extract_data,
 # set logger
 alg_logger = logging.getLogger(logger_name)
 
-# debug
-import matplotlib.pylab as plt
 # -------------------------------------------------------------------------------------
 
 
@@ -96,11 +94,33 @@ class DrvData:
         self.file_name_anc_def = self.alg_datasets_anc_def[self.tag_file_name]
         self.file_path_anc_def = os.path.join(self.folder_name_anc_def, self.file_name_anc_def)
 
+        # resample index folder (persistent cache of the resample index; default is the tmp folder)
+        if 'index' in list(alg_settings[tag_section_datasets]['dynamic']['ancillary'].keys()):
+            self.folder_name_anc_index = alg_settings[tag_section_datasets]['dynamic']['ancillary']['index'][
+                self.tag_folder_name]
+        else:
+            self.folder_name_anc_index = self.alg_tmp[self.tag_folder_name]
+
+        # unzip folder (unzipped source file(s) are reused if not expired; default is the source folder)
+        self.folder_name_anc_unzip, self.expire_anc_unzip = None, None
+        if 'unzip' in list(alg_settings[tag_section_datasets]['dynamic']['ancillary'].keys()):
+            settings_anc_unzip = alg_settings[tag_section_datasets]['dynamic']['ancillary']['unzip']
+            self.folder_name_anc_unzip = settings_anc_unzip[self.tag_folder_name]
+            if 'expire' in list(settings_anc_unzip.keys()):
+                self.expire_anc_unzip = settings_anc_unzip['expire']
+
         self.folder_name_dst = self.alg_datasets_dst[self.tag_folder_name]
         self.file_name_dst = self.alg_datasets_dst[self.tag_file_name]
         self.file_path_dst = os.path.join(self.folder_name_dst, self.file_name_dst)
         self.format_dst = self.alg_datasets_dst[self.tag_format]
         self.compression_dst = self.alg_datasets_dst[self.tag_compression]
+        # compression mode ('gzip': gzip file of the netcdf; 'internal': netcdf compression only)
+        if 'compression_mode' in list(self.alg_datasets_dst.keys()):
+            self.compression_mode_dst = self.alg_datasets_dst['compression_mode']
+        else:
+            self.compression_mode_dst = 'gzip'
+        if self.compression_mode_dst == 'internal':
+            self.compression_dst = False
         self.variables_dst = self.alg_datasets_dst[self.tag_variables]
 
         self.grid_geo_x_src, self.grid_geo_y_src = self.alg_static['grid_geo_x_src'], self.alg_static['grid_geo_y_src']
@@ -206,8 +226,12 @@ class DrvData:
 
                     # check compression mode
                     if file_compression_src:
-                        file_path_src_tmp = remove_zip_extension(file_path_src_step)
-                        unzip_filename(file_path_src_step, file_path_src_tmp)
+                        folder_name_src_unzip = None
+                        if self.folder_name_anc_unzip is not None:
+                            folder_name_src_unzip = self.__define_file_string(self.folder_name_anc_unzip)
+                        file_path_src_tmp = remove_zip_extension(
+                            file_path_src_step, file_path_tmp=folder_name_src_unzip)
+                        unzip_filename(file_path_src_step, file_path_src_tmp, file_expire=self.expire_anc_unzip)
                     else:
                         file_path_src_tmp = deepcopy(file_path_src_step)
 
@@ -316,6 +340,11 @@ class DrvData:
             alg_logger.info(' ----> Time reference "' + alg_time_reference.strftime(time_format_algorithm) +
                             '" ... SKIPPED. Datasets previously saved.')
 
+        # remove the expired unzipped file(s) (the unzip folder does not grow over the runs)
+        if self.folder_name_anc_unzip is not None:
+            purge_filename_expired(self.__define_file_string(self.folder_name_anc_unzip),
+                                   file_expire=self.expire_anc_unzip)
+
         # info end method
         alg_logger.info(' ---> Organize dynamic datasets ... DONE')
 
@@ -373,7 +402,7 @@ class DrvData:
                 alg_logger.info(' -----> (2) Extract datasets ... DONE')
 
                 import numpy as np
-                values_extract = np.flipud(obj_data_anc_extract_step['air_temperature'].values[0, :, :])
+                values_extract = np.flipud(obj_data_anc_extract_step['air_temperature'].values[0, :, :]).copy()
 
                 # info start compose datasets
                 alg_logger.info(' -----> (3) Compose datasets ... ')
@@ -383,7 +412,7 @@ class DrvData:
                 # info end compose datasets
                 alg_logger.info(' -----> (3) Compose datasets ... DONE')
 
-                values_compose = np.flipud(obj_data_anc_compose_step['air_temperature'].values[0, :, :])
+                values_compose = np.flipud(obj_data_anc_compose_step['air_temperature'].values[0, :, :]).copy()
 
                 # info start transform datasets
                 alg_logger.info(' -----> (4) Transform datasets ... ')
@@ -393,7 +422,11 @@ class DrvData:
                 # info start transform datasets
                 alg_logger.info(' -----> (4) Transform datasets ... DONE')
 
-                values_ds2data = np.flipud(obj_data_anc_ds2data_step['air_temperature'][0, :, :])
+                values_ds2data = np.flipud(obj_data_anc_ds2data_step['air_temperature'][0, :, :]).copy()
+
+                # release the source datasets (the source values are kept only by the data collection and
+                # released by the resample method variable by variable)
+                del obj_collections_anc_raw_step, obj_data_anc_extract_step, obj_data_anc_compose_step
 
                 # info start resample datasets
                 alg_logger.info(' -----> (5) Resample datasets ... ')
@@ -401,7 +434,8 @@ class DrvData:
                 obj_data_anc_resample_step = resample_data(
                     obj_data_anc_ds2data_step, obj_geo_x_anc, obj_geo_y_anc,
                     grid_geo_x_dst, grid_geo_y_dst,
-                    geo_resample_idx=True, geo_mask_dst=grid_geo_values_dst,
+                    geo_resample_idx=True, geo_resample_folder=self.folder_name_anc_index,
+                    geo_mask_dst=grid_geo_values_dst,
                     **settings_resample_data)
                 # info end resample datasets
                 alg_logger.info(' -----> (5) Resample datasets ... DONE')
@@ -429,6 +463,7 @@ class DrvData:
                 """
                 import matplotlib
                 matplotlib.use('TkAgg')
+                import matplotlib.pylab as plt
                 plt.figure()
                 plt.imshow(values_extract)
                 plt.colorbar()
@@ -27,9 +27,6 @@ alg_logger = logging.getLogger(logger_name)
 logging.getLogger('cfgrib').setLevel(logging.WARNING)
 logging.getLogger('gribapi').setLevel(logging.WARNING)
 
-# debug
-import matplotlib.pylab as plt
-
 # default netcdf encoded attributes
 attrs_encoded = ["_FillValue", "dtype", "scale_factor", "add_offset", "grid_mapping"]
 # ----------------------------------------------------------------------------------------------------------------------
@@ -147,6 +144,50 @@ def organize_file_grib(obj_data, obj_time=None, obj_geo_x=None, obj_geo_y=None,
 # ----------------------------------------------------------------------------------------------------------------------
 
 
+# ----------------------------------------------------------------------------------------------------------------------
+# method to open grib file (messages are indexed once and grouped by variable, data type and level type)
+def open_file_grib(file_name, file_variables, file_filter=None, file_index='{path}.{short_hash}.idx'):
+
+    # import optional backend at first use
+    import cfgrib
+
+    # define backend arguments (the index is saved next to the file and reused by the next reading)
+    backend_kwargs = {'indexpath': file_index}
+    if file_filter is not None:
+        backend_kwargs['filter_by_keys'] = file_filter
+
+    # open all the groups of messages in a single scan
+    file_groups = cfgrib.open_datasets(file_name, backend_kwargs=backend_kwargs)
+
+    # iterate over variable(s)
+    file_dset = None
+    for file_var in file_variables:
+
+        # search variable in the groups
+        tmp_dset = None
+        for file_group in file_groups:
+            if file_var in list(file_group.data_vars):
+                tmp_dset = file_group[[file_var]]
+                break
+
+        # check variable availability
+        if tmp_dset is None:
+            alg_logger.warning(' ===> Variable "' + file_var + '" not found in the grib file groups')
+            continue
+
+        if file_dset is None:
+            file_dset = tmp_dset
+        else:
+            file_dset = file_dset.merge(tmp_dset)
+
+    # check dataset availability
+    if file_dset is None:
+        file_dset = xr.Dataset()
+
+    return file_dset
+# ----------------------------------------------------------------------------------------------------------------------
+
+
 # ----------------------------------------------------------------------------------------------------------------------
 # method to read grib file
 def read_file_grib(file_name, file_variables=None, file_time_reference=None,
@@ -168,17 +209,8 @@ def read_file_grib(file_name, file_variables=None, file_time_reference=None,
         if not isinstance(filter_vars, list):
             filter_vars = [filter_vars]
 
-        # iterate over filter variables
-        file_dset = None
-        for filter_var in filter_vars:
-            tmp_dset = xr.open_dataset(
-                file_name, engine='cfgrib',
-                backend_kwargs={'filter_by_keys': {'cfVarName': filter_var}})
-
-            if file_dset is None:
-                file_dset = tmp_dset
-            else:
-                file_dset = file_dset.merge(tmp_dset)
+        # read file (all the variables in one pass)
+        file_dset = open_file_grib(file_name, filter_vars)
 
         # check file empty or not
         if len(file_dset.dims) > 0:
@@ -215,6 +247,7 @@ def read_file_grib(file_name, file_variables=None, file_time_reference=None,
                         data_attrs = {**tmp_attrs, **file_attrs}
 
                         ''' debug
+                        import matplotlib.pylab as plt
                         plt.figure()
                         plt.imshow(data_values)
                         plt.colorbar()
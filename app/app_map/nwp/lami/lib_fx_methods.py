@@ -21,15 +21,13 @@ from copy import deepcopy
 import lib_fx_nwp_generic as lib_fx_nwp
 
 from lib_utils_io import create_darray
-from lib_utils_geo import resample_points_to_grid
+from lib_utils_geo import resample_points_to_grid, get_resample_index
 from lib_info_args import logger_name
 
 # set logger
 alg_logger = logging.getLogger(logger_name)
 logging.getLogger('repurpose').setLevel(logging.WARNING)
 
-# debug
-import matplotlib.pylab as plt
 # ----------------------------------------------------------------------------------------------------------------------
 
 
@@ -130,15 +128,26 @@ def extract_data(obj_collections_src,
 # ----------------------------------------------------------------------------------------------------------------------
 
 
+# ----------------------------------------------------------------------------------------------------------------------
+# method to iterate over chunks of time steps
+def iter_time_chunks(n_time, time_chunk=None):
+    if time_chunk is None or time_chunk <= 0:
+        time_chunk = n_time
+    for n_start in range(0, n_time, max(int(time_chunk), 1)):
+        yield n_start, min(n_start + int(time_chunk), n_time)
+# ----------------------------------------------------------------------------------------------------------------------
+
+
 # ----------------------------------------------------------------------------------------------------------------------
 # method to resample data
 def resample_data(obj_data_src, geo_x_values_src, geo_y_values_src, geo_x_values_dst, geo_y_values_dst,
-                  geo_resample_idx=True,
-                  geo_mask_dst=None, **kwargs):
+                  geo_resample_idx=True, geo_resample_folder=None,
+                  geo_mask_dst=None, time_chunk=24, **kwargs):
 
-    # iterate over variable(s)
+    # iterate over variable(s) (each source variable is released from the collection once resampled)
     obj_data_dst = {}
-    for var_name, var_values_src in obj_data_src.items():
+    for var_name in list(obj_data_src.keys()):
+        var_values_src = obj_data_src.pop(var_name)
         if var_values_src is not None:
 
             if var_name in kwargs:
@@ -146,39 +155,39 @@ def resample_data(obj_data_src, geo_x_values_src, geo_y_values_src, geo_x_values
             else:
                 var_settings = {}
 
+            # get resample index (reused across variables, time steps and runs with the same geo and settings)
             idx_1d_dst = None
             if geo_resample_idx:
+                idx_1d_dst = get_resample_index(
+                    geo_x_values_src, geo_y_values_src, geo_x_values_dst, geo_y_values_dst,
+                    folder_name=geo_resample_folder, **var_settings)
 
-                idx_1d_src = np.arange(0, geo_y_values_src.shape[0] * geo_x_values_src.shape[1])
-                idx_2d_src = np.reshape(idx_1d_src, [geo_y_values_src.shape[0], geo_x_values_src.shape[1]])
-
-                idx_2d_dst, _, _ = resample_points_to_grid(
-                    idx_2d_src, geo_x_values_src, geo_y_values_src, geo_x_values_dst, geo_y_values_dst,
-                    **var_settings)
-
-                idx_1d_dst = idx_2d_dst.ravel()
-                idx_1d_dst = np.asarray(idx_1d_dst, dtype=int)
-
-            var_values_dst = np.zeros((var_values_src.shape[0], geo_y_values_dst.shape[0], geo_x_values_dst.shape[1]))
-            for n in range(0, var_values_src.shape[0]):
+            n_time, n_y, n_x = var_values_src.shape[0], geo_y_values_dst.shape[0], geo_x_values_dst.shape[1]
+            # allocate the resampled data in the source floating type (float32 data are not promoted to float64)
+            var_values_dst = np.zeros((n_time, n_y, n_x), dtype=np.result_type(var_values_src.dtype, np.float32))
 
-                if idx_1d_dst is None:
+            if idx_1d_dst is None:
+                for n in range(0, n_time):
                     var_values_tmp, _, _ = resample_points_to_grid(
                         var_values_src[n, :, :], geo_x_values_src, geo_y_values_src, geo_x_values_dst, geo_y_values_dst,
                         **var_settings)
-                else:
-                    var_arr_src = var_values_src[n, :, :].ravel()
-                    var_arr_dst = var_arr_src[idx_1d_dst]
-                    var_values_tmp = np.reshape(var_arr_dst, [geo_x_values_dst.shape[0], geo_y_values_dst.shape[1]])
-
-                var_values_tmp = np.flipud(var_values_tmp)
-                var_values_tmp[geo_mask_dst == 0] = np.nan
-
-                var_values_dst[n, :, :] = var_values_tmp
+                    var_values_tmp = np.flipud(var_values_tmp)
+                    if geo_mask_dst is not None:
+                        var_values_tmp[geo_mask_dst == 0] = np.nan
+                    var_values_dst[n, :, :] = var_values_tmp
+            else:
+                # resample by chunks of time steps (temporary arrays are limited to the chunk size)
+                for n_start, n_end in iter_time_chunks(n_time, time_chunk):
+                    var_arr_src = var_values_src[n_start:n_end, :, :].reshape(n_end - n_start, -1)
+                    var_arr_dst = np.take(var_arr_src, idx_1d_dst, axis=1)
+                    var_values_dst[n_start:n_end, :, :] = var_arr_dst.reshape(n_end - n_start, n_y, n_x)[:, ::-1, :]
+                if geo_mask_dst is not None:
+                    var_values_dst[:, geo_mask_dst == 0] = np.nan
 
             ''' debug
             import matplotlib
             matplotlib.use('TkAgg')
+            import matplotlib.pylab as plt
             plt.figure()
             plt.imshow(np.flipud(var_values_src[0, :, :]))
             plt.colorbar()
@@ -189,6 +198,7 @@ def resample_data(obj_data_src, geo_x_values_src, geo_y_values_src, geo_x_values
             '''
 
             obj_data_dst[var_name] = var_values_dst
+            del var_values_src
         else:
             alg_logger.warning(' ===> Data "' + var_name + '" is not available in the datasets')
             obj_data_dst[var_name] = None
@@ -216,6 +226,7 @@ def apply_settings(var_data, var_settings):
         var_type_out = var_settings['type_out']
     if var_type_out is None:
         var_type_out = 'float'
+    # astype returns a new array (the input data are never updated in place)
     if var_type_in != var_type_out:
         var_data = var_data.astype(var_type_out)
     if var_type_in == var_type_out:
@@ -243,14 +254,17 @@ def apply_settings(var_data, var_settings):
 
     if ('mask_in' in list(var_settings.keys())) and ('mask_out' in list(var_settings.keys())):
         var_mask_in, var_mask_out = var_settings['mask_in'], var_settings['mask_out']
-        var_data_tmp = deepcopy(var_data)
         if var_mask_in is not None and var_mask_out is not None:
+            # compute the masks on the original values before updating the data
+            var_mask_list = []
             for value_in, value_out in zip(var_mask_in, var_mask_out):
 
                 if isinstance(value_in, list) and isinstance(value_out, list):
                     pass  # nothing to do if the input and output values are lists
                 else:
-                    var_data[var_data_tmp == value_in] = value_out
+                    var_mask_list.append((var_data == value_in, value_out))
+            for var_mask_idx, value_out in var_mask_list:
+                var_data[var_mask_idx] = value_out
 
     return var_data
 # ----------------------------------------------------------------------------------------------------------------------
@@ -352,8 +366,7 @@ def organize_data(obj_data, obj_geo, var_name_pivot='ssm_data',
         else:
             var_settings = {}
 
-        var_data_tmp = deepcopy(var_data.flatten())
-        var_data_def = apply_settings(var_data_tmp, var_settings)
+        var_data_def = apply_settings(var_data.ravel(), var_settings)
 
         variable_geo[var_name] = var_data_def
 
@@ -373,22 +386,22 @@ def organize_data(obj_data, obj_geo, var_name_pivot='ssm_data',
         else:
 
             ''' debug
+            import matplotlib.pylab as plt
             plt.figure()
             plt.imshow(var_data.astype(float))
             plt.colorbar()
             plt.show()
             '''
             if isinstance(var_data, list):
-                pass
+                var_data = deepcopy(var_data)
             else:
                 var_data = var_data.flatten()
 
         if var_settings is not None:
             if var_settings:
-                var_data_tmp = deepcopy(var_data)
-                var_data_def = apply_settings(var_data_tmp, var_settings)
+                var_data_def = apply_settings(var_data, var_settings)
             else:
-                var_data_def = deepcopy(var_data)
+                var_data_def = var_data
         else:
             var_data_def = None
 
@@ -415,7 +428,7 @@ def organize_data(obj_data, obj_geo, var_name_pivot='ssm_data',
 
 # ----------------------------------------------------------------------------------------------------------------------
 # method to mask data
-def mask_data(obj_data_src, **kwargs):
+def mask_data(obj_data_src, time_chunk=24, **kwargs):
 
     # iterate over variable(s)
     obj_data_dst = {}
@@ -426,8 +439,8 @@ def mask_data(obj_data_src, **kwargs):
             else:
                 var_settings = {}
 
-            # get variable data
-            var_data_dst = deepcopy(var_data_src)
+            # get variable data (updated in place, the source data are not used after the masking step)
+            var_data_dst = var_data_src
 
             # get no data value
             var_no_data = np.nan
@@ -435,20 +448,29 @@ def mask_data(obj_data_src, **kwargs):
                 var_no_data = var_settings['no_data']
                 if var_no_data is None:
                     var_no_data = np.nan
-            # apply mask of min values
+            # get min and max values
+            var_min, var_max = None, None
             if 'var_min' in var_settings:
                 var_min = var_settings['var_min']
-                if var_min is not None:
-                    var_data_dst[var_data_dst < var_min] = var_no_data
-            # apply mask of max values
             if 'var_max' in var_settings:
                 var_max = var_settings['var_max']
+
+            # apply mask of min and max values (by chunks of time steps for the 3d data)
+            if var_data_dst.ndim == 3:
+                var_data_chunks = [var_data_dst[n_start:n_end]
+                                   for n_start, n_end in iter_time_chunks(var_data_dst.shape[0], time_chunk)]
+            else:
+                var_data_chunks = [var_data_dst]
+            for var_data_chunk in var_data_chunks:
+                if var_min is not None:
+                    var_data_chunk[var_data_chunk < var_min] = var_no_data
                 if var_max is not None:
-                    var_data_dst[var_data_dst > var_max] = var_no_data
+                    var_data_chunk[var_data_chunk > var_max] = var_no_data
             # store data in a collection
             obj_data_dst[var_name] = var_data_dst
 
             ''' debug
+            import matplotlib.pylab as plt
             plt.figure()
             plt.imshow(var_data_dst)
             plt.colorbar()
@@ -253,7 +253,7 @@ def compute_relative_humidity(var_dframe, var_attrs=None,
 def compute_incoming_radiation(var_dframe, var_attrs=None,
                                var_name_time='time', var_name_geo_x='longitude', var_name_geo_y='latitude',
                                var_period=None, var_frequency='1H',
-                               var_type='average', **kwargs):
+                               var_type='average', var_dtype=None, **kwargs):
 
     # get variable units
     var_units = check_attributes('units', var_attrs)
@@ -305,23 +305,27 @@ def compute_incoming_radiation(var_dframe, var_attrs=None,
         idx_start, idx_end = var_period[0], var_period[1]
         var_dframe = var_dframe[idx_start:idx_end, :, :]
 
-    # compute variable field(s)
-    n = var_dframe.shape[0]
+    # compute variable field(s) (instantaneous values as differences of the cumulated values i * mean_i)
+    # (cumulated values computed in float64 or in the dtype passed by var_dtype; e.g. 'float32')
     values_src = var_dframe.values
-    values_sum = np.zeros(shape=(values_src.shape[geo_y_idx], values_src.shape[geo_x_idx]))
-    for i in range(0, n):
+    values_dtype = np.float64 if var_dtype is None else np.dtype(var_dtype)
+    values_weights = np.arange(values_src.shape[0], dtype=values_dtype)[:, np.newaxis, np.newaxis]
+    values_cum = np.multiply(values_src, values_weights, dtype=values_dtype)
 
-        values_avg = values_src[i, :, :]
+    values_ist = np.empty(shape=values_src.shape, dtype=values_src.dtype)
+    values_ist[0, :, :] = values_cum[0, :, :]
+    np.subtract(values_cum[1:, :, :], values_cum[:-1, :, :], out=values_ist[1:, :, :], casting='same_kind')
+    np.maximum(values_ist, 0.0, out=values_ist)
 
-        values_ist = i * values_avg - values_sum
-        values_sum = values_sum + values_ist
-
-        values_ist[values_ist < 0.0] = 0.0
-
-        var_dframe.values[i, :, :] = values_ist
+    # keep undefined values undefined in the following steps (as the running sum does)
+    cell_nan = np.isnan(values_cum.sum(axis=0))
+    if cell_nan.any():
+        values_nan = np.logical_or.accumulate(np.isnan(values_cum[:, cell_nan]), axis=0)
+        values_ist[:, cell_nan] = np.where(values_nan, np.nan, values_ist[:, cell_nan])
 
     # apply scale factor
-    var_dframe.values = var_dframe.values * var_scale_factor
+    values_ist *= var_scale_factor
+    var_dframe.values = values_ist
 
     # apply units definition
     var_attrs['units'] = 'W m-2'
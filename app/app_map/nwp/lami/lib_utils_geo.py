@@ -10,20 +10,22 @@ Version:       '1.0.0'
 # ----------------------------------------------------------------------------------------------------------------------
 # libraries
 import logging
+import hashlib
+import os
 import numpy as np
 import pandas as pd
-import pyresample
 
 from copy import deepcopy
-from repurpose.resample import resample_to_grid
 
 from lib_info_args import logger_name
+from lib_data_io_pickle import read_file_obj, write_file_obj
 
 # set logger obj
 alg_logger = logging.getLogger(logger_name)
 
-# debugging
-import matplotlib.pyplot as plt
+# resample index collections (shared by variables and time steps of the same run)
+resample_index_collections = {}
+
 # ----------------------------------------------------------------------------------------------------------------------
 
 
@@ -51,6 +53,9 @@ def convert_grid_to_swath(var_data_grid,
                           var_geo_x_grid, var_geo_y_grid, var_geo_x_swath, var_geo_y_swath,
                           search_rad=50000, neighbours=1):
 
+    # import optional backend at first use
+    import pyresample
+
     # define geometry definition(s)
     grid_obj = pyresample.geometry.GridDefinition(lons=var_geo_x_grid, lats=np.flipud(var_geo_y_grid))
     swath_obj = pyresample.geometry.SwathDefinition(lons=var_geo_x_swath, lats=var_geo_y_swath)
@@ -77,6 +82,10 @@ def resample_grid_to_points(obj_map, obj_cell, geo_mask, geo_x_2d, geo_y_2d,
                             search_rad=50000, fill_values=np.nan, min_neighbours=1, neighbours=1,
                             debug=True):
 
+    # import optional backend at first use
+    import pyresample
+    from repurpose.resample import resample_to_grid
+
     # check object
     obj_mask = {}
     if obj_cell is not None:
@@ -231,6 +240,9 @@ def resample_points_to_grid(var_data_in_1d, var_geox_1d_in, var_geoy_1d_in,
                             search_rad=50000, fill_values=np.nan,
                             min_neighbours=1, neighbours=4, **kwargs):
 
+    # import optional backend at first use
+    from repurpose.resample import resample_to_grid
+
     var_geox_2d_out, var_geoy_2d_out = np.meshgrid(np.unique(var_geox_1d_out), np.unique(var_geoy_1d_out))
 
     # search_rad = 50000; min_neighbours = 2; neighbours = 4
@@ -247,3 +259,68 @@ def resample_points_to_grid(var_data_in_1d, var_geox_1d_in, var_geoy_1d_in,
     return var_data_out, var_geox_2d_out, var_geoy_2d_out
 # ----------------------------------------------------------------------------------------------------------------------
 
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to define resample index key (based on geographical arrays and resample settings)
+def define_resample_index_key(var_geox_in, var_geoy_in, var_geox_out, var_geoy_out,
+                              search_rad=50000, min_neighbours=1, neighbours=4, method='nn', fill_values=np.nan,
+                              **kwargs):
+
+    hash_obj = hashlib.sha256()
+    for var_geo in [var_geox_in, var_geoy_in, var_geox_out, var_geoy_out]:
+        var_geo = np.ascontiguousarray(var_geo, dtype=np.float64)
+        hash_obj.update(str(var_geo.shape).encode('utf-8'))
+        hash_obj.update(var_geo.tobytes())
+    hash_obj.update(str([search_rad, min_neighbours, neighbours, method, fill_values]).encode('utf-8'))
+
+    return hash_obj.hexdigest()
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to get resample index (from memory, from file or computing it)
+def get_resample_index(var_geox_in, var_geoy_in, var_geox_out, var_geoy_out,
+                       folder_name=None, file_name_tmpl='resample_index_{:}.workspace', **kwargs):
+
+    # define index key
+    index_key = define_resample_index_key(var_geox_in, var_geoy_in, var_geox_out, var_geoy_out, **kwargs)
+
+    # check index in memory
+    if index_key in resample_index_collections:
+        return resample_index_collections[index_key]
+
+    # check index in file
+    file_path = None
+    if folder_name is not None:
+        file_path = os.path.join(folder_name, file_name_tmpl.format(index_key))
+
+    index_1d = None
+    if file_path is not None and os.path.exists(file_path):
+        index_obj = read_file_obj(file_path)
+        if isinstance(index_obj, dict) and index_obj.get('key', None) == index_key:
+            alg_logger.info(' ------> Get resample index from file "' + file_path + '" ... DONE')
+            index_1d = index_obj['index']
+        else:
+            alg_logger.warning(' ===> Resample index file "' + file_path + '" is not valid. Index will be recomputed')
+
+    # compute index (if needed)
+    if index_1d is None:
+
+        index_1d_in = np.arange(0, var_geoy_in.shape[0] * var_geox_in.shape[1])
+        index_2d_in = np.reshape(index_1d_in, [var_geoy_in.shape[0], var_geox_in.shape[1]])
+
+        index_2d_out, _, _ = resample_points_to_grid(
+            index_2d_in, var_geox_in, var_geoy_in, var_geox_out, var_geoy_out, **kwargs)
+        index_1d = np.asarray(index_2d_out.ravel(), dtype=int)
+
+        if file_path is not None:
+            os.makedirs(folder_name, exist_ok=True)
+            write_file_obj(file_path, {'key': index_key, 'index': index_1d})
+            alg_logger.info(' ------> Save resample index to file "' + file_path + '" ... DONE')
+
+    # store index in memory
+    resample_index_collections[index_key] = index_1d
+
+    return index_1d
+# ----------------------------------------------------------------------------------------------------------------------
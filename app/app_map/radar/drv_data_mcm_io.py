@@ -23,7 +23,7 @@ from lib_mcm_conventions import conventions_vars
 from lib_mcm_io_generic import write_obj, read_obj, convert_values2da, create_dset, write_dset, read_file_tiff
 from lib_mcm_generic import make_folder, fill_tags2string, list_folder, get_root_path
 
-from lib_mcm_analysis_interpolation_grid import interp_grid2index
+from lib_mcm_analysis_interpolation_grid import interp_grid2index, define_grid2index_key
 
 from lib_mcm_io_gzip import zip_filename, unzip_filename
 
@@ -213,16 +213,28 @@ class DriverData:
 
         file_path_grid = self.file_path_grid
 
-        if not os.path.exists(file_path_grid):
-            ref_geo_x = self.geo_collections[self.tag_coord_geo_x].values
-            ref_geo_y = self.geo_collections[self.tag_coord_geo_y].values
+        ref_geo_x = self.geo_collections[self.tag_coord_geo_x].values
+        ref_geo_y = self.geo_collections[self.tag_coord_geo_y].values
 
-            data_geo_x = data_collections[self.tag_coord_geo_x].values
-            data_geo_y = data_collections[self.tag_coord_geo_y].values
+        data_geo_x = data_collections[self.tag_coord_geo_x].values
+        data_geo_y = data_collections[self.tag_coord_geo_y].values
+
+        # key of the source and reference grids (the index is rebuilt if the grids are changed)
+        data_geo_key = define_grid2index_key(data_geo_x, data_geo_y, ref_geo_x, ref_geo_y)
+
+        index_collections = None
+        if os.path.exists(file_path_grid):
+            index_collections = read_obj(file_path_grid)
+            if index_collections.get('geo_key', None) != data_geo_key:
+                logging.warning(' ===> Grid index ' + file_path_grid +
+                                ' does not match the source and reference grids. The index will be rebuilt')
+                index_collections = None
+
+        if index_collections is None:
 
             data_geo_index = interp_grid2index(data_geo_x, data_geo_y, ref_geo_x, ref_geo_y)
 
-            index_collections = {'geo_index': data_geo_index}
+            index_collections = {'geo_index': data_geo_index, 'geo_key': data_geo_key}
 
             folder_name, file_name = os.path.split(file_path_grid)
             make_folder(folder_name)
@@ -230,7 +242,6 @@ class DriverData:
 
         else:
 
-            index_collections = read_obj(file_path_grid)
             data_geo_index = index_collections['geo_index']
 
         return data_geo_index
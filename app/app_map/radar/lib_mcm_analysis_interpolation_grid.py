@@ -1,8 +1,10 @@
 # -------------------------------------------------------------------------------------
 # Library
 import logging
+import hashlib
 import numpy as np
 from scipy.interpolate import griddata
+from scipy.spatial import cKDTree
 # -------------------------------------------------------------------------------------
 
 
@@ -31,15 +33,34 @@ def interp_grid2index(lons_in, lats_in, lons_out, lats_out, nodata=-9999, interp
         logging.error(' ===> Geographical datasets output dimensions in bed format')
         raise IOError('Geographical data format not allowed')
 
-    index_in = np.arange(0, shape_in)
-    index_out = griddata((lons_in_2d.ravel(), lats_in_2d.ravel()), index_in,
-                         (lons_out_2d.ravel(), lats_out_2d.ravel()), method=interp_method, fill_value=nodata)
+    if interp_method == 'nearest':
+        # nearest neighbour index by kd-tree (same selection of griddata 'nearest' without the interpolator)
+        geo_tree = cKDTree(np.column_stack((lons_in_2d.ravel(), lats_in_2d.ravel())))
+        _, index_out = geo_tree.query(np.column_stack((lons_out_2d.ravel(), lats_out_2d.ravel())), k=1)
+    else:
+        index_in = np.arange(0, shape_in)
+        index_out = griddata((lons_in_2d.ravel(), lats_in_2d.ravel()), index_in,
+                             (lons_out_2d.ravel(), lats_out_2d.ravel()), method=interp_method, fill_value=nodata)
 
     return index_out
 
 # -------------------------------------------------------------------------------------
 
 
+# -------------------------------------------------------------------------------------
+# Method to define the key of a grid index (from the input and output grid geometry)
+def define_grid2index_key(lons_in, lats_in, lons_out, lats_out, interp_method='nearest'):
+
+    key_hash = hashlib.sha256(interp_method.encode())
+    for geo_values in [lons_in, lats_in, lons_out, lats_out]:
+        geo_values = np.ascontiguousarray(geo_values, dtype=np.float64)
+        key_hash.update(str(geo_values.shape).encode())
+        key_hash.update(geo_values.tobytes())
+
+    return key_hash.hexdigest()
+# -------------------------------------------------------------------------------------
+
+
 # -------------------------------------------------------------------------------------
 # Method to interpolate grid data to a reference dataset
 def interp_grid2map(lons_in, lats_in, values_in, lons_out, lats_out, nodata=-9999, interp_method='nearest',
@@ -50,7 +71,7 @@ def interp_grid2map(lons_in, lats_in, values_in, lons_out, lats_out, nodata=-999
                               (lons_out, lats_out), method=interp_method,
                               fill_value=nodata)
     else:
-        values_tmp = values_in.ravel()[index_out]
+        values_tmp = np.take(values_in.ravel(), index_out)
         values_out = np.reshape(values_tmp, [lons_out.shape[0], lats_out.shape[1]])
 
     return values_out
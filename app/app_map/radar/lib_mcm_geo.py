@@ -2,8 +2,6 @@
 # Library
 import logging
 import numpy as np
-import rasterio
-import rasterio.crs
 import os
 
 from lib_mcm_io_generic import create_darray_2d
@@ -36,6 +34,10 @@ def read_file_raster(file_name, file_proj='epsg:4326', var_name='land',
                      coord_name_x='west_east', coord_name_y='south_north',
                      dim_name_x='west_east', dim_name_y='south_north'):
 
+    # Import optional backend at first use
+    import rasterio
+    import rasterio.crs
+
     if os.path.exists(file_name):
         if file_name.endswith('.txt') or file_name.endswith('.asc'):
 
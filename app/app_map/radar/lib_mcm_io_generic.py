@@ -14,7 +14,6 @@ import os
 import re
 import json
 import pickle
-import rasterio
 
 import pandas as pd
 import numpy as np
@@ -22,7 +21,6 @@ import xarray as xr
 
 from copy import deepcopy
 
-import matplotlib.pylab as plt
 #######################################################################################
 
 # -------------------------------------------------------------------------------------
@@ -47,6 +45,9 @@ def read_file_tiff(file_name, var_name='variable', var_nodata=-9999.0,
                    coord_name_x='west_east', coord_name_y='south_north',
                    dim_name_x='west_east', dim_name_y='south_north'):
 
+    # Import optional backend at first use
+    import rasterio
+
     with rasterio.open(file_name) as dset_in:
         meta = dset_in.profile
         bounds = dset_in.bounds
@@ -115,6 +116,9 @@ def read_file_hdf4(file_name, var_name='variable', var_sep=':',
                    coord_name_x='west_east', coord_name_y='south_north',
                    dim_name_x='west_east', dim_name_y='south_north'):
 
+    # Import optional backend at first use
+    import rasterio
+
     dset_bands = None
     with rasterio.open(file_name) as dset:
 
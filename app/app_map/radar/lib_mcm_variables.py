@@ -15,7 +15,6 @@ import numpy as np
 from lib_mcm_analysis_interpolation_grid import interp_grid2map
 
 # Debug
-import matplotlib.pylab as plt
 logging.getLogger('matplotlib').setLevel(logging.WARNING)
 #######################################################################################
 
@@ -38,27 +37,34 @@ def compute_rain(var_data, var_geo_x, var_geo_y,
         logging.error(' ===> Variable dimensions are not allowed')
         raise IOError('Variable data format must be equal to 2')
 
-    if ref_geo_x.ndim == 1 and ref_geo_y.ndim == 1:
-        ref_grid_geo_x, ref_grid_geo_y = np.meshgrid(ref_geo_x, ref_geo_y)
-    elif ref_geo_x.ndim == 2 and ref_geo_y.ndim == 2:
-        ref_grid_geo_x = ref_geo_x
-        ref_grid_geo_y = ref_geo_y
-    else:
-        logging.error(' ===> Reference dimensions in bed format')
-        raise IOError('Geographical data format not allowed')
-
-    if var_geo_x.ndim == 1 and var_geo_y.ndim == 1:
-        var_grid_geo_x, var_grid_geo_y = np.meshgrid(var_geo_x, var_geo_y)
-    elif var_geo_x.ndim == 2 and var_geo_y.ndim == 2:
-        var_grid_geo_x = var_geo_x
-        var_grid_geo_y = var_geo_y
+    if ref_geo_index is not None:
+
+        # Apply the grid index to map (no interpolation needed)
+        grid_data = np.take(var_data.ravel(), ref_geo_index).reshape(ref_geo_z.shape)
+
     else:
-        logging.error(' ===> Variable dimensions in bed format')
-        raise IOError('Variable data format not allowed')
 
-    # Interpolate grid data to map
-    grid_data = interp_grid2map(var_grid_geo_x, var_grid_geo_y, var_data, ref_grid_geo_x, ref_grid_geo_y,
-                                nodata=fx_nodata, interp_method=fx_interp_method, index_out=ref_geo_index)
+        if ref_geo_x.ndim == 1 and ref_geo_y.ndim == 1:
+            ref_grid_geo_x, ref_grid_geo_y = np.meshgrid(ref_geo_x, ref_geo_y)
+        elif ref_geo_x.ndim == 2 and ref_geo_y.ndim == 2:
+            ref_grid_geo_x = ref_geo_x
+            ref_grid_geo_y = ref_geo_y
+        else:
+            logging.error(' ===> Reference dimensions in bed format')
+            raise IOError('Geographical data format not allowed')
+
+        if var_geo_x.ndim == 1 and var_geo_y.ndim == 1:
+            var_grid_geo_x, var_grid_geo_y = np.meshgrid(var_geo_x, var_geo_y)
+        elif var_geo_x.ndim == 2 and var_geo_y.ndim == 2:
+            var_grid_geo_x = var_geo_x
+            var_grid_geo_y = var_geo_y
+        else:
+            logging.error(' ===> Variable dimensions in bed format')
+            raise IOError('Variable data format not allowed')
+
+        # Interpolate grid data to map
+        grid_data = interp_grid2map(var_grid_geo_x, var_grid_geo_y, var_data, ref_grid_geo_x, ref_grid_geo_y,
+                                    nodata=fx_nodata, interp_method=fx_interp_method)
 
     # Filter data nan and over domain
     grid_data[np.isnan(grid_data)] = var_missing_value
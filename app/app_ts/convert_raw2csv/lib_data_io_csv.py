@@ -48,117 +48,66 @@ def wrap_datasets_csv(file_path_template,
         log_stream.error(' ===> Time frequency "' + time_frequency + '" is not expected')
         raise NotImplementedError('Case not implemented yet')
 
-    # iterate over registry fields
-    section_data_collections = {}
-    for registry_row in registry_fields.iterrows():
-
-        # get point information
-        registry_code = registry_row[1]['code']
-        registry_tag, registry_name = registry_row[1]['tag'], registry_row[1]['name']
-
-        # info point start
-        log_stream.info(' ------> Point (1) Code "' + registry_code + '" (2) Tag "' + registry_tag + '" ... ')
-
-        # iterate over times
-        point_values_collections, point_time_collections = None, None
-        for time_step_start, time_step_end, time_step_reference in zip(
-                time_range_start, time_range_end, time_range_reference):
-
-            # info time period start
-            log_stream.info(' -------> Time Reference :: "' + str(time_step_reference) +
-                            '" -- Period "' + str(time_step_start) + '" :: "' + str(time_step_end) + '" ... ')
-
-            # fill time tags
-            template_time_values = fill_tags_time(
-                template_time_tags,
-                time_reference=time_step_reference, time_start=time_step_start, time_end=time_step_end)
-            template_datasets_values = {'point_name': registry_code}
+    # get registry information
+    registry_code_list = [str(registry_code) for registry_code in registry_fields['code'].values]
+    registry_tag_list = [str(registry_tag) for registry_tag in registry_fields['tag'].values]
+    registry_name_list = [str(registry_name) for registry_name in registry_fields['name'].values]
+
+    # iterate over times (each file is parsed once and shared by all the registry points)
+    point_values_collections = [None] * len(registry_code_list)
+    point_time_collections = [None] * len(registry_code_list)
+    for time_step_start, time_step_end, time_step_reference in zip(
+            time_range_start, time_range_end, time_range_reference):
+
+        # info time period start
+        log_stream.info(' -------> Time Reference :: "' + str(time_step_reference) +
+                        '" -- Period "' + str(time_step_start) + '" :: "' + str(time_step_end) + '" ... ')
+
+        # fill time tags
+        template_time_values = fill_tags_time(
+            template_time_tags,
+            time_reference=time_step_reference, time_start=time_step_start, time_end=time_step_end)
+        template_generic_tags = {**template_time_tags, **template_datasets_tags}
+
+        # group registry points by file path (the path could depend on the point name)
+        file_path_groups = {}
+        for registry_id, registry_code in enumerate(registry_code_list):
 
             # create template tags and values
-            template_generic_tags = {**template_time_tags, **template_datasets_tags}
+            template_datasets_values = {'point_name': registry_code}
             template_generic_values = {**template_time_values, **template_datasets_values}
 
             # define file path
             file_path_defined = fill_tags2string(
                 file_path_template, tags_format=template_generic_tags, tags_filling=template_generic_values)[0]
 
+            if file_path_defined not in list(file_path_groups.keys()):
+                file_path_groups[file_path_defined] = []
+            file_path_groups[file_path_defined].append(registry_id)
+
+        # iterate over file path(s)
+        for file_path_defined, registry_id_list in file_path_groups.items():
+
             # check file availability
             if os.path.exists(file_path_defined):
 
                 # get file fields
-                try:
-                    fields_data_raw = pd.read_csv(
-                        file_path_defined, sep=file_sep, decimal=file_decimal, date_format=time_format)
-                except Exception as exc:
-                    log_stream.warning(' ===> Library exception: ' + str(exc) + '. Try to use "date parser"')
-                    fields_data_raw = pd.read_csv(
-                        file_path_defined, sep=file_sep, decimal=file_decimal, date_parser=time_format)
-
-                fields_data_raw.columns = fields_data_raw.columns.str.strip()
-
-                # map file fields
-                fields_data_map = map_vars_dframe(fields_data_raw, file_fields)
-
-                # parse time field
-                if 'time' in list(fields_data_map.columns):
-                    time_data_raw = fields_data_map['time'].values
-
-                    if time_data_raw.shape[0] == 0:
-                        log_stream.error(' ===> Field "time" is defined in the file, but it is empty')
-                        raise RuntimeError('Check your settings file and set the "time" field')
-                    else:
-                        time_n = time_data_raw.shape[0]
-
-                    time_stamp_raw = pd.Timestamp(time_data_raw[0]).strftime(time_format)
-                    time_data_arr = [time_stamp_raw] * time_n
-                    time_data_index = pd.DatetimeIndex(time_data_arr)
-
-                    fields_data_map['time'] = time_data_index
-                    fields_data_map.set_index('time', inplace=True)
-                    fields_data_map.index.name = 'time'
-                else:
-                    log_stream.error(' ===> Field "time" is not defined in the file, but it is expected')
-                    raise RuntimeError('Check your settings file and set the "time" field')
-
-                # get point time and value
-                if 'name' in list(fields_data_map.columns):
-
-                    name_data_obj = fields_data_map['name']
-                    name_data_obj = name_data_obj.str.strip()
-                    name_data_obj = name_data_obj.str.lower()
-                    name_data_arr = name_data_obj.values
-                    name_data_reg = registry_name.strip().lower()
+                fields_data_map = read_datasets_csv(
+                    file_path_defined, file_fields, time_format=time_format,
+                    file_sep=file_sep, file_decimal=file_decimal)
 
-                    idx_data_obj = np.argwhere(name_data_arr == name_data_reg)
-
-                    if idx_data_obj.shape[0] == 1:
-
-                        idx_data_step = idx_data_obj[0][0]
-
-                        point_time_step = fields_data_map.index[idx_data_step]
-                        point_data_step = fields_data_map.iloc[idx_data_step]
-
-                        if 'values' in list(point_data_step.keys()):
-                            point_value_step = point_data_step['values']
-                            point_value_step = float(point_value_step)
-                        else:
-                            log_stream.error(' ===> Field "values" is not defined in the file, but it is expected')
-                            raise RuntimeError('Check your settings file and set the "values" field')
-                    else:
-                        log_stream.warning(' ===> Point "' + registry_name + '" is not available in the file')
-                        point_value_step = np.nan
-                        point_time_step = time_step_reference
-
-                else:
-                    log_stream.error(' ===> Field "name" is not defined in the file, but it is expected')
-                    raise RuntimeError('Check your settings file and set the "name" field')
+                # select registry points in the file
+                point_time_list, point_value_list = select_datasets_csv(
+                    fields_data_map, [registry_name_list[registry_id] for registry_id in registry_id_list],
+                    time_default=time_step_reference)
 
                 # manage data collections
-                if point_values_collections is None:
-                    point_values_collections, point_time_collections = [], []
-
-                point_values_collections.append(point_value_step)
-                point_time_collections.append(point_time_step)
+                for registry_id, point_time_step, point_value_step in zip(
+                        registry_id_list, point_time_list, point_value_list):
+                    if point_values_collections[registry_id] is None:
+                        point_values_collections[registry_id], point_time_collections[registry_id] = [], []
+                    point_values_collections[registry_id].append(point_value_step)
+                    point_time_collections[registry_id].append(point_time_step)
 
                 # info time period end
                 log_stream.info(' -------> Time Reference :: "' + str(time_step_reference) +
@@ -171,9 +120,17 @@ def wrap_datasets_csv(file_path_template,
                                 '" -- Period "' + str(time_step_start) + '" :: "' + str(time_step_end) +
                                 '" ... SKIPPED. File "' + file_path_defined + '" does not exists.')
 
+    # iterate over registry points
+    section_data_collections = {}
+    for registry_id, (registry_code, registry_tag) in enumerate(zip(registry_code_list, registry_tag_list)):
+
+        # info point start
+        log_stream.info(' ------> Point (1) Code "' + registry_code + '" (2) Tag "' + registry_tag + '" ... ')
+
         # store point data to common workspace
-        if point_values_collections is not None:
-            point_series = pd.Series(point_values_collections, index=point_time_collections)
+        point_values_step, point_time_step = point_values_collections[registry_id], point_time_collections[registry_id]
+        if point_values_step is not None:
+            point_series = pd.Series(point_values_step, index=point_time_step)
 
             # sort index
             if sort_index:
@@ -194,6 +151,99 @@ def wrap_datasets_csv(file_path_template,
 # ----------------------------------------------------------------------------------------------------------------------
 
 
+# ----------------------------------------------------------------------------------------------------------------------
+# method to select registry points from datasets
+def select_datasets_csv(fields_data_map, registry_names, time_default=None):
+
+    # get point name
+    if 'name' in list(fields_data_map.columns):
+
+        name_data_obj = fields_data_map['name']
+        name_data_obj = name_data_obj.str.strip()
+        name_data_obj = name_data_obj.str.lower()
+        name_data_arr = name_data_obj.values
+        name_data_reg = [registry_name.strip().lower() for registry_name in registry_names]
+
+        # select names defined once in the file (duplicated names are not selected)
+        name_data_unique = pd.Series(np.arange(name_data_arr.shape[0]), index=name_data_arr)
+        name_data_unique = name_data_unique[~name_data_unique.index.duplicated(keep=False)]
+        idx_data_reg = name_data_unique.reindex(name_data_reg).values
+
+    else:
+        log_stream.error(' ===> Field "name" is not defined in the file, but it is expected')
+        raise RuntimeError('Check your settings file and set the "name" field')
+
+    # get point time and value
+    idx_data_finite = np.isfinite(idx_data_reg)
+    if np.any(idx_data_finite):
+        if 'values' in list(fields_data_map.columns):
+            values_data_arr = fields_data_map['values'].values
+        else:
+            log_stream.error(' ===> Field "values" is not defined in the file, but it is expected')
+            raise RuntimeError('Check your settings file and set the "values" field')
+    else:
+        values_data_arr = None
+
+    point_time_list, point_value_list = [], []
+    for registry_name, idx_data_step in zip(registry_names, idx_data_reg):
+        if np.isfinite(idx_data_step):
+            idx_data_step = int(idx_data_step)
+            point_time_step = fields_data_map.index[idx_data_step]
+            point_value_step = float(values_data_arr[idx_data_step])
+        else:
+            log_stream.warning(' ===> Point "' + registry_name + '" is not available in the file')
+            point_value_step = np.nan
+            point_time_step = time_default
+
+        point_time_list.append(point_time_step)
+        point_value_list.append(point_value_step)
+
+    return point_time_list, point_value_list
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to read datasets in csv format
+def read_datasets_csv(file_name, file_fields, time_format='%Y%m%d%H%M', file_sep=' ', file_decimal='.'):
+
+    # get file fields
+    try:
+        fields_data_raw = pd.read_csv(
+            file_name, sep=file_sep, decimal=file_decimal, date_format=time_format)
+    except Exception as exc:
+        log_stream.warning(' ===> Library exception: ' + str(exc) + '. Try to use "date parser"')
+        fields_data_raw = pd.read_csv(
+            file_name, sep=file_sep, decimal=file_decimal, date_parser=time_format)
+    fields_data_raw.columns = fields_data_raw.columns.str.strip()
+
+    # map file fields
+    fields_data_map = map_vars_dframe(fields_data_raw, file_fields)
+
+    # parse time field
+    if 'time' in list(fields_data_map.columns):
+        time_data_raw = fields_data_map['time'].values
+
+        if time_data_raw.shape[0] == 0:
+            log_stream.error(' ===> Field "time" is defined in the file, but it is empty')
+            raise RuntimeError('Check your settings file and set the "time" field')
+        else:
+            time_n = time_data_raw.shape[0]
+
+        time_stamp_raw = pd.Timestamp(time_data_raw[0]).strftime(time_format)
+        time_data_arr = [time_stamp_raw] * time_n
+        time_data_index = pd.DatetimeIndex(time_data_arr)
+
+        fields_data_map['time'] = time_data_index
+        fields_data_map.set_index('time', inplace=True)
+        fields_data_map.index.name = 'time'
+    else:
+        log_stream.error(' ===> Field "time" is not defined in the file, but it is expected')
+        raise RuntimeError('Check your settings file and set the "time" field')
+
+    return fields_data_map
+# ----------------------------------------------------------------------------------------------------------------------
+
+
 # ----------------------------------------------------------------------------------------------------------------------
 # method to wrap registry in csv format
 def wrap_registry_csv(file_name, file_fields, file_filters=None, file_sep=',', file_decimal='.'):
@@ -8,6 +8,8 @@ __library__ = 'hyde'
 
 General command line:
 python app_point_joint_ts.py -settings_file configuration.json -time "YYYY-MM-DD HH:MM"
+python app_point_joint_ts.py -settings_file configuration.json -time "YYYY-MM-DD HH:MM" "YYYY-MM-DD HH:MM" ...
+python app_point_joint_ts.py -settings_file configuration.json -time_start "YYYY-MM-DD HH:MM" -time_end "YYYY-MM-DD HH:MM"
 
 Version(s):
 20241023 (1.0.0) --> Beta release
@@ -18,6 +20,9 @@ Version(s):
 import logging
 import time
 import os
+import traceback
+import multiprocessing as mp
+import pandas as pd
 from argparse import ArgumentParser
 
 from lib_data_io_json import read_file_json
@@ -41,6 +46,8 @@ alg_name = 'Application for joining time-series'
 alg_type = 'Package'
 alg_version = '1.0.0'
 alg_release = '2024-10-23'
+# algorithm workspace shared (read-only) with the forked worker(s)
+alg_workspace = {}
 # ----------------------------------------------------------------------------------------------------------------------
 
 
@@ -50,7 +57,7 @@ def main():
 
     # ------------------------------------------------------------------------------------------------------------------
     # get algorithm settings
-    alg_settings, alg_time = get_args()
+    alg_settings, alg_time, alg_time_start, alg_time_end, alg_time_frequency = get_args()
 
     # set algorithm settings
     data_settings = read_file_json(alg_settings)
@@ -73,17 +80,13 @@ def main():
     # ------------------------------------------------------------------------------------------------------------------
 
     # ------------------------------------------------------------------------------------------------------------------
-    # Organize time run
-    time_reference, time_range = set_time(
-        time_ref_args=alg_time,
-        time_ref_file=data_settings['time']['algorithm']['time_reference'],
-        time_ref_file_start=data_settings['time']['algorithm']['time_start'],
-        time_ref_file_end=data_settings['time']['algorithm']['time_end'],
-        time_format=time_format_algorithm,
-        time_period=data_settings['time']['algorithm']['time_period'],
-        time_frequency=data_settings['time']['algorithm']['time_frequency'],
-        time_rounding=data_settings['time']['algorithm']['time_rounding']
-    )
+    # Organize time run(s) (one or more periods processed with the same static datasets)
+    batch_settings = {}
+    if 'batch' in list(data_settings['time'].keys()):
+        batch_settings = data_settings['time']['batch']
+    time_runs = define_time_runs(
+        alg_time=alg_time, alg_time_start=alg_time_start, alg_time_end=alg_time_end,
+        alg_time_frequency=alg_time_frequency, batch_settings=batch_settings)
     # ------------------------------------------------------------------------------------------------------------------
 
     # ------------------------------------------------------------------------------------------------------------------
@@ -94,6 +97,71 @@ def main():
     )
     # method to organize data
     static_collections = driver_data_static.organize_data()
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # iterate over time run(s)
+    alg_workers = get_workers(batch_settings)
+    if alg_workers > 1 and time_runs.__len__() > 1:
+
+        # set workspace shared by the forked worker(s) (static collections are loaded once)
+        alg_workspace['data_settings'] = data_settings
+        alg_workspace['static_collections'] = static_collections
+
+        log_stream.info(' ---> Process time runs in parallel mode [workers: ' + str(alg_workers) + '] ... ')
+        alg_context = mp.get_context('fork')
+        with alg_context.Pool(processes=min(alg_workers, time_runs.__len__()),
+                              initializer=init_time_run_worker) as alg_pool:
+            time_failed = []
+            for time_run, time_status, time_records in alg_pool.imap(exec_time_run_worker, time_runs):
+                # replay worker log record(s) in time run order
+                for time_record in time_records:
+                    logging.getLogger(time_record.name).handle(time_record)
+                if not time_status:
+                    time_failed.append(str(time_run))
+
+        if time_failed:
+            log_stream.warning(' ===> Time run(s) failed: ' + ', '.join(time_failed))
+            log_stream.info(' ---> Process time runs in parallel mode [workers: ' + str(alg_workers) +
+                            '] ... FAILED for ' + str(time_failed.__len__()) + ' time run(s)')
+        else:
+            log_stream.info(' ---> Process time runs in parallel mode [workers: ' + str(alg_workers) + '] ... DONE')
+
+    else:
+        for time_run in time_runs:
+            exec_time_run(time_run, static_collections, data_settings)
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Info algorithm
+    time_elapsed = round(time.time() - start_time, 1)
+
+    log_stream.info(' ')
+    log_stream.info(' ==> ' + alg_name + ' (Version: ' + alg_version + ' Release_Date: ' + alg_release + ')')
+    log_stream.info(' ==> TIME ELAPSED: ' + str(time_elapsed) + ' seconds')
+    log_stream.info(' ==> ... END')
+    log_stream.info(' ==> Bye, Bye')
+    log_stream.info(' ============================================================================ ')
+    # -------------------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# Method to process a time run
+def exec_time_run(time_run, static_collections, data_settings):
+
+    # organize time run
+    time_reference, time_range = set_time(
+        time_ref_args=time_run,
+        time_ref_file=data_settings['time']['algorithm']['time_reference'],
+        time_ref_file_start=data_settings['time']['algorithm']['time_start'],
+        time_ref_file_end=data_settings['time']['algorithm']['time_end'],
+        time_format=time_format_algorithm,
+        time_period=data_settings['time']['algorithm']['time_period'],
+        time_frequency=data_settings['time']['algorithm']['time_frequency'],
+        time_rounding=data_settings['time']['algorithm']['time_rounding']
+    )
 
     # initialize data dynamic obj
     driver_data_dynamic = DriverData_Dynamic(
@@ -110,21 +178,113 @@ def main():
     dynamic_collections = driver_data_dynamic.organize_data()
     # method to dump data
     driver_data_dynamic.dump_data(dynamic_collections)
-    # ------------------------------------------------------------------------------------------------------------------
 
-    # -------------------------------------------------------------------------------------
-    # Info algorithm
-    time_elapsed = round(time.time() - start_time, 1)
+# ----------------------------------------------------------------------------------------------------------------------
 
-    log_stream.info(' ')
-    log_stream.info(' ==> ' + alg_name + ' (Version: ' + alg_version + ' Release_Date: ' + alg_release + ')')
-    log_stream.info(' ==> TIME ELAPSED: ' + str(time_elapsed) + ' seconds')
-    log_stream.info(' ==> ... END')
-    log_stream.info(' ==> Bye, Bye')
-    log_stream.info(' ============================================================================ ')
-    # -------------------------------------------------------------------------------------
 
-# -------------------------------------------------------------------------------------
+# ----------------------------------------------------------------------------------------------------------------------
+# Class to collect log record(s) in the worker process
+class RecordHandler(logging.Handler):
+
+    def __init__(self):
+        super(RecordHandler, self).__init__(level=logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        # format message and traceback to make the record picklable
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        self.records.append(record)
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# Method to initialize the worker process (log records are sent back to the main process)
+def init_time_run_worker():
+
+    logger_root = logging.getLogger('')
+    for logger_handle in list(logger_root.handlers):
+        logger_root.removeHandler(logger_handle)
+    alg_workspace['record_handler'] = RecordHandler()
+    logger_root.addHandler(alg_workspace['record_handler'])
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# Method to process a time run in the worker process (failures are isolated by time run)
+def exec_time_run_worker(time_run):
+
+    record_handler = alg_workspace['record_handler']
+    record_handler.records = []
+
+    try:
+        exec_time_run(time_run, alg_workspace['static_collections'], alg_workspace['data_settings'])
+        time_status = True
+    except Exception as exc:
+        log_stream.error(' ===> Time run "' + str(time_run) + '" failed: ' + str(exc))
+        log_stream.error(traceback.format_exc())
+        time_status = False
+
+    return time_run, time_status, record_handler.records
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# Method to get the number of worker(s)
+def get_workers(batch_settings):
+
+    alg_workers = 1
+    if 'workers' in list(batch_settings.keys()):
+        alg_workers = batch_settings['workers']
+    if alg_workers is None:
+        alg_workers = 1
+    elif alg_workers <= 0:
+        alg_workers = mp.cpu_count()
+
+    return int(alg_workers)
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# Method to define the time run(s) (arguments first, then batch settings; default is a single run)
+def define_time_runs(alg_time=None, alg_time_start=None, alg_time_end=None, alg_time_frequency=None,
+                     batch_settings=None, time_format='%Y-%m-%d %H:%M'):
+
+    if batch_settings is None:
+        batch_settings = {}
+
+    time_list = alg_time
+    time_start, time_end, time_frequency = alg_time_start, alg_time_end, alg_time_frequency
+    if not time_list and (time_start is None or time_end is None):
+        time_list = batch_settings.get('time_list', None)
+        time_start = batch_settings.get('time_start', None)
+        time_end = batch_settings.get('time_end', None)
+        if time_frequency is None:
+            time_frequency = batch_settings.get('time_frequency', None)
+    if time_frequency is None:
+        time_frequency = 'MS'
+
+    if time_list:
+        time_runs = list(time_list)
+    elif time_start is not None and time_end is not None:
+        time_runs = list(pd.date_range(start=time_start, end=time_end, freq=time_frequency).strftime(time_format))
+        if not time_runs:
+            log_stream.error(' ===> Time runs are not defined in the period "' +
+                             str(time_start) + '" - "' + str(time_end) + '"')
+            raise RuntimeError('Check the time start, time end and time frequency of the batch mode')
+    else:
+        time_runs = [None]
+
+    return time_runs
+
+# ----------------------------------------------------------------------------------------------------------------------
 
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -132,7 +292,10 @@ def main():
 def get_args():
     parser_handle = ArgumentParser()
     parser_handle.add_argument('-settings_file', action="store", dest="alg_settings")
-    parser_handle.add_argument('-time', action="store", dest="alg_time")
+    parser_handle.add_argument('-time', action="store", dest="alg_time", nargs='+')
+    parser_handle.add_argument('-time_start', action="store", dest="alg_time_start")
+    parser_handle.add_argument('-time_end', action="store", dest="alg_time_end")
+    parser_handle.add_argument('-time_frequency', action="store", dest="alg_time_frequency")
     parser_values = parser_handle.parse_args()
 
     alg_settings, alg_time = 'configuration.json', None
@@ -141,7 +304,8 @@ def get_args():
     if parser_values.alg_time:
         alg_time = parser_values.alg_time
 
-    return alg_settings, alg_time
+    return (alg_settings, alg_time,
+            parser_values.alg_time_start, parser_values.alg_time_end, parser_values.alg_time_frequency)
 
 # ----------------------------------------------------------------------------------------------------------------------
 
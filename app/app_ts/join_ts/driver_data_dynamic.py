@@ -13,11 +13,11 @@ import logging
 import warnings
 
 import os
-import numpy as np
 import pandas as pd
 from copy import deepcopy
 
-from lib_data_io_generic import organize_data_point, join_data_point, range_data_point, combine_data_point_by_time
+from lib_data_io_generic import organize_data_point, range_data_point, combine_data_point_by_time, \
+    collect_data_point, merge_data_point
 from lib_data_io_csv import read_file_csv, write_file_csv
 from lib_data_io_pickle import read_obj, write_obj
 
@@ -295,6 +295,7 @@ class DriverData:
 
             # iterate over time step(s)
             point_dynamic_collections, point_dynamic_workspace = None, None
+            point_dynamic_collector = None
             for time_step in time_obj:
 
                 # time start info
@@ -317,10 +318,8 @@ class DriverData:
                         point_dynamic_obj, point_dynamic_time = organize_data_point(
                             point_dynamic_dframe, ref_time=time_step, ref_registry=point_static_collections)
 
-                        # method to join data
-                        point_dynamic_collections = join_data_point(
-                            point_dynamic_obj, point_dynamic_collections,
-                            point_time=None, name_index='name')
+                        # method to collect data (joined once after the time loop)
+                        point_dynamic_collector = collect_data_point(point_dynamic_obj, point_dynamic_collector)
 
                     else:
                         # file not found (warning message)
@@ -328,7 +327,7 @@ class DriverData:
 
                 elif self.type_src == 'csv_1d':
 
-                    point_dynamic_db = None
+                    point_dynamic_list = []
                     for point_id, point_data in point_static_collections.iterrows():
 
                         point_name, point_tag = point_data['name'], point_data['tag']
@@ -354,10 +353,11 @@ class DriverData:
                         point_obj = dict(zip(point_times, point_values))
                         point_dframe = pd.DataFrame(data=point_obj, index=[point_tag])
 
-                        if point_dynamic_db is None:
-                            point_dynamic_db = deepcopy(point_dframe)
-                        else:
-                            point_dynamic_db = pd.concat([point_dynamic_db, point_dframe])
+                        point_dynamic_list.append(point_dframe)
+
+                    point_dynamic_db = None
+                    if point_dynamic_list:
+                        point_dynamic_db = pd.concat(point_dynamic_list)
 
                     if point_dynamic_workspace is None:
                         point_dynamic_workspace = {}
@@ -380,70 +380,30 @@ class DriverData:
             # check data according with type
             if self.type_src == 'csv_2d':
 
+                # method to merge data
+                point_dynamic_collections = merge_data_point(point_dynamic_collector)
+
                 # defined expected data and times
                 expected_time = list(time_obj)
                 expected_index = point_static_collections['tag'].values
-                default_values = np.zeros(shape=(expected_index.shape[0]))
-                default_values[:] = np.nan
 
                 # adapt dataframe to expected time range
-                for collections_name, collections_db in point_dynamic_collections.items():
-                    # remove nan(s)
-                    collections_db[np.isnan(collections_db)] = -9999.0
-                    # iterate over times
-                    expected_dframe = pd.DataFrame(index=expected_index)
-                    for time_step in expected_time:
-
-                        # time start info
-                        log_stream.info(' ------> Time "' + time_step.strftime(time_format_algorithm) + '" ... ')
-                        if time_step in pd.DatetimeIndex(collections_db.columns):
-
-                            if time_step.hour == 0:
-                                time_string = time_step.strftime('%Y-%m-%d')
-                            else:
-                                time_string = time_step.strftime('%Y-%m-%d %H:%M:00')
-
-                            time_check = [time_string, time_step,
-                                          time_step.strftime('%Y-%m-%d %H:%M:00'), time_step.strftime('%Y-%m-%d')]
-
-                            tmp_values = None
-                            for time_tmp in time_check:
-
-                                try:
-                                    tmp_values = collections_db[time_tmp]
-                                except BaseException as base_exp:
-                                    log_stream.warning(
-                                        ' ===> Warning in handling data ''"' +
-                                        str(base_exp) + '". This format in the dataframe causes '
-                                                        'an error for unknown reason')
-                                    tmp_values = None
-
-                                if tmp_values is not None:
-                                    break
-
-                            if tmp_values is None:
-                                log_stream.error(' ===> Error in handling data. Data is available '
-                                                 'but data format is not properly defined')
-                                raise RuntimeError('Check data format and try to add a case to manage it')
-
-                            expected_dframe[time_step] = tmp_values
-                        else:
-                            expected_dframe[time_step] = default_values
+                if point_dynamic_collections is not None:
+                    for collections_name, collections_db in point_dynamic_collections.items():
+                        # remove nan(s)
+                        collections_db = collections_db.fillna(-9999.0)
+                        collections_db.columns = pd.DatetimeIndex(collections_db.columns)
+                        # align data to the expected points and times (times not available are set to nan)
+                        expected_dframe = collections_db.reindex(
+                            index=expected_index, columns=expected_time).rename_axis(index=None)
 
-                        # time start end
-                        log_stream.info(' ------> Time "' + time_step.strftime(time_format_algorithm) + '" ... DONE')
-
-                    point_dynamic_collections[collections_name] = expected_dframe
+                        point_dynamic_collections[collections_name] = expected_dframe
 
             elif self.type_src == 'csv_1d':
 
                 if isinstance(point_dynamic_workspace, dict):
-                    merged_dynamic_collections = None
-                    for point_key, point_db in point_dynamic_workspace.items():
-                        if merged_dynamic_collections is None:
-                            merged_dynamic_collections = deepcopy(point_db)
-                        else:
-                            merged_dynamic_collections = merged_dynamic_collections.join(point_db)
+                    point_db_list = [point_db for point_db in point_dynamic_workspace.values() if point_db is not None]
+                    merged_dynamic_collections = pd.concat(point_db_list, axis=1).reindex(point_db_list[0].index)
                     ordered_dynamic_collections = merged_dynamic_collections.reindex(
                         sorted(merged_dynamic_collections.columns), axis=1)
 
@@ -174,6 +174,55 @@ def organize_data_point(point_dframe, ref_time=None, ref_registry=None):
 # ----------------------------------------------------------------------------------------------------------------------
 
 
+# ----------------------------------------------------------------------------------------------------------------------
+# method to collect data point (the dataframes are joined once by the merge_data_point method)
+def collect_data_point(point_data, point_workspace):
+
+    # collect point dataframes
+    if point_data is not None:
+        if point_workspace is None:
+            point_workspace = {}
+        for var_name, tmp_df in point_data.items():
+            if var_name not in list(point_workspace.keys()):
+                point_workspace[var_name] = []
+            point_workspace[var_name].append(tmp_df)
+    else:
+        log_stream.warning(' ===> No data available to join')
+
+    return point_workspace
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to merge data point (one concat and one sort for each variable)
+def merge_data_point(point_workspace, ascending_index=False, sort_index=True):
+
+    # check workspace availability
+    if point_workspace is None:
+        log_stream.warning(' ===> No data available to merge')
+        return None
+
+    # iterate over variable(s)
+    point_collection = {}
+    for var_name, var_list in point_workspace.items():
+
+        # join the collected dataframes (the index of the first dataframe is kept)
+        if var_list.__len__() == 1:
+            collection_df = var_list[0]
+        else:
+            collection_df = pd.concat(var_list, axis=1).reindex(var_list[0].index)
+
+            # sort index
+            if sort_index:
+                collection_df = collection_df.sort_index(ascending=ascending_index)
+
+        # store in the collection
+        point_collection[var_name] = collection_df
+
+    return point_collection
+# ----------------------------------------------------------------------------------------------------------------------
+
+
 # ----------------------------------------------------------------------------------------------------------------------
 # method to join data point
 def join_data_point(point_data, point_collection, point_time=None,
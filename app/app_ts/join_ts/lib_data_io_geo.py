@@ -13,8 +13,6 @@ import os
 
 import numpy as np
 import pandas as pd
-import rasterio
-from rasterio.crs import CRS
 
 from lib_info_args import logger_name
 from lib_info_args import (geo_coord_name_x, geo_coord_name_y,
@@ -139,6 +137,10 @@ def read_grid_data(file_name, output_format='data_array', output_dtype='float32'
                    coord_name_x=geo_coord_name_x, coord_name_y=geo_coord_name_y,
                    dim_name_x=geo_dim_name_x, dim_name_y=geo_dim_name_y, binary_mask=False):
 
+    # import optional backend at first use
+    import rasterio
+    from rasterio.crs import CRS
+
     try:
         dset = rasterio.open(file_name)
         bounds, res, transform = dset.bounds, dset.res, dset.transform
@@ -199,8 +199,12 @@ for time_period_step in $(seq 0 $time_period_days); do
 		    echo " "
 		    echo " ================================ " >> $path_file_lock_def_start
 
-		    # Run python script (using setting and time)
-		    python $script_file -settings_file $settings_file -time "$time_step"
+		    # Run python script (using setting and time); release the START lock if the script fails
+		    if ! python $script_file -settings_file $settings_file -time "$time_step"; then
+		        rm -f "$path_file_lock_def_start"
+		        echo " ===> EXECUTION ... FAILED! SCRIPT ENDED WITH ERRORS! LOCK FILE START REMOVED"
+		        exit 1
+		    fi
 		    
 		    # Lock File END
 		    time_analysis_end=$(date +"%Y-%m-%d %H:%S")
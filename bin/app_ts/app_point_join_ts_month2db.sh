@@ -43,8 +43,9 @@ echo " =========================================================================
 echo " ==> "$script_name" (Version: "$script_version" Release_Date: "$script_date")"
 echo " ==> START ..."
 
-# iterate over hour(s)
+# collect period(s) (processed in one run of the application)
 time_run=$(date -d "$time_now" +'%Y-%m-%d %H:00')
+time_steps=()
 for time_period_step in $(seq 0 $time_period_analysis); do
 	
     # parse time information
@@ -57,15 +58,17 @@ for time_period_step in $(seq 0 $time_period_analysis); do
 		exit
 	fi
 	
-	echo " ===> COMMAND LINE: " python $script_file -settings_file $settings_file -time "$time_step"
-	
-	# run python script (using setting and time)
-	python $script_file -settings_file $settings_file -time "$time_step"
-
-    echo " ... DONE!"
+	time_steps+=("$time_step")
 
 done
 
+echo " ===> COMMAND LINE: " python $script_file -settings_file $settings_file -time "${time_steps[@]}"
+
+# run python script (using setting and time period(s))
+python $script_file -settings_file $settings_file -time "${time_steps[@]}"
+
+echo " ... DONE!"
+
 # info script end
 echo " ==> "$script_name" (Version: "$script_version" Release_Date: "$script_date")"
 echo " ==> ... END"
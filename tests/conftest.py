@@ -0,0 +1,48 @@
+"""
+Test configuration
+
+Each application folder is a flat set of modules (imported by name from the application folder), so the
+modules are imported with the application folder in the path; modules with the same name loaded from another
+application folder (e.g. lib_info_args, lib_utils_io) are dropped first.
+"""
+
+# -------------------------------------------------------------------------------------
+# Libraries
+import os
+import sys
+import importlib
+
+import pytest
+
+# Repository root path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to import a module of an application folder
+def import_app_module(app_folder, module_name):
+
+    app_path = os.path.join(root_path, app_folder)
+
+    for module_step in list(sys.modules.keys()):
+        module_file = getattr(sys.modules[module_step], '__file__', None)
+        if module_file is None or not os.path.exists(os.path.join(app_path, module_step + '.py')):
+            continue
+        if os.path.dirname(os.path.abspath(module_file)) != app_path:
+            sys.modules.pop(module_step)
+
+    if app_path in sys.path:
+        sys.path.remove(app_path)
+    sys.path.insert(0, app_path)
+
+    return importlib.import_module(module_name)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Fixture to import application module(s)
+@pytest.fixture
+def app_module():
+    return import_app_module
+# -------------------------------------------------------------------------------------
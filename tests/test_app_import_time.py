@@ -0,0 +1,77 @@
+"""
+Test: import time of the application entry points (-X importtime budget and backends imported at first use)
+
+The entry points are imported in a separate process (from the application folder); the entry points with
+dependencies not available in the environment are skipped.
+"""
+
+# -------------------------------------------------------------------------------------
+# Libraries
+import os
+import sys
+import subprocess
+
+import pytest
+
+from conftest import root_path
+
+# Entry point(s) (folder, module, import time budget in seconds)
+app_entry_points = [
+    ('app/app_map/ground_network/ws', 'app_obs_ws_main', 3.0),
+    ('app/app_map/ground_network/hs', 'app_obs_hs_main', 3.0),
+    ('app/app_map/ground_network/rs', 'app_obs_rs_main', 3.0),
+    ('app/app_map/nwp/ecmwf', 'app_nwp_ecmwf_0100_main', 2.0),
+    ('app/app_map/nwp/icon', 'app_nwp_icon_2i_main', 2.0),
+    ('app/app_map/nwp/lami', 'app_nwp_lami_2i_main', 2.0),
+    ('app/app_map/radar', 'app_obs_mcm_main', 3.0),
+    ('tools/tool_processing_datasets_adapter', 'app_adapter_data_splitting_main', 3.0),
+]
+# Backend(s) imported at first use (plotting, grib, raster, shapefile and resampling libraries)
+app_backends_lazy = ['matplotlib', 'cfgrib', 'eccodes', 'rasterio', 'geopandas', 'pyresample', 'repurpose']
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Code to import a module with the lazy backend(s) blocked (an import of a backend at startup fails)
+import_code = """
+import sys
+class BackendFinder:
+    def find_spec(self, name, path=None, target=None):
+        if name.split('.')[0] in {backends}:
+            raise ImportError('backend imported at startup: ' + name)
+sys.meta_path.insert(0, BackendFinder())
+import {module}
+"""
+
+
+# Method to import a module with -X importtime (cumulative time in seconds of each import)
+def get_import_time(app_folder, module_name):
+
+    app_path = os.path.join(root_path, app_folder)
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', import_code.format(backends=app_backends_lazy, module=module_name)],
+        cwd=app_path, capture_output=True, text=True)
+    if 'backend imported at startup' in process.stderr:
+        pytest.fail(process.stderr.strip().splitlines()[-1])
+    if process.returncode != 0:
+        pytest.skip('entry point not importable in this environment: ' +
+                    process.stderr.strip().splitlines()[-1])
+
+    import_time = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, time_cumulative, import_name = line[len('import time:'):].split('|')
+        import_time[import_name.strip()] = int(time_cumulative) / 1000000
+    return import_time
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Test: import time budget (plotting and optional backend(s) not imported by the entry point)
+@pytest.mark.parametrize('app_folder,module_name,time_budget', app_entry_points)
+def test_app_import_time(app_folder, module_name, time_budget):
+
+    import_time = get_import_time(app_folder, module_name)
+    assert import_time[module_name] < time_budget
+# -------------------------------------------------------------------------------------
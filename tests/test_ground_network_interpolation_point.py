@@ -0,0 +1,266 @@
+"""
+Test: ws/hs point-to-grid interpolation (in-process engine vs gdal_grid semantics)
+
+The engine is compared with a brute force implementation of the gdal_grid algorithms (nearest and invdist
+with power 2, with and without the radius1/radius2 search ellipse) and, if gdal_grid is available, with the
+gdal_grid output itself.
+"""
+
+# -------------------------------------------------------------------------------------
+# Libraries
+import shutil
+import importlib.util
+
+import numpy as np
+import pytest
+
+app_folders = {
+    'ws': ('app/app_map/ground_network/ws', 'lib_ws_analysis_interpolation_point'),
+    'hs': ('app/app_map/ground_network/hs', 'lib_hs_analysis_interpolation_point'),
+}
+no_data = -9999.0
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define a synthetic grid and station set
+def define_case(seed=1, point_n=40, rows=60, cols=80):
+    rng = np.random.default_rng(seed)
+    geox_2d, geoy_2d = np.meshgrid(np.linspace(10.0, 12.0, cols), np.linspace(45.0, 43.0, rows))
+    geox_1d = rng.uniform(9.9, 12.1, point_n)
+    geoy_1d = rng.uniform(42.9, 45.1, point_n)
+    data_1d = rng.normal(size=point_n)
+    return data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d
+
+
+# Method to define the gdal_grid nodes (cell centers of -txe/-tye/-outsize; first row at the north boundary)
+def define_nodes(geox_2d, geoy_2d):
+    rows, cols = geox_2d.shape
+    res_x = (geox_2d.max() - geox_2d.min()) / cols
+    res_y = (geoy_2d.max() - geoy_2d.min()) / rows
+    nodes_x = geox_2d.min() + (np.arange(cols) + 0.5) * res_x
+    nodes_y = geoy_2d.max() - (np.arange(rows) + 0.5) * res_y
+    return np.meshgrid(nodes_x, nodes_y)
+
+
+# Method to interpolate with the gdal_grid algorithms (brute force over all nodes and points)
+def interp_reference(data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d, radius_x, radius_y, method):
+
+    nodes_x, nodes_y = define_nodes(geox_2d, geoy_2d)
+    node_dx = nodes_x.ravel()[:, np.newaxis] - geox_1d[np.newaxis, :]
+    node_dy = nodes_y.ravel()[:, np.newaxis] - geoy_1d[np.newaxis, :]
+    node_r2 = node_dx ** 2 + node_dy ** 2
+    if radius_x > 0 and radius_y > 0:
+        node_in = node_dx ** 2 * radius_y ** 2 + node_dy ** 2 * radius_x ** 2 <= radius_x ** 2 * radius_y ** 2
+    else:
+        node_in = np.ones(shape=node_r2.shape, dtype=bool)
+
+    values = np.full(shape=node_r2.shape[0], fill_value=no_data)
+    for node_id in range(node_r2.shape[0]):
+        point_in = np.flatnonzero(node_in[node_id])
+        if point_in.size == 0:
+            continue
+        point_r2 = node_r2[node_id, point_in]
+        if method == 'nearest':
+            values[node_id] = data_1d[point_in[np.argmin(point_r2)]]
+        else:
+            point_coincident = point_in[point_r2 < 0.0000000000001]
+            if point_coincident.size > 0:
+                values[node_id] = data_1d[point_coincident[0]]
+            else:
+                values[node_id] = np.sum(data_1d[point_in] / point_r2) / np.sum(1.0 / point_r2)
+
+    return values.reshape(geox_2d.shape).astype(np.float32)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Test: engine vs gdal_grid algorithms
+@pytest.mark.parametrize('app_name', ['ws', 'hs'])
+@pytest.mark.parametrize('method', ['nearest', 'idw'])
+@pytest.mark.parametrize('radius', [(0.3, 0.2), (0.0, 0.0)])
+def test_interp_point2grid_reference(app_module, app_name, method, radius):
+
+    lib_interp = app_module(*app_folders[app_name])
+    data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d = define_case()
+
+    values_ref = interp_reference(data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d, radius[0], radius[1], method)
+    values_out = lib_interp.interp_point2grid(
+        data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d, interp_no_data=no_data, interp_method=method,
+        interp_radius_x=radius[0], interp_radius_y=radius[1])
+
+    assert values_out.shape == geox_2d.shape
+    assert values_out.dtype == np.float32
+    np.testing.assert_allclose(values_out, values_ref, rtol=1e-6, atol=1e-6)
+    if radius[0] > 0:
+        assert np.any(values_out == no_data)
+
+
+# Test: engine by blocks of points (bounded pair memory) vs engine in one block
+@pytest.mark.parametrize('app_name', ['ws', 'hs'])
+@pytest.mark.parametrize('method', ['nearest', 'idw'])
+@pytest.mark.parametrize('radius', [(0.3, 0.2), (0.0, 0.0)])
+def test_interp_point2grid_blocks(app_module, app_name, method, radius, monkeypatch):
+
+    lib_interp = app_module(*app_folders[app_name])
+    data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d = define_case(seed=2)
+
+    values_one = lib_interp.interp_point2grid(
+        data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d, interp_no_data=no_data, interp_method=method,
+        interp_radius_x=radius[0], interp_radius_y=radius[1])
+
+    lib_interp.interp_plan_collections.clear()
+    monkeypatch.setattr(lib_interp, 'interp_pairs_block', 100)
+    values_blocks = lib_interp.interp_point2grid(
+        data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d, interp_no_data=no_data, interp_method=method,
+        interp_radius_x=radius[0], interp_radius_y=radius[1])
+    lib_interp.interp_plan_collections.clear()
+
+    np.testing.assert_allclose(values_blocks, values_one, rtol=1e-6, atol=1e-6)
+
+
+# Test: node centring and orientation (first row at the north boundary, first column at the west boundary)
+@pytest.mark.parametrize('app_name', ['ws', 'hs'])
+def test_interp_point2grid_nodes(app_module, app_name):
+
+    lib_interp = app_module(*app_folders[app_name])
+    _, _, _, geox_2d, geoy_2d = define_case()
+    nodes_x, nodes_y = define_nodes(geox_2d, geoy_2d)
+
+    # point at the center of the north-west cell (coincident node, value used as it is)
+    values_out = lib_interp.interp_point2grid(
+        np.array([5.0, 1.0]), np.array([nodes_x[0, 0], nodes_x[-1, -1]]),
+        np.array([nodes_y[0, 0], nodes_y[-1, -1]]), geox_2d, geoy_2d,
+        interp_no_data=no_data, interp_method='idw', interp_radius_x=0.0, interp_radius_y=0.0)
+    assert values_out[0, 0] == 5.0
+    assert values_out[-1, -1] == 1.0
+
+    # search ellipse smaller than the cell (only the node of the cell is filled)
+    res_x, res_y = nodes_x[0, 1] - nodes_x[0, 0], nodes_y[0, 0] - nodes_y[1, 0]
+    for method in ['nearest', 'idw']:
+        values_out = lib_interp.interp_point2grid(
+            np.array([7.0]), np.array([nodes_x[2, 3] + 0.1 * res_x]), np.array([nodes_y[2, 3] - 0.1 * res_y]),
+            geox_2d, geoy_2d, interp_no_data=no_data, interp_method=method,
+            interp_radius_x=0.4 * res_x, interp_radius_y=0.4 * res_y)
+        assert values_out[2, 3] == 7.0
+        assert np.count_nonzero(values_out != no_data) == 1
+
+
+# Test: hs grid window (same values of the window over the full grid)
+def test_interp_point2grid_window(app_module):
+
+    lib_interp = app_module(*app_folders['hs'])
+    data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d = define_case(seed=3)
+
+    for method in ['nearest', 'idw']:
+        values_full = lib_interp.interp_point2grid(
+            data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d, interp_no_data=no_data, interp_method=method,
+            interp_radius_x=0.3, interp_radius_y=0.3)
+        values_window = lib_interp.interp_point2grid(
+            data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d, interp_no_data=no_data, interp_method=method,
+            interp_radius_x=0.3, interp_radius_y=0.3, interp_window=[10, 40, 5, 70])
+        np.testing.assert_array_equal(values_window, values_full[10:40, 5:70])
+
+
+# Test: interpolation plan reused across values of the same point set
+@pytest.mark.parametrize('app_name', ['ws', 'hs'])
+@pytest.mark.parametrize('method', ['nearest', 'idw'])
+def test_interp_plan_reuse(app_module, app_name, method):
+
+    lib_interp = app_module(*app_folders[app_name])
+    lib_interp.interp_plan_collections.clear()
+    data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d = define_case(seed=5)
+
+    interp_plan = lib_interp.get_interp_plan(geox_1d, geoy_1d, geox_2d, geoy_2d, interp_radius_x=0.3,
+                                             interp_radius_y=0.2, interp_method=method)
+    assert lib_interp.get_interp_plan(geox_1d, geoy_1d, geox_2d, geoy_2d, interp_radius_x=0.3,
+                                      interp_radius_y=0.2, interp_method=method) is interp_plan
+
+    for data_step in [data_1d, data_1d * 2.0 + 1.0]:
+        values_ref = interp_reference(data_step, geox_1d, geoy_1d, geox_2d, geoy_2d, 0.3, 0.2, method)
+        values_out = lib_interp.apply_interp_plan(interp_plan, data_step, interp_no_data=no_data)
+        np.testing.assert_allclose(values_out, values_ref, rtol=1e-6, atol=1e-6)
+    lib_interp.interp_plan_collections.clear()
+
+
+# Test: interpolation plan cache bounded by size (plans over the size interpolated by blocks)
+@pytest.mark.parametrize('app_name', ['ws', 'hs'])
+def test_interp_plan_bytes(app_module, app_name, monkeypatch):
+
+    lib_interp = app_module(*app_folders[app_name])
+    lib_interp.interp_plan_collections.clear()
+    lib_interp.interp_plan_oversize.clear()
+    monkeypatch.setattr(lib_interp, 'interp_plan_bytes_max', 200000)
+
+    for seed in range(6):
+        data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d = define_case(seed=seed, point_n=10)
+        lib_interp.interp_point2grid(data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d, interp_no_data=no_data,
+                                     interp_method='idw', interp_radius_x=0.3, interp_radius_y=0.2)
+        plans_bytes = sum([plan_step['bytes'] for plan_step in lib_interp.interp_plan_collections.values()])
+        assert plans_bytes <= 200000
+    assert len(lib_interp.interp_plan_collections) < 6
+
+    # plan without search ellipse over the size (points x nodes weights)
+    data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d = define_case(seed=6)
+    assert lib_interp.get_interp_plan(geox_1d, geoy_1d, geox_2d, geoy_2d, interp_radius_x=0.0,
+                                      interp_radius_y=0.0, interp_method='idw') is None
+    values_ref = interp_reference(data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d, 0.0, 0.0, 'idw')
+    values_out = lib_interp.interp_point2grid(data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d, interp_no_data=no_data,
+                                              interp_method='idw', interp_radius_x=0.0, interp_radius_y=0.0)
+    np.testing.assert_allclose(values_out, values_ref, rtol=1e-6, atol=1e-6)
+
+    lib_interp.interp_plan_collections.clear()
+    lib_interp.interp_plan_oversize.clear()
+
+
+# Test: gdal_grid algorithm option (radius, nodata and power mapped; unsupported fields skipped with a warning)
+@pytest.mark.parametrize('app_name', ['ws', 'hs'])
+@pytest.mark.parametrize('interp_option,method,radius,power', [
+    ('-a nearest:radius1=0.3:radius2=0.2:angle=0.0:nodata=-8888.0', 'nearest', (0.3, 0.2), 2.0),
+    ('-a invdist:power=3.0:smoothing=0.0:radius1=0.25:radius2=0.25:angle=0.0:nodata=-8888.0', 'idw',
+     (0.25, 0.25), 3.0),
+])
+def test_interp_point2grid_option(app_module, app_name, interp_option, method, radius, power, caplog):
+
+    lib_interp = app_module(*app_folders[app_name])
+    data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d = define_case(seed=7)
+
+    values_option = lib_interp.interp_point2grid(
+        data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d, interp_no_data=no_data, interp_method='nearest',
+        interp_radius_x=0.1, interp_radius_y=0.1, interp_option=interp_option)
+    values_ref = lib_interp.interp_point2grid(
+        data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d, interp_no_data=-8888.0, interp_method=method,
+        interp_radius_x=radius[0], interp_radius_y=radius[1], interp_power=power)
+    np.testing.assert_array_equal(values_option, values_ref)
+    assert np.any(values_option == -8888.0)
+    assert 'not supported' not in caplog.text
+
+    lib_interp.interp_point2grid(
+        data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d, interp_no_data=no_data, interp_method=method,
+        interp_radius_x=radius[0], interp_radius_y=radius[1],
+        interp_option=interp_option.replace('angle=0.0', 'angle=30.0') + ':max_points=5')
+    assert 'angle=30.0" is not supported' in caplog.text
+    assert 'max_points=5" is not supported' in caplog.text
+    lib_interp.interp_plan_collections.clear()
+
+
+# Test: engine vs gdal_grid executable (if available)
+@pytest.mark.skipif(shutil.which('gdal_grid') is None or importlib.util.find_spec('rasterio') is None,
+                    reason='gdal_grid and rasterio are not available')
+@pytest.mark.parametrize('app_name', ['ws', 'hs'])
+@pytest.mark.parametrize('method', ['nearest', 'idw'])
+@pytest.mark.parametrize('radius', [(0.3, 0.2), (0.0, 0.0)])
+def test_interp_point2grid_gdal(app_module, app_name, method, radius, tmp_path):
+
+    lib_interp = app_module(*app_folders[app_name])
+    data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d = define_case(seed=4)
+
+    values_out = lib_interp.interp_point2grid(
+        data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d, interp_no_data=no_data, interp_method=method,
+        interp_radius_x=radius[0], interp_radius_y=radius[1])
+    values_gdal = lib_interp.interp_point2grid_gdal(
+        data_1d, geox_1d, geoy_1d, geox_2d, geoy_2d, interp_no_data=no_data, interp_method=method,
+        interp_radius_x=radius[0], interp_radius_y=radius[1], folder_tmp=str(tmp_path / 'gdal'))
+
+    np.testing.assert_allclose(values_out, values_gdal, rtol=1e-4, atol=1e-4)
+# -------------------------------------------------------------------------------------
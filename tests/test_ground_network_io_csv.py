@@ -0,0 +1,125 @@
+"""
+Test: ws/hs/rs csv reader (time selection as the label-based selection and invalidation of the parsed file cache)
+"""
+
+# -------------------------------------------------------------------------------------
+# Libraries
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+app_folders = {
+    'ws': ('app/app_map/ground_network/ws', 'lib_ws_io_generic'),
+    'hs': ('app/app_map/ground_network/hs', 'lib_hs_io_generic'),
+    'rs': ('app/app_map/ground_network/rs', 'lib_rs_io_generic'),
+}
+file_header = ['code', 'name', 'longitude', 'latitude', 'time', 'data']
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to write a csv file of station(s) (rows not sorted by time; time repeated over the stations)
+def write_file(file_name, file_rows):
+    with open(file_name, 'w') as file_handle:
+        file_handle.write(','.join(file_header) + '\n')
+        for file_row in file_rows:
+            file_handle.write(','.join([str(file_value) for file_value in file_row]) + '\n')
+
+
+def define_rows(data_offset=0.0):
+    return [
+        [1, 'station_a', 8.5, 44.1, '2024-01-01 01:00', 1.0 + data_offset],
+        [1, 'station_a', 8.5, 44.1, '2024-01-01 00:00', 2.0 + data_offset],
+        [2, 'station_b', 8.6, 44.2, '2024-01-01 00:00', 3.0 + data_offset],
+        [2, 'station_b', 8.6, 44.2, '2024-01-01 02:00', 4.0 + data_offset],
+    ]
+
+
+# Method to read a csv file with the label-based selection (reference)
+def read_reference(file_name, file_time=None):
+    file_dframe = pd.read_table(file_name, sep=',', names=file_header, skiprows=1)
+    file_dframe = file_dframe.reset_index().set_index('time')
+    file_dframe.index = pd.to_datetime(file_dframe.index, format='%Y-%m-%d %H:%M')
+    if file_time is not None:
+        file_dframe = file_dframe.loc[pd.Timestamp(file_time)]
+    return file_dframe
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Test: time selection (single matching row as series, many rows as dataframe, all rows in the file order)
+@pytest.mark.parametrize('app_name', ['ws', 'hs', 'rs'])
+@pytest.mark.parametrize('file_time', ['2024-01-01 01:00', '2024-01-01 00:00', '2024-01-01 02:00', None])
+def test_read_file_csv_time(app_module, app_name, file_time, tmp_path):
+
+    lib_io = app_module(*app_folders[app_name])
+    file_name = str(tmp_path / 'stations.csv')
+    write_file(file_name, define_rows())
+
+    file_data = lib_io.read_file_csv(file_name, file_time=file_time)
+    file_ref = read_reference(file_name, file_time=file_time)
+
+    assert type(file_data) is type(file_ref)
+    if isinstance(file_ref, pd.Series):
+        pd.testing.assert_series_equal(file_data, file_ref, check_names=False)
+    else:
+        pd.testing.assert_frame_equal(file_data, file_ref)
+
+    assert lib_io.read_file_csv(file_name, file_time='2024-01-01 03:00') is None
+
+
+# Test: cache invalidation (file updated, parser settings changed, cache file of another version)
+@pytest.mark.parametrize('app_name', ['ws', 'hs', 'rs'])
+@pytest.mark.parametrize('file_cache', [False, True])
+def test_read_file_csv_cache(app_module, app_name, file_cache, tmp_path):
+
+    lib_io = app_module(*app_folders[app_name])
+    lib_io.file_csv_cache.clear()
+    file_name = str(tmp_path / 'stations.csv')
+    file_cache_folder = str(tmp_path / 'cache') if file_cache else None
+
+    write_file(file_name, define_rows())
+    file_data = lib_io.read_file_csv(file_name, file_time='2024-01-01 00:00', file_cache_folder=file_cache_folder)
+    np.testing.assert_array_equal(file_data['data'].values, [2.0, 3.0])
+    if file_cache:
+        assert len(os.listdir(file_cache_folder)) == 1
+
+    # same file (values from the cache)
+    file_data = lib_io.read_file_csv(file_name, file_time='2024-01-01 00:00', file_cache_folder=file_cache_folder)
+    np.testing.assert_array_equal(file_data['data'].values, [2.0, 3.0])
+
+    # file updated (same size, new modification time)
+    write_file(file_name, define_rows(data_offset=5.0))
+    file_stat = os.stat(file_name)
+    os.utime(file_name, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10 ** 9))
+    file_data = lib_io.read_file_csv(file_name, file_time='2024-01-01 00:00', file_cache_folder=file_cache_folder)
+    np.testing.assert_array_equal(file_data['data'].values, [7.0, 8.0])
+
+    # file updated (new rows)
+    write_file(file_name, define_rows() + [[3, 'station_c', 8.7, 44.3, '2024-01-01 00:00', 9.0]])
+    file_data = lib_io.read_file_csv(file_name, file_time='2024-01-01 00:00', file_cache_folder=file_cache_folder)
+    np.testing.assert_array_equal(file_data['data'].values, [2.0, 3.0, 9.0])
+
+    # parser settings changed (renamed column)
+    file_data = lib_io.read_file_csv(file_name, file_time='2024-01-01 00:00', file_cache_folder=file_cache_folder,
+                                     file_renamecols={'data': 'values'}, tag_file_data='values')
+    assert 'values' in file_data.columns and 'data' not in file_data.columns
+
+    # in-process cache dropped (values from the cache file or parsed again)
+    lib_io.file_csv_cache.clear()
+    file_data = lib_io.read_file_csv(file_name, file_time='2024-01-01 00:00', file_cache_folder=file_cache_folder)
+    np.testing.assert_array_equal(file_data['data'].values, [2.0, 3.0, 9.0])
+
+    # cache file not readable (parsed again and updated)
+    if file_cache:
+        lib_io.file_csv_cache.clear()
+        for file_name_cache in os.listdir(file_cache_folder):
+            with open(os.path.join(file_cache_folder, file_name_cache), 'wb') as file_handle:
+                file_handle.write(b'not a cache')
+        file_data = lib_io.read_file_csv(file_name, file_time='2024-01-01 00:00', file_cache_folder=file_cache_folder)
+        np.testing.assert_array_equal(file_data['data'].values, [2.0, 3.0, 9.0])
+
+    lib_io.file_csv_cache.clear()
+# -------------------------------------------------------------------------------------
@@ -0,0 +1,85 @@
+"""
+Test: rs river-section values (conversion to the section points and ascii file byte-identical to the previous
+np.savetxt output)
+
+The expected files in tests/data were written by the previous conversion (one dataframe for each section) and the
+previous writer (np.savetxt of a structured array) with the same sections, data values and shipped format sets.
+"""
+
+# -------------------------------------------------------------------------------------
+# Libraries
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import root_path
+
+app_folder = 'app/app_map/ground_network/rs'
+data_folder = os.path.join(root_path, 'tests', 'data')
+
+# Format set(s) of the shipped configuration file(s) (code, discharge, tag)
+file_format_sets = {
+    'rs_sections_liguria.txt': (['%10.0f', '%10.1f', '%s'], ['float', 'float', 'str']),
+    'rs_sections_marche.txt': (['%7s', '%10.1f', '%s'], ['str', 'float', 'str']),
+}
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the section registry and the data values (sections with value, nan value, no value)
+def define_case(code_type):
+
+    time_data = pd.Timestamp('2024-01-01 00:00')
+    geo_collections = pd.DataFrame({
+        'id': [1, 2, 3, 4, 5],
+        'code': [101, 102, 103, 104, 105],
+        'tag': ['Entella_Panesi', 'Vara_Nasceto', 'Magra_Calamazza', 'Scrivia_Isola', 'Bormida_Piana'],
+        'name': ['Panesi', 'Nasceto', 'Calamazza', 'Isola', 'Piana'],
+        'longitude': [9.3, 9.7, 9.9, 8.9, 8.2], 'latitude': [44.3, 44.2, 44.1, 44.6, 44.4]})
+    data_collections = pd.DataFrame({
+        'code': [104, 101, 102, 999],
+        'discharge': [1234.56, 12.34, np.nan, 5.0],
+        'tag': ['Scrivia_Isola', 'Entella_Panesi', 'Vara_Nasceto', 'Other_Section'],
+        'name': ['Isola', 'Panesi', 'Nasceto', 'Other']},
+        index=pd.DatetimeIndex([time_data] * 4, name='time'))
+
+    if code_type == 'str':
+        geo_collections['code'] = ['RS' + str(code) for code in geo_collections['code']]
+        data_collections['code'] = ['RS' + str(code) for code in data_collections['code']]
+
+    return data_collections, geo_collections
+
+
+# Method to convert the field types to the write engine types (as the rs driver)
+def define_write_engine(file_fields_types):
+    return [{'int': 'i', 'float': 'f', 'str': 'U256'}[field_type] for field_type in file_fields_types]
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Test: section points written as the previous np.savetxt output (byte-identical)
+@pytest.mark.parametrize('file_name_expected', list(file_format_sets.keys()))
+def test_write_section_points(app_module, file_name_expected, tmp_path):
+
+    lib_variables = app_module(app_folder, 'lib_rs_variables')
+    lib_io = app_module(app_folder, 'lib_rs_io_generic')
+
+    file_format, file_fields_types = file_format_sets[file_name_expected]
+    file_fields = ['code', 'discharge', 'tag']
+    data_collections, geo_collections = define_case(file_fields_types[0])
+
+    df_points = lib_variables.convert_values2points(data_collections, geo_collections, tag_file_fields=file_fields)
+    assert df_points.index.tolist() == geo_collections['tag'].tolist()
+
+    file_name = str(tmp_path / file_name_expected)
+    lib_io.write_file_ascii(file_name, df_points[file_fields], file_fields=file_fields,
+                            file_format=file_format, file_write_engine=define_write_engine(file_fields_types))
+
+    with open(file_name, 'rb') as file_handle:
+        file_bytes = file_handle.read()
+    with open(os.path.join(data_folder, file_name_expected), 'rb') as file_handle:
+        file_bytes_expected = file_handle.read()
+    assert file_bytes == file_bytes_expected
+# -------------------------------------------------------------------------------------
@@ -0,0 +1,74 @@
+"""
+Test: ws/hs static workspace datasets (write/read round trip of values and geo attributes in each format)
+"""
+
+# -------------------------------------------------------------------------------------
+# Libraries
+from collections import namedtuple
+
+import numpy as np
+import xarray as xr
+import pytest
+
+app_folders = {
+    'ws': ('app/app_map/ground_network/ws', 'lib_ws_io_generic', 'drv_data_ws_geo'),
+    'hs': ('app/app_map/ground_network/hs', 'lib_hs_io_generic', 'drv_data_hs_geo'),
+}
+
+
+# Geo transform (tuple subclass as the rasterio affine transform)
+class Affine(namedtuple('Affine', ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i'])):
+    pass
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define a land dataset with the attributes of the raster reader
+def define_dset(rows=4, cols=5):
+    geo_x, geo_y = np.meshgrid(np.linspace(10, 12, cols), np.linspace(45, 43, rows))
+    dset_data = xr.Dataset(
+        data_vars={'land': (['south_north', 'west_east'], np.arange(rows * cols, dtype=np.float32).reshape(rows, cols)),
+                   'slope': (['south_north', 'west_east'], np.ones((rows, cols), dtype=np.float64))},
+        coords={'longitude': (['south_north', 'west_east'], geo_x),
+                'latitude': (['south_north', 'west_east'], geo_y)})
+    dset_data.attrs = {
+        'transform': Affine(0.1, 0.0, 10.0, 0.0, -0.1, 45.0, 0.0, 0.0, 1.0), 'bbox': [10, 45, 12, 43],
+        'res': (0.1,), 'high': rows, 'wide': cols, 'no_data': -9999.0, 'proj': 'GEOGCS["WGS 84"]'}
+    return dset_data
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Test: round trip (values, sequence attributes and geo attributes as the ones of the source dataset)
+@pytest.mark.parametrize('app_name', ['ws', 'hs'])
+@pytest.mark.parametrize('file_format', ['npy', 'netcdf'])
+def test_dset_workspace(app_module, app_name, file_format, tmp_path):
+
+    app_folder, io_module_name, geo_module_name = app_folders[app_name]
+    lib_io = app_module(app_folder, io_module_name)
+    drv_geo = app_module(app_folder, geo_module_name)
+
+    dset_src = define_dset()
+    file_name = str(tmp_path / 'land.workspace')
+    lib_io.write_dset_workspace(file_name, dset_src, file_format=file_format)
+
+    dset_dst = lib_io.read_dset_workspace(file_name)
+    for var_name in ['land', 'slope', 'longitude', 'latitude']:
+        assert dset_dst[var_name].dtype == dset_src[var_name].dtype
+        np.testing.assert_array_equal(dset_dst[var_name].values, dset_src[var_name].values)
+    assert dset_dst.attrs['transform'] == tuple(dset_src.attrs['transform'])
+    assert dset_dst.attrs['bbox'] == [10, 45, 12, 43]
+    assert dset_dst.attrs['res'] == (0.1,)
+    assert sorted(dset_dst.attrs.keys()) == sorted(dset_src.attrs.keys())
+
+    attrs_src = drv_geo.DriverGeo.define_geo_attributes(dset_src)
+    attrs_dst = drv_geo.DriverGeo.define_geo_attributes(dset_dst)
+    assert (attrs_dst['cellsize'], attrs_dst['xllcorner'], attrs_dst['yllcorner']) == (0.1, 10.0, 45.0)
+    assert attrs_dst['bounding_box'] == attrs_src['bounding_box'] == '10,45,12,43'
+    for attr_key in ['ncols', 'nrows', 'nodata_value', 'proj']:
+        assert attrs_dst[attr_key] == attrs_src[attr_key]
+
+    dset_var = lib_io.read_dset_workspace(file_name, var_list=['slope'])
+    assert list(dset_var.data_vars) == ['slope']
+    assert dset_var.attrs['bbox'] == [10, 45, 12, 43]
+# -------------------------------------------------------------------------------------
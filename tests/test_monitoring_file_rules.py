@@ -0,0 +1,88 @@
+"""
+Test: file-arrival monitors rule engine (folder matching and START/END lock files shared with the runners)
+"""
+
+# -------------------------------------------------------------------------------------
+# Libraries
+import os
+
+import pytest
+
+rules_folder = 'tools/tool_monitoring_files'
+rules_module = 'hyde_tools_monitoring_file_rules'
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define a rule (files of a day, lock files with the runners tags)
+def define_rule(lib_rules, tmp_path, command):
+    rule = {**lib_rules.rule_default,
+            "name": "nwp_test", "folder": str(tmp_path / "nwp"), "file_pattern": "{run_time}-nwp.t00z.*",
+            "time_format": "%Y%m%d", "expected_files": 2, "command": command,
+            "lock_folder": str(tmp_path / "lock" / "%YYYY"),
+            "lock_file_start": "app_nwp_lock_%YYYY%MM%DD_START.txt",
+            "lock_file_end": "app_nwp_lock_%YYYY%MM%DD_END.txt"}
+    rule["regex"] = lib_rules.define_rule_regex(rule["file_pattern"])
+    os.makedirs(rule["folder"], exist_ok=True)
+    for file_name in ["20240101-nwp.t00z.T2m", "20240101-nwp.t00z.RH2m"]:
+        open(os.path.join(rule["folder"], file_name), "w").close()
+    return rule
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Test: files of a sibling folder with the same prefix (e.g. nwp2 vs nwp) are not matched
+def test_rule_folder(app_module, tmp_path):
+
+    lib_rules = app_module(rules_folder, rules_module)
+    rule = define_rule(lib_rules, tmp_path, "true")
+    rule["debounce_seconds"] = 3600
+    rule_engine = lib_rules.RuleEngine([rule])
+
+    rule_engine.on_file(str(tmp_path / "nwp2" / "20240101-nwp.t00z.T2m"))
+    assert rule_engine.timers == {}
+    rule_engine.on_file(str(tmp_path / "nwp" / "sub" / "20240101-nwp.t00z.T2m"))
+    assert list(rule_engine.timers.keys()) == [("nwp_test", "20240101")]
+    for timer in rule_engine.timers.values():
+        timer.cancel()
+
+
+# Test: completed run (END lock written, the run time is not launched again)
+def test_rule_lock_completed(app_module, tmp_path):
+
+    lib_rules = app_module(rules_folder, rules_module)
+    file_run = tmp_path / "run.txt"
+    rule = define_rule(lib_rules, tmp_path, "echo run >> " + str(file_run) + " && true")
+    rule_engine = lib_rules.RuleEngine([rule])
+
+    lock_folder = tmp_path / "lock" / "2024"
+    rule_engine.on_debounce(rule, "20240101")
+    assert (lock_folder / "app_nwp_lock_20240101_START.txt").exists()
+    assert "COMPLETED" in (lock_folder / "app_nwp_lock_20240101_END.txt").read_text()
+
+    rule_engine.on_debounce(rule, "20240101")
+    assert file_run.read_text().splitlines() == ["run"]
+
+
+# Test: run in progress (START lock written by the runner) and failed run (START lock released)
+@pytest.mark.parametrize('command', ['false', 'sh -c "exit 3"'])
+def test_rule_lock_failed(app_module, tmp_path, command):
+
+    lib_rules = app_module(rules_folder, rules_module)
+    file_run = tmp_path / "run.txt"
+    rule = define_rule(lib_rules, tmp_path, "echo run >> " + str(file_run) + " && " + command)
+    rule_engine = lib_rules.RuleEngine([rule])
+
+    lock_folder = tmp_path / "lock" / "2024"
+    lock_folder.mkdir(parents=True)
+    (lock_folder / "app_nwp_lock_20240101_START.txt").write_text(" ==== Status: RUNNING")
+    rule_engine.on_debounce(rule, "20240101")
+    assert not file_run.exists()
+
+    (lock_folder / "app_nwp_lock_20240101_START.txt").unlink()
+    rule_engine.on_debounce(rule, "20240101")
+    rule_engine.on_debounce(rule, "20240101")
+    assert file_run.read_text().splitlines() == ["run", "run"]
+    assert not (lock_folder / "app_nwp_lock_20240101_START.txt").exists()
+    assert not (lock_folder / "app_nwp_lock_20240101_END.txt").exists()
+# -------------------------------------------------------------------------------------
@@ -0,0 +1,91 @@
+"""
+Test: ecmwf rain and wind component steps (disaggregation of the 3H steps to 1H steps and scale factor)
+
+The reference is the loop over the source steps used before the broadcast assignment.
+"""
+
+# -------------------------------------------------------------------------------------
+# Libraries
+import numpy as np
+import pandas as pd
+import xarray as xr
+import pytest
+
+app_folder = 'app/app_map/nwp/ecmwf'
+app_module_name = 'lib_fx_nwp_ecmwf_0100'
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define a synthetic variable (time, latitude, longitude)
+def define_var(var_dtype, var_frequency, time_steps=8, rows=7, cols=9):
+    rng = np.random.default_rng(1)
+    time_range = pd.date_range('2024-01-01 03:00', periods=time_steps, freq=var_frequency.lower())
+    geo_x, geo_y = np.meshgrid(np.linspace(5, 10, cols), np.linspace(40, 45, rows))
+    return xr.DataArray(
+        rng.random((time_steps, rows, cols)).astype(var_dtype), dims=['time', 'latitude', 'longitude'],
+        coords={'time': time_range,
+                'west_east': (['latitude', 'longitude'], geo_x), 'south_north': (['latitude', 'longitude'], geo_y)})
+
+
+# Method to compute the steps with the loop over the source steps (reference)
+def compute_reference(var_dframe, var_frequency, var_scale_factor, var_scale_fx, var_period=None):
+
+    if var_period is not None:
+        idx_start, idx_end = var_period[0], var_period[1]
+        if var_frequency == '3H':
+            idx_end = (idx_end - idx_start) * 3 + 1
+        var_dframe = var_dframe[idx_start:idx_end, :, :]
+
+    time_range_in = pd.DatetimeIndex(var_dframe['time'].values)
+    if var_frequency == '3H':
+        time_range_out = pd.date_range(
+            start=time_range_in[0] - pd.Timedelta('3h'), end=time_range_in[-1], freq='1h')[1:]
+
+        values_src = var_dframe.values / 3
+        values_dst = np.zeros(shape=(len(time_range_out), values_src.shape[1], values_src.shape[2]))
+        for i in range(0, len(time_range_in)):
+            values_dst_tmp = np.zeros(shape=(3, values_src.shape[1], values_src.shape[2]))
+            for j in range(0, 3):
+                values_dst_tmp[j, :, :] = values_src[i, :, :]
+            values_dst[i * 3:(i + 1) * 3, :, :] = values_dst_tmp
+    else:
+        time_range_out = time_range_in
+        values_dst = var_dframe.values
+
+    return var_scale_fx(values_dst, var_scale_factor), time_range_out
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Test: rain and wind component steps vs loop over the source steps (bitwise equal, same type)
+@pytest.mark.parametrize('var_dtype', [np.float32, np.float64])
+@pytest.mark.parametrize('var_frequency', ['3H', '1H'])
+@pytest.mark.parametrize('var_scale_factor', [1, 1000, 0.1])
+@pytest.mark.parametrize('var_fx,var_units,var_period', [
+    ('compute_rain', 'm', None),
+    ('compute_wind_component', 'm s-1', None),
+    ('compute_wind_component', 'm s-1', [0, 4]),
+])
+def test_compute_steps(app_module, var_dtype, var_frequency, var_scale_factor, var_fx, var_units, var_period):
+
+    lib_fx = app_module(app_folder, app_module_name)
+    var_dframe = define_var(var_dtype, var_frequency)
+
+    if var_fx == 'compute_rain':
+        values_ref, time_ref = compute_reference(
+            var_dframe, var_frequency, var_scale_factor, lambda values, factor: values / factor)
+    else:
+        values_ref, time_ref = compute_reference(
+            var_dframe, var_frequency, var_scale_factor, lambda values, factor: values * factor,
+            var_period=var_period)
+
+    var_attrs = {'units': var_units, 'scale_factor': var_scale_factor}
+    var_out, var_attrs_out = getattr(lib_fx, var_fx)(
+        var_dframe.copy(), var_attrs=var_attrs, var_frequency=var_frequency, var_period=var_period)
+
+    assert var_out.dtype == values_ref.dtype
+    np.testing.assert_array_equal(var_out.values, values_ref)
+    assert pd.DatetimeIndex(var_out['time'].values).equals(time_ref)
+    assert var_attrs_out['units'] == ('mm' if var_fx == 'compute_rain' else 'm s-1')
+# -------------------------------------------------------------------------------------
@@ -0,0 +1,110 @@
+"""
+Test: nwp resample data (values and peak memory of the resample step)
+
+The resample index is stored in memory before the call (the index computation needs the repurpose backend).
+The peak memory is measured in a separate process as the growth of the peak rss during the resample step.
+"""
+
+# -------------------------------------------------------------------------------------
+# Libraries
+import os
+import sys
+import json
+import subprocess
+
+import numpy as np
+import pytest
+
+from conftest import root_path
+
+app_names = ['ecmwf', 'icon', 'lami']
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define a synthetic source and destination grid (the index maps each node to a source cell)
+def define_case(lib_geo, n_time=6, rows=30, cols=40, var_names=('air_temperature', 'rain'), dtype=np.float32):
+
+    rng = np.random.default_rng(1)
+    geo_x_src, geo_y_src = np.meshgrid(np.linspace(10.0, 12.0, cols), np.linspace(43.0, 45.0, rows))
+    geo_x_dst, geo_y_dst = np.meshgrid(np.linspace(10.1, 11.9, cols - 2), np.linspace(43.1, 44.9, rows - 2))
+    geo_mask_dst = np.ones(geo_x_dst.shape)
+    geo_mask_dst[:3, :5] = 0
+
+    var_settings = {"min_neighbours": 1, "neighbours": 8, "search_rad": 25000, "method": "nn"}
+    index_1d = rng.integers(0, rows * cols, size=geo_x_dst.size)
+    index_key = lib_geo.define_resample_index_key(geo_x_src, geo_y_src, geo_x_dst, geo_y_dst, **var_settings)
+    lib_geo.resample_index_collections[index_key] = index_1d
+
+    obj_data = {var_name: rng.normal(size=(n_time, rows, cols)).astype(dtype) for var_name in var_names}
+    obj_settings = {var_name: var_settings for var_name in var_names}
+
+    return obj_data, obj_settings, index_1d, geo_x_src, geo_y_src, geo_x_dst, geo_y_dst, geo_mask_dst
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Test: resampled values (by chunks of time steps) vs index gathered step by step
+@pytest.mark.parametrize('app_name', app_names)
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_resample_data_values(app_module, app_name, dtype):
+
+    lib_geo = app_module('app/app_map/nwp/' + app_name, 'lib_utils_geo')
+    lib_methods = app_module('app/app_map/nwp/' + app_name, 'lib_fx_methods')
+
+    (obj_data, obj_settings, index_1d,
+     geo_x_src, geo_y_src, geo_x_dst, geo_y_dst, geo_mask_dst) = define_case(lib_geo, dtype=dtype)
+    obj_ref = {}
+    for var_name, var_data in obj_data.items():
+        var_ref = np.zeros((var_data.shape[0],) + geo_x_dst.shape)
+        for n in range(var_data.shape[0]):
+            var_ref[n] = np.flipud(var_data[n].ravel()[index_1d].reshape(geo_x_dst.shape))
+            var_ref[n][geo_mask_dst == 0] = np.nan
+        obj_ref[var_name] = var_ref
+
+    obj_out = lib_methods.resample_data(
+        obj_data, geo_x_src, geo_y_src, geo_x_dst, geo_y_dst,
+        geo_resample_idx=True, geo_mask_dst=geo_mask_dst, time_chunk=4, **obj_settings)
+
+    # source variable(s) released from the collection
+    assert obj_data == {}
+    for var_name, var_ref in obj_ref.items():
+        assert obj_out[var_name].dtype == dtype
+        np.testing.assert_array_equal(obj_out[var_name], var_ref)
+
+
+# Test: peak memory of the resample step (no float64 copy of the float32 datasets, sources released)
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='peak rss in kilobytes on linux only')
+@pytest.mark.parametrize('app_name', app_names)
+def test_resample_data_peak_rss(app_name):
+
+    script = '''
+import sys, json, resource
+import numpy as np
+sys.path.insert(0, sys.argv[1])
+sys.path.insert(0, sys.argv[2])
+import lib_utils_geo as lib_geo
+import lib_fx_methods as lib_methods
+from test_nwp_resample_data import define_case
+
+case = define_case(lib_geo, n_time=48, rows=300, cols=400, var_names=('air_temperature', 'rain', 'wind_speed'))
+obj_data, obj_settings, _, geo_x_src, geo_y_src, geo_x_dst, geo_y_dst, geo_mask_dst = case
+var_bytes = obj_data['rain'].nbytes
+del case
+
+rss_start = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+obj_out = lib_methods.resample_data(
+    obj_data, geo_x_src, geo_y_src, geo_x_dst, geo_y_dst,
+    geo_resample_idx=True, geo_mask_dst=geo_mask_dst, time_chunk=12, **obj_settings)
+rss_end = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({'rss_growth': (rss_end - rss_start) * 1024, 'var_bytes': var_bytes}))
+'''
+    app_path = os.path.join(root_path, 'app', 'app_map', 'nwp', app_name)
+    test_path = os.path.dirname(os.path.abspath(__file__))
+    output = subprocess.run([sys.executable, '-c', script, app_path, test_path],
+                            capture_output=True, text=True, check=True)
+    rss_info = json.loads(output.stdout.strip().splitlines()[-1])
+
+    # one variable (destination allocated before the source is released) and the chunk temporaries
+    assert rss_info['rss_growth'] < 2 * rss_info['var_bytes']
+# -------------------------------------------------------------------------------------
@@ -0,0 +1,61 @@
+"""
+Test: nwp unzip folder (unzipped source files reused until expired and expired files removed from the folder)
+"""
+
+# -------------------------------------------------------------------------------------
+# Libraries
+import os
+import gzip
+import time
+
+import pytest
+
+app_folders = ['app/app_map/nwp/ecmwf', 'app/app_map/nwp/icon', 'app/app_map/nwp/lami']
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to set the modification time of a file (seconds in the past)
+def set_file_age(file_name, file_age):
+    file_time = time.time() - file_age
+    os.utime(file_name, (file_time, file_time))
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Test: unzipped file reused if not expired; expired unzipped and partial files removed (zip files kept)
+@pytest.mark.parametrize('app_folder', app_folders)
+def test_unzip_purge(app_module, app_folder, tmp_path):
+
+    lib_gzip = app_module(app_folder, 'lib_data_io_gzip')
+
+    folder_src, folder_unzip = tmp_path / 'source', tmp_path / 'unzip'
+    folder_src.mkdir()
+    file_zip = folder_src / 'nwp_2024010100.grib.gz'
+    with gzip.open(str(file_zip), 'wb') as file_handle:
+        file_handle.write(b'grib data')
+    set_file_age(str(file_zip), 7200)
+
+    file_unzip = folder_unzip / 'nwp_2024010100.grib'
+    lib_gzip.unzip_filename(str(file_zip), str(file_unzip), file_expire=3600)
+    assert file_unzip.read_bytes() == b'grib data'
+
+    # not expired (reused)
+    file_unzip.write_bytes(b'reused')
+    lib_gzip.unzip_filename(str(file_zip), str(file_unzip), file_expire=3600)
+    assert file_unzip.read_bytes() == b'reused'
+
+    # files of the previous runs (expired unzipped and partial files; zip file and sub-folder)
+    for file_name in ['nwp_2023123100.grib', 'nwp_2023123000.grib.part', 'nwp_2023123100.grib.gz']:
+        (folder_unzip / file_name).write_bytes(b'old')
+        set_file_age(str(folder_unzip / file_name), 2 * 86400)
+    (folder_unzip / 'sub').mkdir()
+
+    lib_gzip.purge_filename_expired(str(folder_unzip), file_expire=None)
+    assert len(os.listdir(str(folder_unzip))) == 5
+
+    lib_gzip.purge_filename_expired(str(folder_unzip), file_expire=86400)
+    assert sorted(os.listdir(str(folder_unzip))) == ['nwp_2023123100.grib.gz', 'nwp_2024010100.grib', 'sub']
+
+    lib_gzip.purge_filename_expired(str(tmp_path / 'missing'), file_expire=86400)
+# -------------------------------------------------------------------------------------
@@ -0,0 +1,122 @@
+"""
+Test: radar mcm grid index (kd-tree index vs griddata 'nearest', rain mapped by index and index rebuilt if the
+source or reference grid is changed)
+"""
+
+# -------------------------------------------------------------------------------------
+# Libraries
+import numpy as np
+import xarray as xr
+import pytest
+
+from scipy.interpolate import griddata
+
+app_folder = 'app/app_map/radar'
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the source (radar) grid and the reference grid
+def define_grids(grid_shift=0.0):
+    rng = np.random.default_rng(3)
+    src_geo_x, src_geo_y = np.meshgrid(np.linspace(7.5, 10.5, 31) + grid_shift, np.linspace(45.0, 43.0, 21))
+    # curvilinear source grid (small perturbation, no equidistant points)
+    src_geo_x = src_geo_x + rng.uniform(-0.02, 0.02, src_geo_x.shape)
+    src_geo_y = src_geo_y + rng.uniform(-0.02, 0.02, src_geo_y.shape)
+    ref_geo_x, ref_geo_y = np.meshgrid(np.linspace(7.8, 10.2, 23), np.linspace(44.8, 43.3, 17))
+    return src_geo_x, src_geo_y, ref_geo_x, ref_geo_y
+
+
+# Method to define the grid datasets (coordinates as the radar driver)
+def define_dset(geo_x, geo_y):
+    return xr.Dataset(coords={'west_east': (['y', 'x'], geo_x),
+                              'south_north': (['y', 'x'], geo_y)})
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Test: kd-tree index (same source cell of griddata 'nearest' on the cell index)
+@pytest.mark.parametrize('grid_1d', [False, True])
+def test_interp_grid2index(app_module, grid_1d):
+
+    lib_interp = app_module(app_folder, 'lib_mcm_analysis_interpolation_grid')
+    src_geo_x, src_geo_y, ref_geo_x, ref_geo_y = define_grids()
+    if grid_1d:
+        src_geo_x, src_geo_y = np.linspace(7.5, 10.5, 31), np.linspace(45.0, 43.0, 21)
+        src_grid_x, src_grid_y = np.meshgrid(src_geo_x, src_geo_y)
+    else:
+        src_grid_x, src_grid_y = src_geo_x, src_geo_y
+
+    index_out = lib_interp.interp_grid2index(src_geo_x, src_geo_y, ref_geo_x, ref_geo_y)
+    index_ref = griddata((src_grid_x.ravel(), src_grid_y.ravel()), np.arange(src_grid_x.size),
+                         (ref_geo_x.ravel(), ref_geo_y.ravel()), method='nearest')
+
+    np.testing.assert_array_equal(index_out, index_ref)
+
+
+# Test: rain mapped by index (np.take) as the rain interpolated by griddata 'nearest' (nan and domain filters)
+def test_compute_rain_index(app_module):
+
+    lib_interp = app_module(app_folder, 'lib_mcm_analysis_interpolation_grid')
+    lib_variables = app_module(app_folder, 'lib_mcm_variables')
+    src_geo_x, src_geo_y, ref_geo_x, ref_geo_y = define_grids()
+
+    rng = np.random.default_rng(5)
+    var_data = rng.gamma(0.5, 2.0, src_geo_x.shape)
+    var_data[rng.random(var_data.shape) < 0.1] = np.nan
+    ref_geo_z = rng.uniform(0, 1000, ref_geo_x.shape)
+    ref_geo_z[:2, :] = -9999.0
+    ref_geo_z[-1, :3] = np.nan
+
+    ref_geo_index = lib_interp.interp_grid2index(src_geo_x, src_geo_y, ref_geo_x, ref_geo_y)
+    grid_index = lib_variables.compute_rain(var_data, src_geo_x, src_geo_y, ref_geo_x, ref_geo_y, ref_geo_z,
+                                            ref_geo_index=ref_geo_index)
+    grid_interp = lib_variables.compute_rain(var_data, src_geo_x, src_geo_y, ref_geo_x, ref_geo_y, ref_geo_z)
+
+    assert grid_index.shape == ref_geo_z.shape
+    np.testing.assert_array_equal(grid_index, grid_interp)
+
+
+# Test: grid index file (reused for the same grids, rebuilt if the source grid is changed or the key is missing)
+def test_get_interp_index(app_module, tmp_path, monkeypatch):
+
+    drv_io = app_module(app_folder, 'drv_data_mcm_io')
+    lib_interp = app_module(app_folder, 'lib_mcm_analysis_interpolation_grid')
+    src_geo_x, src_geo_y, ref_geo_x, ref_geo_y = define_grids()
+
+    driver_data = drv_io.DriverData.__new__(drv_io.DriverData)
+    driver_data.file_path_grid = str(tmp_path / 'grid' / 'mcm_grid_index.pickle')
+    driver_data.tag_coord_geo_x, driver_data.tag_coord_geo_y = 'west_east', 'south_north'
+    driver_data.geo_collections = define_dset(ref_geo_x, ref_geo_y)
+
+    index_calls = []
+
+    def interp_grid2index(*args, **kwargs):
+        index_calls.append(args)
+        return lib_interp.interp_grid2index(*args, **kwargs)
+    monkeypatch.setattr(drv_io, 'interp_grid2index', interp_grid2index)
+
+    # index built and saved
+    index_first = driver_data.get_interp_index(define_dset(src_geo_x, src_geo_y))
+    assert len(index_calls) == 1
+    # same grids (index read from the file)
+    index_same = driver_data.get_interp_index(define_dset(src_geo_x, src_geo_y))
+    assert len(index_calls) == 1
+    np.testing.assert_array_equal(index_same, index_first)
+
+    # source grid changed (index rebuilt and saved with the new key)
+    src_geo_x_shift, src_geo_y_shift, _, _ = define_grids(grid_shift=0.35)
+    index_shift = driver_data.get_interp_index(define_dset(src_geo_x_shift, src_geo_y_shift))
+    assert len(index_calls) == 2
+    np.testing.assert_array_equal(
+        index_shift, lib_interp.interp_grid2index(src_geo_x_shift, src_geo_y_shift, ref_geo_x, ref_geo_y))
+    assert not np.array_equal(index_shift, index_first)
+    driver_data.get_interp_index(define_dset(src_geo_x_shift, src_geo_y_shift))
+    assert len(index_calls) == 2
+
+    # index file of the previous version (no key)
+    drv_io.write_obj(driver_data.file_path_grid, {'geo_index': index_first})
+    index_key = driver_data.get_interp_index(define_dset(src_geo_x, src_geo_y))
+    assert len(index_calls) == 3
+    np.testing.assert_array_equal(index_key, index_first)
+# -------------------------------------------------------------------------------------
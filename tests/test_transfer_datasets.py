@@ -0,0 +1,107 @@
+"""
+Test: datasets transfer tool (local2local transfer, summary of the transfer job(s) and empty destination folders)
+
+The local2local transfer is run with a copy command (available everywhere) and, if available, with rsync.
+"""
+
+# -------------------------------------------------------------------------------------
+# Libraries
+import os
+import re
+import sys
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from conftest import root_path
+
+script_file = os.path.join(root_path, 'tools', 'tool_processing_datasets_transfer', 'app_transfer_datasets.py')
+time_steps = ['2024010100', '2024010101']
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the settings file and the source file(s)
+def define_case(tmp_path, method_ok, method_fail, group_files=False):
+
+    folder_src = tmp_path / 'source'
+    folder_src.mkdir()
+    for time_step in time_steps:
+        (folder_src / ('data_' + time_step + '.txt')).write_text('data ' * (10 + int(time_step[-1])))
+        (folder_src / ('fail_' + time_step + '.txt')).write_text('fail ' * 20)
+
+    command_line = '{folder_name_src}/{file_name_src} {folder_name_dst}/{file_name_dst}'
+    settings = {
+        'ancillary': {'tag_name_list': ['datasets']},
+        'template_time': {'dset_datetime': '%Y%m%d%H', 'dset_sub_path': '%Y%m%d'},
+        'template_string': {},
+        'method': {
+            'mode': 'local2local',
+            'copy': {'settings': {}, 'command_ancillary': {'create_folder': None},
+                     'command_exec': 'cp', 'command_line': command_line},
+            'copy_fail': {'settings': {}, 'command_ancillary': {'create_folder': None},
+                          'command_exec': 'false', 'command_line': command_line},
+            'rsync': {'settings': {}, 'command_ancillary': {'create_folder': None},
+                      'command_exec': 'rsync -a', 'command_line': command_line}},
+        'execution': {'workers': 4, 'workers_by_destination': 2, 'retries': 0, 'retry_delay': 0,
+                      'group_files': group_files},
+        'time': {'time_run': None, 'time_start': None, 'time_end': None,
+                 'time_period': len(time_steps), 'time_frequency': 'h', 'time_rounding': 'h'},
+        'log': {'folder_name': str(tmp_path / 'log'), 'file_name': 'transfer_log.txt'},
+        'source': {
+            'datasets_ok': {'folder_name': str(folder_src), 'file_name': 'data_{dset_datetime}.txt',
+                            'method': method_ok},
+            'datasets_fail': {'folder_name': str(folder_src), 'file_name': 'fail_{dset_datetime}.txt',
+                              'method': method_fail}},
+        'destination': {
+            'datasets_ok': {'folder_name': str(tmp_path / 'destination' / 'ok' / '{dset_sub_path}'),
+                            'file_name': 'data_{dset_datetime}.txt'},
+            'datasets_fail': {'folder_name': str(tmp_path / 'destination' / 'fail' / '{dset_sub_path}'),
+                              'file_name': 'fail_{dset_datetime}.txt'}},
+    }
+    file_settings = tmp_path / 'transfer_settings.json'
+    file_settings.write_text(json.dumps(settings))
+
+    return file_settings
+
+
+# Method to run the tool and read the transfer summary from the log file
+def run_case(tmp_path, file_settings):
+
+    subprocess.run([sys.executable, script_file, '-settings_file', str(file_settings), '-time', '2024-01-01 01:00'],
+                   cwd=str(tmp_path), capture_output=True, check=True)
+
+    log_text = (tmp_path / 'log' / 'transfer_log.txt').read_text()
+    summary = {}
+    for dataset, files, failed, file_bytes in re.findall(
+            r'Dataset "(\w+)" :: Files: (\d+) -- Failed: (\d+) -- Bytes: (\d+)', log_text):
+        summary[dataset] = {'files': int(files), 'failed': int(failed), 'bytes': int(file_bytes)}
+    return summary
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Test: local2local transfer (bytes of the succeeded job(s) only; empty destination folders removed)
+@pytest.mark.parametrize('method_ok,group_files', [
+    ('copy', False),
+    pytest.param('rsync', False, marks=pytest.mark.skipif(shutil.which('rsync') is None, reason='rsync not available')),
+    pytest.param('rsync', True, marks=pytest.mark.skipif(shutil.which('rsync') is None, reason='rsync not available')),
+])
+def test_transfer_local2local(tmp_path, method_ok, group_files):
+
+    file_settings = define_case(tmp_path, method_ok, 'copy_fail', group_files=group_files)
+    summary = run_case(tmp_path, file_settings)
+
+    folder_ok = tmp_path / 'destination' / 'ok' / '20240101'
+    bytes_ok = 0
+    for time_step in time_steps:
+        file_name = 'data_' + time_step + '.txt'
+        assert (folder_ok / file_name).read_text() == (tmp_path / 'source' / file_name).read_text()
+        bytes_ok += (folder_ok / file_name).stat().st_size
+
+    assert summary['datasets_ok'] == {'files': 2, 'failed': 0, 'bytes': bytes_ok}
+    assert summary['datasets_fail'] == {'files': 0, 'failed': 2, 'bytes': 0}
+    assert not (tmp_path / 'destination' / 'fail' / '20240101').exists()
+# -------------------------------------------------------------------------------------
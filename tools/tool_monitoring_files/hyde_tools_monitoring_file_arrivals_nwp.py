@@ -5,6 +5,8 @@ import logging
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+from hyde_tools_monitoring_file_rules import RuleEngine, read_rules
+
 # List of folders to monitor, now directly including `{current_year}`
 folders_to_watch = [
     f"/hydro/data/data_dynamic/source/nwp/ecmwf0100/",
@@ -23,6 +25,11 @@ os.makedirs(log_folder, exist_ok=True)
 logging.basicConfig(filename=os.path.join(log_folder, "file_arrivals_nwp.log"), level=logging.INFO, 
                     format="%(asctime)s - %(levelname)s - %(message)s")
 
+# Define the rules used to launch the application(s) when the expected files are available (optional)
+rules_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "file_arrivals_nwp_rules.json")
+rules, max_processes = read_rules(rules_file)
+rule_engine = RuleEngine(rules, max_processes=max_processes)
+
 # Define the time threshold (last 10 days)
 DAYS_AGO = time.time() - (10 * 24 * 60 * 60)
 
@@ -62,6 +69,16 @@ class MyHandler(FileSystemEventHandler):
         except Exception as e:
             logging.error(f"Error writing to CSV: {e}")
 
+        # Check the rules and trigger the application(s)
+        rule_engine.on_file(event.src_path)
+
+    def on_moved(self, event):
+        if event.is_directory:
+            return
+
+        # Files written by a temporary name (e.g. rsync) are checked by the final name
+        rule_engine.on_file(event.dest_path)
+
 # Setting up watchdog observers for all folders
 observers = []
 for folder in folders_to_watch:
@@ -0,0 +1,171 @@
+import time
+import os
+import re
+import json
+import shlex
+import logging
+import threading
+import subprocess
+from datetime import datetime
+
+# Default values of the rule fields
+rule_default = {
+    "folder": None,
+    "file_pattern": None,
+    "time_format": "%Y%m%d%H%M",
+    "time_argument_format": "%Y-%m-%d %H:%M",
+    "expected_files": 1,
+    "debounce_seconds": 60,
+    "command": None,
+    "lock_folder": "/hydro/lock/service/",
+    "lock_file_start": None,
+    "lock_file_end": None,
+}
+
+
+def define_rule_regex(file_pattern):
+    """Convert a file pattern (wildcards and a {run_time} tag) to a regular expression."""
+    regex_parts = []
+    for part in re.split(r"(\{run_time\}|\*|\?)", file_pattern):
+        if part == "{run_time}":
+            regex_parts.append(r"(?P<run_time>.+?)")
+        elif part == "*":
+            regex_parts.append(r".*")
+        elif part == "?":
+            regex_parts.append(r".")
+        else:
+            regex_parts.append(re.escape(part))
+    return re.compile("^" + "".join(regex_parts) + "$")
+
+
+def define_lock_path(lock_string, lock_time):
+    """Fill the time tags (%YYYY, %MM, %DD, %HH) of a lock folder or file name, as in the bin/*.sh runners."""
+    for lock_tag, lock_format in [("%YYYY", "%Y"), ("%MM", "%m"), ("%DD", "%d"), ("%HH", "%H")]:
+        lock_string = lock_string.replace(lock_tag, lock_time.strftime(lock_format))
+    return lock_string
+
+
+def read_rules(file_name):
+    """Read the rules from a json file (return an empty list if the file is not available)."""
+    if file_name is None or not os.path.exists(file_name):
+        return [], 1
+    with open(file_name) as f:
+        rules_data = json.load(f)
+    rules = []
+    for rule_name, rule_fields in rules_data.get("rules", {}).items():
+        rule = {**rule_default, **rule_fields, "name": rule_name}
+        if rule["folder"] is None or rule["file_pattern"] is None or rule["command"] is None:
+            logging.warning(f"Rule {rule_name} skipped: folder, file_pattern and command must be defined")
+            continue
+        rule["regex"] = define_rule_regex(rule["file_pattern"])
+        rules.append(rule)
+    return rules, rules_data.get("max_processes", 1)
+
+
+class RuleEngine:
+    """Launch the configured application(s) when the expected file set of a run time is complete."""
+
+    def __init__(self, rules, max_processes=1):
+        self.rules = rules
+        self.slots = threading.BoundedSemaphore(max(int(max_processes), 1))
+        self.timers = {}
+        self.timers_lock = threading.Lock()
+
+    def on_file(self, file_path):
+        """Check the rules against a new file and (re)start the debounce timer of the matching run time."""
+        file_name = os.path.basename(file_path)
+        for rule in self.rules:
+            rule_folder = os.path.abspath(rule["folder"])
+            if os.path.commonpath([os.path.abspath(file_path), rule_folder]) != rule_folder:
+                continue
+            match = rule["regex"].match(file_name)
+            if match is None:
+                continue
+            run_time = match.group("run_time")
+            try:
+                datetime.strptime(run_time, rule["time_format"])
+            except ValueError:
+                logging.warning(f"Rule {rule['name']}: time {run_time} of {file_name} "
+                                f"does not match the format {rule['time_format']}")
+                continue
+
+            key = (rule["name"], run_time)
+            with self.timers_lock:
+                if key in self.timers:
+                    self.timers[key].cancel()
+                timer = threading.Timer(rule["debounce_seconds"], self.on_debounce, args=(rule, run_time))
+                timer.daemon = True
+                self.timers[key] = timer
+                timer.start()
+
+    def count_files(self, rule, run_time):
+        """Count the files of a run time available in the rule folder."""
+        count = 0
+        for root, _, files in os.walk(rule["folder"]):
+            for file_name in files:
+                match = rule["regex"].match(file_name)
+                if match is not None and match.group("run_time") == run_time:
+                    count += 1
+        return count
+
+    def on_debounce(self, rule, run_time):
+        """Launch the application if no file arrived during the debounce time and the file set is complete."""
+        with self.timers_lock:
+            self.timers.pop((rule["name"], run_time), None)
+
+        file_count = self.count_files(rule, run_time)
+        if file_count < rule["expected_files"]:
+            logging.info(f"Rule {rule['name']}: run time {run_time} waiting for files "
+                         f"({file_count}/{rule['expected_files']})")
+            return
+
+        # De-duplication lock (START/END lock files of the run time, shared with the bin/*.sh runners)
+        lock_time = datetime.strptime(run_time, rule["time_format"])
+        lock_folder = define_lock_path(rule["lock_folder"], lock_time)
+        lock_file_start = os.path.join(lock_folder, define_lock_path(
+            rule["lock_file_start"] or f"{rule['name']}_{run_time}_START.txt", lock_time))
+        lock_file_end = os.path.join(lock_folder, define_lock_path(
+            rule["lock_file_end"] or f"{rule['name']}_{run_time}_END.txt", lock_time))
+
+        os.makedirs(lock_folder, exist_ok=True)
+        if os.path.exists(lock_file_end):
+            logging.info(f"Rule {rule['name']}: run time {run_time} already processed (lock {lock_file_end})")
+            return
+        try:
+            lock_handle = os.open(lock_file_start, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            logging.info(f"Rule {rule['name']}: run time {run_time} already running (lock {lock_file_start})")
+            return
+        os.write(lock_handle, self.define_lock_report(rule, run_time, "RUNNING").encode())
+        os.close(lock_handle)
+
+        time_argument = lock_time.strftime(rule["time_argument_format"])
+        command = rule["command"] + " -time " + shlex.quote(time_argument)
+
+        # Concurrency cap (the timer thread waits for a free slot)
+        return_code = None
+        with self.slots:
+            logging.info(f"Rule {rule['name']}: run time {run_time} complete, launching: {command}")
+            try:
+                return_code = subprocess.call(command, shell=True,
+                                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            except Exception as e:
+                logging.error(f"Rule {rule['name']}: error launching {command}: {e}")
+
+        if return_code == 0:
+            with open(lock_file_end, "w") as lock_handle:
+                lock_handle.write(self.define_lock_report(rule, run_time, "COMPLETED"))
+            logging.info(f"Rule {rule['name']}: run time {run_time} completed")
+        else:
+            # Release the START lock (the run time can be launched again by the next file or by the runner)
+            os.remove(lock_file_start)
+            logging.error(f"Rule {rule['name']}: run time {run_time} failed with code {return_code}")
+
+    @staticmethod
+    def define_lock_report(rule, run_time, run_status):
+        """Define the content of a lock file (same fields of the bin/*.sh runners reports)."""
+        return (f" ==== PID: {os.getpid()}\n"
+                f" ==== Algorithm: {rule['name']}\n"
+                f" ==== RunTime: {time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+                f" ==== ExecutionTime: {run_time}\n"
+                f" ==== Status: {run_status}\n")
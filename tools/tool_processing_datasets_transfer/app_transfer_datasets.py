@@ -22,12 +22,15 @@ import re
 import json
 import glob
 import subprocess
+import tempfile
+import threading
 
 import dateutil.parser as dparser
 import pandas as pd
 
 from datetime import datetime
 from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Logging
 log_stream = logging.getLogger(__name__)
@@ -122,8 +125,16 @@ def main():
         time_period=time_period, time_frequency=time_frequency, time_rounding=time_rounding)
     # -------------------------------------------------------------------------------------
 
+    # Configure execution information
+    if 'execution' in list(settings_data.keys()):
+        execution_settings = settings_data['execution']
+    else:
+        execution_settings = {}
+    # -------------------------------------------------------------------------------------
+
     # -------------------------------------------------------------------------------------
     # Iterate over time period
+    transfer_jobs = []
     for time_step in time_range:
 
         # -------------------------------------------------------------------------------------
@@ -274,8 +285,8 @@ def main():
                     for file_path_src_step, file_path_dst_step in zip(file_list_src_def, file_list_dst_def):
 
                         # Define folder and file name(s)
-                        folder_name_src_step, file_name_src_step = os.path.split(file_path_src_step); print(file_path_src_step)
-                        folder_name_dst_step, file_name_dst_step = os.path.split(file_path_dst_step); print(file_path_dst_step)
+                        folder_name_src_step, file_name_src_step = os.path.split(file_path_src_step)
+                        folder_name_dst_step, file_name_dst_step = os.path.split(file_path_dst_step)
 
                         # Method settings
                         file_info = {
@@ -337,11 +348,6 @@ def main():
                         else:
                             method_cmd_transfer = method_cmd_transfer_exec + ' ' + method_cmd_transfer_command
 
-                        # Transfer file from local to remote
-                        log_stream.info(
-                            adjust_comment(' ------> Transfer source datasets "' + file_name_src_step +
-                                           '" to destination datasets "' + file_name_dst_step + '" ... '))
-
                         # Check datasets source
                         if (method_mode == 'local2local') or (method_mode == 'local2remote'):
                             if os.path.exists(file_path_src_step):
@@ -354,47 +360,27 @@ def main():
                             log_stream.error(' ===> Transfer mode "' + method_mode + '" is unknown')
                             raise NotImplementedError('Case not implemented yet')
 
-                        # Condition to transfer datasets
+                        # Condition to transfer datasets (job is executed by the transfer pool)
                         if check_dataset_source:
 
-                            # Execute command to create remote folder
-                            if method_cmd_create_folder is not None:
-                                execute_command(
-                                    method_cmd_create_folder, command_prefix=' -------> ',
-                                    command_type='Create remote folder')
-
-                            # Execute command to transfer datasets
-                            execute_command(
-                                method_cmd_transfer, command_prefix=' -------> ',
-                                command_type='Transfer source datasets "' +
-                                             file_name_src_step + '" to destination datasets "' +
-                                             file_name_dst_step + '"')
-
-                            # remove empty path(s)
-                            remove_path_empty(file_info['folder_root_dst'], file_info['folder_name_dst'])
-
-                            # Execute command to uncompress datasets
-                            if method_cmd_uncompress_file is not None:
-                                execute_command(
-                                    method_cmd_uncompress_file, command_prefix=' -------> ',
-                                    command_type='Extract compressed destination datasets "' + file_name_dst_step + '"')
-
-                            # Execute command to remove datasets
-                            if method_cmd_remove_file is not None:
-
-                                command_find_file_code = execute_command(
-                                    method_cmd_find_file, command_prefix=' -------> ',
-                                    command_type='Find compressed destination datasets "' + file_name_dst_step + '"')
-
-                                if command_find_file_code:
-                                    execute_command(
-                                        method_cmd_remove_file, command_prefix=' -------> ',
-                                        command_type='Remove compressed destination datasets "' + file_name_dst_step + '"')
-
-                            # Transfer datasets from local to remote
-                            log_stream.info(
-                                adjust_comment(' ------> Transfer source datasets "' + file_name_src_step +
-                                               '" to destination datasets "' + file_name_dst_step + '" ... DONE'))
+                            # Command to transfer a group of file(s) sharing source and destination folder(s)
+                            template_command_group = {**template_command_line, 'file_name_src': '', 'file_name_dst': ''}
+                            method_cmd_transfer_group = None
+                            if file_method_src == 'rsync':
+                                method_cmd_transfer_group = \
+                                    method_cmd_transfer_exec + ' --files-from="{file_list}" ' + \
+                                    method_command_line.format(**template_command_group)
+
+                            transfer_jobs.append({
+                                'dataset': dset_key, 'destination': get_transfer_destination(
+                                    method_mode, method_info, folder_name_dst_root),
+                                'method': file_method_src, 'mode': method_mode,
+                                'file_path_src': file_path_src_step, 'file_path_dst': file_path_dst_step,
+                                **file_info,
+                                'cmd_create_folder': method_cmd_create_folder,
+                                'cmd_transfer': method_cmd_transfer, 'cmd_transfer_group': method_cmd_transfer_group,
+                                'cmd_uncompress_file': method_cmd_uncompress_file,
+                                'cmd_find_file': method_cmd_find_file, 'cmd_remove_file': method_cmd_remove_file})
 
                         else:
                             log_stream.info(
@@ -403,7 +389,7 @@ def main():
                                             'File source does not exists.'))
 
                     # Info dataset end (done)
-                    log_stream.info(' -----> Dataset "' + dset_key_step + '" ... DONE')
+                    log_stream.info(' -----> Dataset "' + dset_key_step + '" ... DONE. Transfer job(s) planned')
 
                 else:
                     # Info dataset end (skipped)
@@ -413,6 +399,11 @@ def main():
         log_stream.info(' ----> Time "' + time_step.strftime(format=time_format_algorithm) + '" ... DONE')
         # -------------------------------------------------------------------------------------
 
+    # Execute transfer job(s)
+    transfer_summary = exec_transfer_jobs(transfer_jobs, **execution_settings)
+    # Info transfer summary
+    log_transfer_summary(transfer_summary)
+
     # # Info algorithm end
     log_stream.info(' ---> Transfer datasets from source to destination location(s) ... DONE')
     # -------------------------------------------------------------------------------------
@@ -458,6 +449,266 @@ def execute_command(command_line, command_prefix=' ---> ', command_type='Execute
 
 # -------------------------------------------------------------------------------------
 
+# -------------------------------------------------------------------------------------
+# Method to execute command line with retries (delay is doubled at each attempt)
+def execute_command_retry(command_line, command_prefix=' ---> ', command_type='Execute command',
+                          command_retries=0, command_delay=1.0):
+
+    command_attempt = 0
+    while True:
+        command_code = execute_command(command_line, command_prefix=command_prefix, command_type=command_type)
+        if command_code or (command_attempt >= command_retries):
+            break
+        command_wait = command_delay * (2 ** command_attempt)
+        command_attempt += 1
+        log_stream.warning(' ===> Command will be submitted again in ' + str(command_wait) + ' seconds [attempt ' +
+                           str(command_attempt) + ' of ' + str(command_retries) + ']')
+        time.sleep(command_wait)
+
+    return command_code
+
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the destination key used by the concurrency limit(s)
+def get_transfer_destination(method_mode, method_info, folder_root_dst):
+
+    if method_mode == 'local2remote':
+        if 'machine_host' in list(method_info.keys()):
+            if method_info['machine_host']:
+                return method_info['machine_host']
+    return folder_root_dst
+
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to get the size of the transferred file(s)
+def get_transfer_bytes(file_path_list):
+    file_bytes = 0
+    for file_path_src, file_path_dst in file_path_list:
+        if os.path.isfile(file_path_dst):
+            file_bytes += os.path.getsize(file_path_dst)
+        elif os.path.isfile(file_path_src):
+            file_bytes += os.path.getsize(file_path_src)
+    return file_bytes
+
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to execute a transfer job (one file)
+def exec_transfer_job(transfer_job, command_retries=0, command_delay=1.0):
+
+    file_name_src, file_name_dst = transfer_job['file_name_src'], transfer_job['file_name_dst']
+
+    # Transfer file from source to destination
+    log_stream.info(adjust_comment(' ------> Transfer source datasets "' + file_name_src +
+                                   '" to destination datasets "' + file_name_dst + '" ... '))
+
+    # Execute command to create remote folder
+    if transfer_job['cmd_create_folder'] is not None:
+        execute_command_retry(
+            transfer_job['cmd_create_folder'], command_prefix=' -------> ', command_type='Create remote folder',
+            command_retries=command_retries, command_delay=command_delay)
+
+    # Execute command to transfer datasets
+    transfer_code = execute_command_retry(
+        transfer_job['cmd_transfer'], command_prefix=' -------> ',
+        command_type='Transfer source datasets "' + file_name_src + '" to destination datasets "' +
+                     file_name_dst + '"',
+        command_retries=command_retries, command_delay=command_delay)
+
+    # Execute command to uncompress datasets
+    if transfer_job['cmd_uncompress_file'] is not None:
+        execute_command(
+            transfer_job['cmd_uncompress_file'], command_prefix=' -------> ',
+            command_type='Extract compressed destination datasets "' + file_name_dst + '"')
+
+    # Execute command to remove datasets
+    if transfer_job['cmd_remove_file'] is not None:
+
+        command_find_file_code = execute_command(
+            transfer_job['cmd_find_file'], command_prefix=' -------> ',
+            command_type='Find compressed destination datasets "' + file_name_dst + '"')
+
+        if command_find_file_code:
+            execute_command(
+                transfer_job['cmd_remove_file'], command_prefix=' -------> ',
+                command_type='Remove compressed destination datasets "' + file_name_dst + '"')
+
+    # Transfer file from source to destination
+    log_stream.info(adjust_comment(' ------> Transfer source datasets "' + file_name_src +
+                                   '" to destination datasets "' + file_name_dst + '" ... DONE'))
+
+    return transfer_code
+
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to execute a transfer group (many files in a single rsync command using --files-from)
+def exec_transfer_group(transfer_group, command_retries=0, command_delay=1.0):
+
+    transfer_job = transfer_group[0]
+    folder_name_src, folder_name_dst = transfer_job['folder_name_src'], transfer_job['folder_name_dst']
+
+    # Transfer files from source to destination
+    log_stream.info(adjust_comment(' ------> Transfer source folder "' + folder_name_src +
+                                   '" to destination folder "' + folder_name_dst + '" [files: ' +
+                                   str(len(transfer_group)) + '] ... '))
+
+    # Execute command to create remote folder
+    if transfer_job['cmd_create_folder'] is not None:
+        execute_command_retry(
+            transfer_job['cmd_create_folder'], command_prefix=' -------> ', command_type='Create remote folder',
+            command_retries=command_retries, command_delay=command_delay)
+
+    # Define the file list
+    with tempfile.NamedTemporaryFile(mode='w', prefix='transfer_', suffix='.txt', delete=False) as file_handle:
+        for transfer_step in transfer_group:
+            file_handle.write(transfer_step['file_name_src'] + '\n')
+        file_name_list = file_handle.name
+
+    # Execute command to transfer datasets
+    try:
+        transfer_code = execute_command_retry(
+            transfer_job['cmd_transfer_group'].format(file_list=file_name_list), command_prefix=' -------> ',
+            command_type='Transfer source folder "' + folder_name_src + '" to destination folder "' +
+                         folder_name_dst + '"',
+            command_retries=command_retries, command_delay=command_delay)
+    finally:
+        os.remove(file_name_list)
+
+    # Transfer files from source to destination
+    log_stream.info(adjust_comment(' ------> Transfer source folder "' + folder_name_src +
+                                   '" to destination folder "' + folder_name_dst + '" [files: ' +
+                                   str(len(transfer_group)) + '] ... DONE'))
+
+    return transfer_code
+
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to organize transfer job(s) in groups
+def group_transfer_jobs(transfer_jobs, group_files=True):
+
+    transfer_groups, transfer_keys = [], {}
+    for transfer_job in transfer_jobs:
+
+        # Condition to group file(s) (same folders, same names and no ancillary commands)
+        flag_group = group_files and \
+            (transfer_job['cmd_transfer_group'] is not None) and (transfer_job['mode'] != 'remote2local') and \
+            (transfer_job['file_name_src'] == transfer_job['file_name_dst']) and \
+            (transfer_job['cmd_uncompress_file'] is None) and (transfer_job['cmd_remove_file'] is None)
+
+        if flag_group:
+            transfer_key = (transfer_job['dataset'], transfer_job['destination'], transfer_job['cmd_transfer_group'],
+                            transfer_job['folder_name_src'], transfer_job['folder_name_dst'])
+            if transfer_key not in list(transfer_keys.keys()):
+                transfer_keys[transfer_key] = len(transfer_groups)
+                transfer_groups.append([])
+            transfer_groups[transfer_keys[transfer_key]].append(transfer_job)
+        else:
+            transfer_groups.append([transfer_job])
+
+    return transfer_groups
+
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to execute transfer job(s) using a bounded worker pool
+def exec_transfer_jobs(transfer_jobs, workers=1, workers_by_destination=None,
+                       retries=0, retry_delay=1.0, group_files=False, **kwargs):
+
+    log_stream.info(' ----> Execute transfer job(s) [workers: ' + str(workers) + '] ... ')
+
+    # Define transfer group(s)
+    transfer_groups = group_transfer_jobs(transfer_jobs, group_files=group_files)
+
+    # Define concurrency limit(s) by destination
+    if (workers_by_destination is None) or (workers_by_destination <= 0):
+        workers_by_destination = max(workers, 1)
+    transfer_locks = {}
+    for transfer_group in transfer_groups:
+        transfer_destination = transfer_group[0]['destination']
+        if transfer_destination not in list(transfer_locks.keys()):
+            transfer_locks[transfer_destination] = threading.BoundedSemaphore(workers_by_destination)
+
+    # Method to execute a group (bounded by destination)
+    def exec_transfer_worker(transfer_group):
+        with transfer_locks[transfer_group[0]['destination']]:
+            transfer_time_start = time.time()
+            if len(transfer_group) == 1:
+                transfer_code = exec_transfer_job(
+                    transfer_group[0], command_retries=retries, command_delay=retry_delay)
+            else:
+                transfer_code = exec_transfer_group(
+                    transfer_group, command_retries=retries, command_delay=retry_delay)
+            transfer_time_elapsed = time.time() - transfer_time_start
+        # size of the transferred file(s) (only for the succeeded job(s))
+        transfer_bytes = 0
+        if transfer_code:
+            transfer_bytes = get_transfer_bytes(
+                [(transfer_job['file_path_src'], transfer_job['file_path_dst']) for transfer_job in transfer_group])
+        return transfer_code, transfer_bytes, transfer_time_elapsed
+
+    # Execute group(s)
+    transfer_summary = {}
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as transfer_pool:
+        transfer_futures = {
+            transfer_pool.submit(exec_transfer_worker, transfer_group): transfer_group
+            for transfer_group in transfer_groups}
+        for transfer_future in as_completed(transfer_futures):
+            transfer_group = transfer_futures[transfer_future]
+            transfer_dataset = transfer_group[0]['dataset']
+
+            try:
+                transfer_code, transfer_bytes, transfer_time_elapsed = transfer_future.result()
+            except Exception as transfer_error:
+                log_stream.warning(' ===> Transfer job(s) failed: "' + str(transfer_error) + '"')
+                transfer_code, transfer_bytes, transfer_time_elapsed = False, 0, 0.0
+
+            if transfer_dataset not in list(transfer_summary.keys()):
+                transfer_summary[transfer_dataset] = {'files': 0, 'failed': 0, 'bytes': 0, 'seconds': 0.0}
+            if transfer_code:
+                transfer_summary[transfer_dataset]['files'] += len(transfer_group)
+            else:
+                transfer_summary[transfer_dataset]['failed'] += len(transfer_group)
+            transfer_summary[transfer_dataset]['bytes'] += transfer_bytes
+            transfer_summary[transfer_dataset]['seconds'] += transfer_time_elapsed
+
+    # Remove empty path(s) (once for each destination folder, after all the job(s) are completed)
+    transfer_folders = {}
+    for transfer_job in transfer_jobs:
+        transfer_folders[(transfer_job['folder_root_dst'], transfer_job['folder_name_dst'])] = None
+    for folder_root_dst, folder_name_dst in transfer_folders.keys():
+        remove_path_empty(folder_root_dst, folder_name_dst)
+
+    log_stream.info(' ----> Execute transfer job(s) [workers: ' + str(workers) + '] ... DONE')
+
+    return transfer_summary
+
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to log transfer summary
+def log_transfer_summary(transfer_summary):
+
+    log_stream.info(' ----> Transfer summary ... ')
+    for transfer_dataset, transfer_info in transfer_summary.items():
+        log_stream.info(' -----> Dataset "' + transfer_dataset + '" :: Files: ' + str(transfer_info['files']) +
+                        ' -- Failed: ' + str(transfer_info['failed']) +
+                        ' -- Bytes: ' + str(transfer_info['bytes']) +
+                        ' -- Seconds: ' + str(round(transfer_info['seconds'], 1)))
+    log_stream.info(' ----> Transfer summary ... DONE')
+
+# -------------------------------------------------------------------------------------
+
 
 # -------------------------------------------------------------------------------------
 # Method to remove path empty